@@ -15,7 +15,7 @@ from utils.misc import logs_to_str
 
 # Import all relevant consept variables
 from consept_vars import FOLDER_NAME_CONCOLIC, FOLDER_NAME_FUZZ, FOLDER_NAME_MUTATION, \
-    MOUNTED_MUTATION_FOLDER, NAME_IMAGE_CONCOLIC, \
+    MOUNTED_MUTATION_FOLDER, NAME_IMAGE_CONCOLIC, PATH_CCACHE, \
     NAME_CONTAINER_CONCOLIC, NAME_CONTAINER_FUZZ, \
     NAME_CONTAINER_MUTATION, PARENT_FOLDER_OF_USER_PROJECT, \
     NAME_IMAGE_FUZZ, NAME_IMAGE_MUTATION
@@ -42,7 +42,7 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
 
     client: docker.client
 
-    def __init__(self, init_tools: list = None, user_project_path : str = None) -> None:
+    def __init__(self, init_tools: list = None) -> None:
         """
         Constructor of the ApplicationManager class.
         The class has a logger attribute which
@@ -57,6 +57,9 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
         # Fetch Docker client from environment
         self.client = docker.from_env()
 
+        # Docker clients of other endpoints, by base url
+        self.endpoint_clients = {}
+
         # Initialize logger
         self.logger = logging.getLogger('consept')
         self.logger.setLevel(logging.INFO)
@@ -65,24 +68,27 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
         assert isinstance(init_tools, list) & (init_tools is not None), 'init_tools \
             is required to be a non-empty list'
         for tool in init_tools:
-            self._build_tool_image(tool, user_project_path)
+            self._build_tool_image(tool)
 
         self.logger.debug('Finished constructing ApplicationManager')
 
     def _build_tool_image(
             self,
             tool : str,
-            user_project_path : str,
             redo : bool = False,
+            endpoint : str = None,
         ) -> None:
         """
         Builds the image for a specific tool. This tool is specified by paramater tool.
         It checks whether a Dockerfile can be found for this specific image and throw
-        an AssertionError if this is not the case.
+        an AssertionError if this is not the case. The images do not depend on the user
+        project, one image serves every project, see container_environment().
 
         Parameters:
         tools (str) : tool for which a Docker image will be built. Should be either 'concolic',
         'fuzz', 'mutation'.
+        endpoint (str) : base url of the Docker endpoint the image is built on, None for the
+        local Docker daemon
 
         Returns:
         None
@@ -90,8 +96,6 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
         Raises:
         AssertionError : tool given as output is not recognized. See parameters.
         """
-        build_args = None
-
         # Process tool parameter
         if tool == 'concolic':
             path_folder_tool = PATH_CONCOLIC
@@ -102,14 +106,6 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
         elif tool == 'mutation':
             path_folder_tool = PATH_MUTATION
             name_image = NAME_IMAGE_MUTATION
-            user_project_name = os.path.basename(user_project_path)
-            edited_user_project_path = PARENT_FOLDER_OF_USER_PROJECT + "/" + user_project_name
-            build_args = {
-                "USER_PROJECT_PATH": user_project_path.replace(os.sep, '/'),
-                "EDITED_USER_PROJECT_PATH": edited_user_project_path,
-                "MOUNTED_MUTATION_FOLDER": MOUNTED_MUTATION_FOLDER,
-                "PARENT_FOLDER_OF_USER_PROJECT": PARENT_FOLDER_OF_USER_PROJECT,
-            }
         else:
             raise AssertionError(f'Toolname not recognized ({tool})')
 
@@ -118,7 +114,8 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
             path_folder_tool), f'No Dockerfile found in {path_folder_tool}'
 
         # Check if we are creating an image that has the same name as an existing image
-        if name_image in self._available_images:
+        client = self.client_for(endpoint)
+        if name_image in self._list_images(client):
             if redo:
                 self.logger.info(
                     f'Image {name_image} exists already, will build anyway')
@@ -131,11 +128,10 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
                          f' for {tool}')
 
         # Build image
-        _, build_logs = self.client.images.build(
+        _, build_logs = client.images.build(
             path=path_folder_tool,
             quiet=False,
             tag=name_image,
-            buildargs=build_args,
             )
 
         # Log the build_logs
@@ -157,8 +153,16 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
         None
         """
 
+        return self._list_images(self.client)
+
+    @staticmethod
+    def _list_images(client : docker.client) -> list:
+        """
+        Lists all images available to a Docker client by name
+        """
+
         # flatten images list
-        unflattened_tags = [img.tags for img in self.client.images.list()]
+        unflattened_tags = [img.tags for img in client.images.list()]
         flattened_tags = sum(unflattened_tags, [])
 
         # return only image names, no tags
@@ -184,22 +188,86 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
             container.name for container in self.client.containers.list(all=True)]
         return ret_list
 
-    def run_container(self,
-                      tool,
-                      command,
-                      user_project_path=None,
-                      remove_afterwards = False,
-                      ) -> None:
+    def client_for(self, endpoint : str = None) -> docker.client:
         """
-        Run the container of a specific tool with a set of commands
+        Returns the Docker client of an endpoint, e.g. 'tcp://host:2375' or
+        'ssh://user@host'. Clients of other endpoints are created once and then reused.
+
+        Parameters:
+        endpoint (str) : base url of the Docker endpoint, None for the local Docker daemon
+
+        Returns:
+        The Docker client of the endpoint
+        """
+        if endpoint is None:
+            return self.client
+
+        if endpoint not in self.endpoint_clients:
+            self.logger.info(f'Connecting to Docker endpoint {endpoint}')
+            self.endpoint_clients[endpoint] = docker.DockerClient(base_url=endpoint)
+        return self.endpoint_clients[endpoint]
+
+    def cpu_count(self, endpoint : str = None) -> int:
+        """
+        Returns the number of CPUs of the host behind a Docker endpoint
+        """
+        return self.client_for(endpoint).info()['NCPU']
+
+    @staticmethod
+    def container_environment(tool : str, user_project_path : str = None) -> dict:
+        """
+        Returns the environment of a container of a tool for a run on a user project. The paths
+        of the project are given to the container when it starts instead of being built into
+        the image, so a single image serves all projects.
+
+        Parameters:
+        tool (str) : tool the container is run for
+        user_project_path (str) : path of the user project, mounted at the same path
+
+        Returns:
+        dict : environment variables of the container, None if the tool needs none
+        """
+        if tool != 'mutation':
+            return None
+
+        # the project is copied next to the other edited projects in the container
+        user_project_path = user_project_path.replace(os.sep, '/')
+        user_project_name = os.path.basename(user_project_path.rstrip('/'))
+        return {
+            "USER_PROJECT_PATH": user_project_path,
+            "EDITED_USER_PROJECT_PATH": PARENT_FOLDER_OF_USER_PROJECT + "/" + user_project_name,
+            "MOUNTED_MUTATION_FOLDER": MOUNTED_MUTATION_FOLDER,
+            "PARENT_FOLDER_OF_USER_PROJECT": PARENT_FOLDER_OF_USER_PROJECT,
+            "CCACHE_DIR": PATH_CCACHE,
+        }
+
+    def start_container(self,
+                        tool,
+                        command,
+                        user_project_path=None,
+                        remove_afterwards = False,
+                        *,
+                        name_container = None,
+                        cpuset_cpus = None,
+                        endpoint = None,
+                        volumes = None,
+                        ):
+        """
+        Start the container of a specific tool with a set of commands, without waiting for
+        the container to finish. The tmp folder of the tool is mounted from the same path on
+        the host of the endpoint, so other endpoints need a shared file system at that path.
 
         Parameters:
         tool (str) : tool on which the commands should be run
         command (str/list) : (set of) command(s) to be run inside the container
         of the specified tool
+        name_container (str) : name of the container, by default the fixed name of the tool
+        cpuset_cpus (str) : CPUs the container is pinned to, e.g. '0-3', None for all CPUs
+        endpoint (str) : base url of the Docker endpoint, None for the local Docker daemon
+        volumes (dict) : named Docker volumes that outlive the container, by target path
 
         Returns:
-        None
+        The started container
 
         Raises:
         AssertionError : If the name of the tool is not recognized
@@ -210,23 +278,26 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
         # Process tool parameter
         if tool == 'concolic':
             name_image = NAME_IMAGE_CONCOLIC
-            name_container = NAME_CONTAINER_CONCOLIC
+            default_name_container = NAME_CONTAINER_CONCOLIC
 
         elif tool == 'fuzz':
             name_image = NAME_IMAGE_FUZZ
-            name_container = NAME_CONTAINER_FUZZ
+            default_name_container = NAME_CONTAINER_FUZZ
         elif tool == 'mutation':
             name_image = NAME_IMAGE_MUTATION
-            name_container = NAME_CONTAINER_MUTATION
+            default_name_container = NAME_CONTAINER_MUTATION
         else:
             raise AssertionError(f'Toolname not recognized ({tool})')
 
+        name_container = name_container or default_name_container
+        client = self.client_for(endpoint)
+
         # Make sure the image the container is based on is built
-        if not name_image in self._available_images:
-            self._build_tool_image(tool, user_project_path)
+        if not name_image in self._list_images(client):
+            self._build_tool_image(tool, endpoint=endpoint)
 
-        if name_container in self._available_containers:
-            self.client.containers.get(name_container).remove()
+        if name_container in [container.name for container in client.containers.list(all=True)]:
+            client.containers.get(name_container).remove(force=True)
 
         # define source and target paths for the tmp folder
         path_local_tmp_tool = os.path.join(PATH_CONSEPT, 'tmp', tool)
@@ -254,10 +325,16 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
                 type='bind'
             )
 
-        self.logger.info(f'Will now run container {name_container} from image {name_image}')
+        # named volumes keep their content, e.g. a build tree, across containers
+        mounts = [tmp_mount] if tool != "mutation" else [tmp_mount, project_mount]
+        mounts += [docker.types.Mount(target=target, source=name, type='volume')
+                   for target, name in (volumes or {}).items()]
+
+        self.logger.info(f'Will now run container {name_container} from image {name_image}' +
+                         (f' on CPUs {cpuset_cpus}' if cpuset_cpus is not None else ''))
 
         # run the contiainer
-        container = self.client.containers.run(
+        return client.containers.run(
             image = f'{name_image}:latest',
             command = command,
             stdout = True,
@@ -265,15 +342,50 @@ class ApplicationManager():  # pylint: disable=too-few-public-methods
             remove = remove_afterwards,
             detach = True,
             name = name_container,
-            mounts = [tmp_mount] if tool != "mutation" else [tmp_mount, project_mount],
+            mounts = mounts,
+            environment = self.container_environment(tool, user_project_path),
             tty=True,
+            cpuset_cpus=cpuset_cpus,
         )
 
+    def run_container(self,
+                      tool,
+                      command,
+                      user_project_path=None,
+                      remove_afterwards = False,
+                      output_callback = None,
+                      **container_options,
+                      ) -> None:
+        """
+        Run the container of a specific tool with a set of commands
+
+        Parameters:
+        tool (str) : tool on which the commands should be run
+        command (str/list) : (set of) command(s) to be run inside the container
+        of the specified tool
+        output_callback (callable) : optional function that receives every output chunk
+        while the container is running
+        container_options : keyword arguments of start_container(), e.g. volumes
+
+        Returns:
+        None
+
+        Raises:
+        AssertionError : If the name of the tool is not recognized
+        docker.errors.APIError : If an error is raised by the the Docker API
+        that is used by this function.
+        """
+        container = self.start_container(tool, command, user_project_path, remove_afterwards,
+                                         **container_options)
+        name_container = container.name
+
         # get output by attaching the container to the local terminal
         # accumulate output chunks into a byte string
         output_bytes = b""
         for chunk in container.attach(stdout=True, stream=True):
             output_bytes += chunk
+            if output_callback is not None:
+                output_callback(chunk)
 
         # log the output of the container that was just run
         self.logger.info(f'\n\n ========= START CONTAINER OUTPUT for {name_container} =========')
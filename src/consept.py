@@ -11,16 +11,21 @@ Functions:
 import argparse
 import json
 import os
-from pathlib import Path
+import subprocess
 
 from application_manager import ApplicationManager
 
 from klee_handler import KLEEHandler
 from mutation_handler import DextoolHandler
-from fuzz_handler import FuzzHandler, ask_for_annotation_choice_fuzz
+from mutant_sampling import STRATA, sample_spec
+from fuzz_runner import run_fuzzing
+from fuzz_profiles import FUZZ_PROFILES
+from sanitizer_builds import SANITIZER_CONFIGS
 
-from tuut_file import TuutFile
+from target_catalog import TargetCatalog
+from project_indexer import ProjectIndexer
 from utils.misc import find_file_path
+from utils.compile_db import register_compile_db
 from consept_vars import PATH_CONSEPT
 
 def start_consept():
@@ -44,24 +49,70 @@ def start_consept():
     a memory related error, run:
     $ python3 src/consept.py address_memory_error.cpp -fm
 
+    To fuzz all functions of "address_memory_error.cpp" with one binary and 4 workers, run:
+    $ python3 src/consept.py address_memory_error.cpp -fa -af -w 4
+
+    To fuzz "address_memory_error.cpp" with a fast build and confirm the findings with the
+    address and memory sanitizers, for at most 600 seconds, run:
+    $ python3 src/consept.py address_memory_error.cpp -ft -tl 600
+
+    To fuzz "address_memory_error.cpp" with the address and undefined behaviour sanitizers
+    in one build, run:
+    $ python3 src/consept.py address_memory_error.cpp -fu
+
+    To fuzz "address_memory_error.cpp" with a combined address and undefined behaviour build
+    and a memory sanitizer build in parallel, for at most 600 seconds, run:
+    $ python3 src/consept.py address_memory_error.cpp -fs asan_ubsan msan -tl 600
+
+    To fuzz "address_memory_error.cpp" with 4 fuzzing containers that share their corpus, run:
+    $ python3 src/consept.py address_memory_error.cpp -fa -fc 4 -tl 600
+
+    To explore "example.cpp" with KLEE under two symbolic selections without recompiling, run:
+    $ python3 src/consept.py example_compile_commands.json -k -ks branch x,y
+
+    To index the fuzzable functions and symbolic candidates of all files of a project, run:
+    $ python3 src/consept.py path/to/compile_commands.json -i
+
     To analyze a project named "game_tutorial" with Dextool for mutation testing, run:
     $ python3 src/consept.py path/to/the/folder/of/the/poject/conatining/CMakeLists.txt -m 
+
+    To test the mutants of the project with 4 containers in parallel, run:
+    $ python3 src/consept.py path/to/CMakeLists.txt -m -ms 4
+
+    To fail when the mutation score of the project is below 80%, e.g. in CI, run:
+    $ python3 src/consept.py path/to/CMakeLists.txt -m -mt 80
+
+    To only test the mutants on the lines changed since the main branch, run:
+    $ python3 src/consept.py path/to/CMakeLists.txt -m -mr main..HEAD
+
+    To leave out the mutants that compile to the same object as the original or as another
+    mutant, run:
+    $ python3 src/consept.py path/to/CMakeLists.txt -m -me
+
+    To estimate the mutation score from 10% of the mutants, sampled per mutation operator, run:
+    $ python3 src/consept.py path/to/CMakeLists.txt -m -msa 10% -mst operator
+
+    To only run the tests that cover a mutant and skip the mutants no test covers, run:
+    $ python3 src/consept.py path/to/CMakeLists.txt -m -mc
     """
     parser = create_parser()
     args = parser.parse_args()
-    cmakelists = args.file
-    user_project = os.path.dirname(cmakelists)
     errors = None
     tests = None
 
+    # files are parsed with the arguments of the given compile database
+    if args.compile_db:
+        register_compile_db(args.compile_db)
+
+    if args.index:
+        run_index(args)
+
     if args.use_mutation:
-        tool_am = ApplicationManager(['mutation'], user_project)
-        handler = DextoolHandler(tool_am)
-        handler.annotate_cmakelists(cmakelists)
-        handler.start_dextool(cmakelists)
+        run_mutation(args, parser)
 
     if args.use_klee:
         compile_commands = find_file_path(args.file)
+        register_compile_db(compile_commands)
         _file_paths, file_name_tested, annotated_filename = get_file_paths(compile_commands)
 
         if args.time_limit <= 0:
@@ -76,82 +127,48 @@ def start_consept():
         # Empty the mount folder
         kleeh.empty_mount_folder()
 
-        # Get the test file and annotate variables
-        test_file_name = file_name_tested
-        testfile_path = find_file_path(test_file_name)
-        kleeh.annotate_variables(testfile_path)
-
         # Set the path to annotated file
         annotated_file_path = os.path.join(PATH_CONSEPT, 'tmp', 'concolic', annotated_filename)
 
-        # Include in the annotated file the KLEE library
-        kleeh.include_library(annotated_file_path)
-
-        # Run KLEE
-        kleeh.run_klee(compile_commands, annotated_file_path, args.time_limit)
-
-        # Get the errors found by KLEE and output them nicely
-        errors = kleeh.output_errors()
-
-        # Set the directory path for the generated tests
-        ktests_directory = 'tmp/concolic/klee-out-0/'
-
-        # Analyze the ktest files to extract test information
-        tests = kleeh.analyze_ktest_files(ktests_directory)
-
-        if errors:
-            # Print error inputs
-            kleeh.print_error_inputs(tests, errors)
-        else:
-            print("\nNo errors found by the generated tests")
-
-    if args.use_libFuzzer_with_address_sanitizer | args.use_libFuzzer_with_memory_sanitizer:
-
-        assert args.file.endswith('.cpp'), 'For fuzzing, one specific cpp file needs to be entered'
-
-        path_file = Path(args.file)
-
-        if len(path_file.parts) == 1: # only the basename was provided
-            path_file = find_file_path(args.file)
-        else: # path to the file is just the path that was provided
-            path_file = str(path_file)
-
-        # init ApplicationManager, FuzzHandler and TuutFile
-        tool_am = ApplicationManager(['fuzz'])
-        fuzh = FuzzHandler(app_man=tool_am)
-        tuut = TuutFile(path_file)
-
-        # generate function information about the file to be tested
-        tuut.gen_func_info()
-
-        # ask which function in the file to be tested will be the fuzzing target
-        choice = ask_for_annotation_choice_fuzz(tuut.func_dict, tuut.func_details)
-
-        # annotate specifically the funciton of this file
-        fuzh.annotate_fuzz(tuut, choice)
-
-        # comment out the main function
-        tuut.comment_out_main()
-
-        #include fuzzing libraries in the to be tested file
-        tuut.include_fuzz()
-
-        # start a new script that will be executed inside the fuzzing container
-        fuzh.open_new_script()
-
-        if args.use_libFuzzer_with_address_sanitizer:
-            fuzh.add_command(
-                f'clang++ -g -fsanitize=address,fuzzer -o tmp/fuzz/fuzz_output \
-                    {tuut.path_container_fuzz}')
-        elif args.use_libFuzzer_with_memory_sanitizer:
-            fuzh.add_command(
-                f'clang++ -g -fsanitize=memory,fuzzer -o tmp/fuzz/fuzz_output \
-                    {tuut.path_container_fuzz}')
-
-        fuzh.add_command('tmp/fuzz/fuzz_output -runs=1000')
-
-        # run the container and the script inside of it
-        fuzh.run()
+        # Get the test file, annotate variables and include the KLEE library in one write of
+        # the annotated file, the variables of unchanged files are taken from the catalog of
+        # earlier runs
+        test_file_name = file_name_tested
+        testfile_path = find_file_path(test_file_name)
+        # With selections every variable is annotated, guarded by a selector at runtime
+        catalog = TargetCatalog()
+        try:
+            kleeh.annotate_variables(testfile_path, annotated_file_path, catalog,
+                                     include_klee=True, guarded=bool(args.klee_selections))
+        finally:
+            catalog.close()
+        selections = {f'sel{index}': kleeh.selection_mask(selection, testfile_path)
+                      for index, selection in enumerate(args.klee_selections or [])}
+        for label, selection in zip(selections, args.klee_selections or []):
+            print(f'Symbolic selection {label}: {selection} ({selections[label]:#x})')
+
+        # Run KLEE, once per selection on the same bitcode if selections are given
+        kleeh.run_klee(compile_commands, annotated_file_path, args.time_limit, selections)
+
+        tests = ''
+        for name_output_folder in kleeh.output_folders(selections):
+            # Get the errors found by KLEE and output them nicely
+            errors = kleeh.output_errors(name_output_folder)
+
+            # Analyze the ktest files of the output folder to extract test information
+            folder_tests = kleeh.analyze_ktest_files(f'tmp/concolic/{name_output_folder}/')
+            tests += folder_tests or ''
+
+            if errors:
+                # Print error inputs
+                kleeh.print_error_inputs(folder_tests, errors)
+            else:
+                print("\nNo errors found by the generated tests")
+
+    if args.use_libFuzzer_with_address_sanitizer | args.use_libFuzzer_with_memory_sanitizer | \
+        args.use_libFuzzer_with_address_undefined_sanitizer | args.use_libFuzzer_two_tier | \
+        bool(args.sanitizer_configs):
+        run_fuzzing(args, parser)
 
     if args.save_tests:
         # Save tests to a file in the Consept folder directory
@@ -161,6 +178,47 @@ def start_consept():
             file.write(tests)
         print(f"Tests saved to file: {file_name}")
 
+
+def run_mutation(args, parser):
+    """
+    Test the mutants of the project of the CMakeLists.txt given as positional argument with
+    Dextool and exit with an error if the mutation score is below the threshold.
+    """
+    handler = DextoolHandler(ApplicationManager(['mutation']))
+    handler.annotate_cmakelists(args.file)
+    # git fails on an unknown revision range or a project outside a git repository
+    try:
+        results = handler.start_dextool(args.file, args.mutation_shards,
+                                        args.mutation_revisions,
+                                        tce=args.mutation_equivalence,
+                                        sample=args.mutation_sample,
+                                        strata=args.mutation_strata,
+                                        coverage=args.mutation_coverage)
+    except subprocess.CalledProcessError as error:
+        parser.error(f'Can not diff the revision range {args.mutation_revisions}: '
+                     f'{error.stderr.strip()}')
+    # a sampled run is gated on the estimated score, which is the score it reports
+    if args.mutation_threshold is not None and \
+            (results.get('estimate', results)['score'] or 0) < args.mutation_threshold:
+        parser.exit(1, f'The mutation score is below {args.mutation_threshold}%\n')
+
+
+def run_index(args):
+    """
+    Index the targets of all files of the compile database given as positional argument and
+    print the most complex ones.
+    """
+    path_compile_db = args.file if os.path.exists(args.file) else find_file_path(args.file)
+    indexer = ProjectIndexer(path_compile_db, args.workers)
+    try:
+        parsed = indexer.run()
+        print(f'Parsed {len(parsed)} of {len(indexer.entries)} file(s), the others are unchanged')
+        print(ProjectIndexer.summary(indexer.query()))
+        print(f'The index is stored in {indexer.catalog.path_catalog}')
+    finally:
+        indexer.catalog.close()
+
+
 def create_parser():
     """
     Create and configure the command-line argument parser for the Consept utility.
@@ -182,6 +240,35 @@ def create_parser():
                 and detect address related issues.
         -fm, --use-libFuzzer-with-memory-sanitizer: Use libFuzzer to analyze the file
                 and detect memory related issues.
+        -fu, --use-libFuzzer-with-address-undefined-sanitizer: Use libFuzzer with a combined
+                address and undefined behaviour sanitizer build.
+        -fs, --sanitizer-configs: Fuzz with several sanitizer configurations at once.
+        -ft, --use-libFuzzer-two-tier: Fuzz with a fast build without sanitizers and confirm
+                new inputs with the address and memory sanitizer builds.
+        -tc, --triage-crashes: Deduplicate, bucket and minimise the crashes found by libFuzzer.
+        -af, --all-functions: Fuzz all functions of the file with a single fuzzing binary.
+        -w, --workers: Number of parallel fuzzing workers when fuzzing all functions, or of
+                parsing processes when indexing.
+        -i, --index: Index the fuzzable functions and symbolic candidates of all files of the
+                compile database.
+        -ks, --klee-selections: Symbolic selections the bitcode is explored under by KLEE.
+        -cd, --compile-db: Compile database with the arguments the files are parsed with.
+        -fp, --fuzz-profile: Profile with the libFuzzer engine and sanitizer runtime options,
+                or 'auto' to select the profile of the target through short trials.
+        -fc, --fuzz-cluster: Number of fuzzing containers that fuzz the target with a shared corpus.
+        -de, --docker-endpoints: Docker endpoints the containers of the fuzzing cluster are
+                spread over, by default the local Docker daemon.
+        -si, --sync-interval: Seconds between two merges of a node into the shared corpus.
+        -ms, --mutation-shards: Number of containers that test the mutants in parallel.
+        -mt, --mutation-threshold: Minimum mutation score in percent, below it Consept fails.
+        -mr, --mutation-revisions: Git revision range of which the changed lines are mutated.
+        -me, --mutation-equivalence: Do not test mutants that compile to the same object as
+                the original file or as another mutant.
+        -msa, --mutation-sample: Number or percentage of the mutants that are tested, from
+                which the mutation score is estimated.
+        -mst, --mutation-strata: Properties of the mutants the sample is stratified by.
+        -mc, --mutation-coverage: Only run the tests that cover a mutant, and do not test the
+                mutants no test covers.
     """
     parser = argparse.ArgumentParser(
         description='Utility to run KLEE on a given file.')
@@ -199,6 +286,69 @@ def create_parser():
                         help='Use libFuzzer to analyze the file and detect address related issues')
     parser.add_argument('-fm', '--use-libFuzzer-with-memory-sanitizer', action='store_true',
                         help='Use libFuzzer to analyze the file and detect memory related issues')
+    parser.add_argument('-fu', '--use-libFuzzer-with-address-undefined-sanitizer',
+                        action='store_true',
+                        help='Use libFuzzer with a combined address and undefined behaviour ' +
+                        'sanitizer build, undefined behaviour traps')
+    parser.add_argument('-fs', '--sanitizer-configs', nargs='+', default=None,
+                        choices=list(SANITIZER_CONFIGS),
+                        help='Build the fuzzing binary with several sanitizer configurations ' +
+                        'in parallel and fuzz all of them in one campaign')
+    parser.add_argument('-ft', '--use-libFuzzer-two-tier', action='store_true',
+                        help='Use a fast libFuzzer build for coverage and re-check new inputs ' +
+                        'with the address and memory sanitizer builds')
+    parser.add_argument('-tc', '--triage-crashes', action='store_true',
+                        help='Bucket the crashes found by libFuzzer by bug type and top frames ' +
+                        'and minimise one crash per bucket')
+    parser.add_argument('-af', '--all-functions', action='store_true',
+                        help='Fuzz all functions of the file with a single fuzzing binary ' +
+                        'that dispatches on the first input byte')
+    parser.add_argument('-w', '--workers', type=int, default=os.cpu_count(),
+                        help='Number of parallel fuzzing workers when fuzzing all functions, ' +
+                        'or of parsing processes when indexing')
+    parser.add_argument('-i', '--index', action='store_true',
+                        help='Index the fuzzable functions and symbolic candidates of all ' +
+                        'files of the compile_commands.json in the target catalog')
+    parser.add_argument('-ks', '--klee-selections', nargs='+', default=None,
+                        help='Annotate every variable of main with a runtime guard and run ' +
+                        'KLEE on the same bitcode once per selection: all, branch, or ' +
+                        'comma-separated variable names')
+    parser.add_argument('-cd', '--compile-db', default=None,
+                        help='compile_commands.json with the include paths and defines the ' +
+                        'files are parsed with, by default the one next to the file')
+    parser.add_argument('-fp', '--fuzz-profile', choices=list(FUZZ_PROFILES) + ['auto'],
+                        default='default',
+                        help='Profile with the libFuzzer engine and sanitizer runtime options, ' +
+                        '\'auto\' selects and stores the best profile per target')
+    parser.add_argument('-fc', '--fuzz-cluster', type=int, default=0, metavar='NODES',
+                        help='Fuzz with a cluster of NODES fuzzing containers, each pinned to ' +
+                        'its own CPUs, that periodically merge into a shared corpus')
+    parser.add_argument('-de', '--docker-endpoints', nargs='+', default=None,
+                        help='Docker endpoints (e.g. tcp://host:2375) the nodes of the fuzzing ' +
+                        'cluster are spread over, the mount folder must be shared between them')
+    parser.add_argument('-si', '--sync-interval', type=int, default=60,
+                        help='Number of seconds between two merges into the shared corpus')
+    parser.add_argument('-ms', '--mutation-shards', type=int, default=1, metavar='SHARDS',
+                        help='Test the mutants with SHARDS containers in parallel, each with ' +
+                        'its own build tree, and merge their results into the database')
+    parser.add_argument('-mt', '--mutation-threshold', type=float, default=None,
+                        metavar='PERCENT',
+                        help='Exit with status 1 if the mutation score is below PERCENT')
+    parser.add_argument('-mr', '--mutation-revisions', default=None, metavar='RANGE',
+                        help='Only mutate the lines changed in the git revision RANGE, ' +
+                        'e.g. main..HEAD')
+    parser.add_argument('-me', '--mutation-equivalence', action='store_true',
+                        help='Compile every mutant with optimisations and do not test the ' +
+                        'mutants with the same object as the original or another mutant')
+    parser.add_argument('-msa', '--mutation-sample', type=sample_spec, default=None,
+                        metavar='SIZE',
+                        help='Only test a random sample of SIZE mutants, e.g. 200 or 10%%, ' +
+                        'and estimate the mutation score with a 95%% confidence interval')
+    parser.add_argument('-mst', '--mutation-strata', nargs='+', default=[], choices=STRATA,
+                        help='Stratify the sample by mutation operator and/or file')
+    parser.add_argument('-mc', '--mutation-coverage', action='store_true',
+                        help='Record the line coverage of every test and only run the ' +
+                        'tests covering a mutant, most likely to kill it first')
     return parser
 
 
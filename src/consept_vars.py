@@ -14,12 +14,30 @@ FOLDER_NAME_CONCOLIC = 'concolic'
 NAME_CONTAINER_FUZZ = 'container_consept_fuzz'
 NAME_IMAGE_FUZZ = 'image_consept_fuzz'
 FOLDER_NAME_FUZZ = 'fuzz'
+FOLDER_FUZZ_CORPUS = 'tmp/fuzz/corpus'
+FOLDER_FUZZ_RECHECK = 'tmp/fuzz/recheck'
+ARTIFACT_PREFIX_FUZZ = '/home/consept/tmp/fuzz/'
 
 NAME_CONTAINER_MUTATION = 'container_consept_mutation'
 NAME_IMAGE_MUTATION = 'image_consept_mutation'
 FOLDER_NAME_MUTATION = 'mutation'
+FOLDER_NAME_MUTATION_DATABASES = 'databases'
+NAME_VOLUME_MUTATION_BUILD = 'consept_mutation_build'
+NAME_VOLUME_CCACHE = 'consept_ccache'
+NAME_FILE_BUILD_TIMES = 'build_times.txt'
+NAME_FILE_MUTATION_RESULTS = 'results.json'
+NAME_FILE_MUTATION_DIFF = 'changes.diff'
+NAME_FILE_COMPILE_DB = 'compile_commands.json'
+NAME_FILE_TCE_HASHES = 'tce_hashes.txt'
+NAME_SCRIPT_TCE = 'tce.sh'
+NAME_FILE_TEST_COVERAGE = 'test_coverage.txt'
+NAME_FILE_MUTANT_TESTS = 'mutant_tests.txt'
 
 ARR_ALLOWED_TOOLS = ['concolic', 'fuzz', 'mutation']
 
+PATH_CATALOG = os.path.join(PATH_CONSEPT, 'tmp', 'catalog.sqlite3')
+PATH_AST_CACHE = os.path.join(PATH_CONSEPT, 'tmp', 'ast_cache')
+
 PARENT_FOLDER_OF_USER_PROJECT = '/editedUserProject'
 MOUNTED_MUTATION_FOLDER = '/home/consept/tmp/mutation'
+PATH_CCACHE = '/ccache'
@@ -0,0 +1,211 @@
+"""
+This module provides the triage of crashes found by libFuzzer. Every crash is replayed inside
+the fuzzing container, the resulting sanitizer report is parsed and the crashes are bucketed by
+bug type and the top symbolised frames of the crashing stack.
+
+Classes:
+    - CrashTriage(object)
+
+Functions:
+    - parse_sanitizer_report(report, num_frames)
+    - bucket_id(bug_type, frames)
+    - binary_for_crash(crash_name, default_binary)
+"""
+
+import hashlib
+import json
+import os
+import re
+
+from sanitizer_builds import SANITIZER_CONFIGS
+
+# name of the folder (inside the fuzzing mount folder) in which the triage results are stored
+FOLDER_NAME_TRIAGE = 'triage'
+
+# frames of the sanitizer runtimes and of libFuzzer itself say nothing about the bug
+IGNORED_FRAME_PREFIXES = ('__asan', '__msan', '__ubsan', '__lsan', '__sanitizer',
+                          '__interceptor', 'fuzzer::', '__libc_start', '_start')
+IGNORED_FRAMES = ('main',)
+
+SANITIZER_PATTERN = r'(?:ERROR|WARNING): (\w+Sanitizer): (.+?)(?: on | at |:|$)'
+UBSAN_PATTERN = r'runtime error: (.+?)(?::|$)'
+LIBFUZZER_PATTERN = r'ERROR: libFuzzer: (.+?)(?: after | \(|$)'
+FRAME_PATTERN = r'^\s*#(\d+)\s+0x[0-9a-fA-F]+\s+in\s+(.*)$'
+
+
+def _parse_bug_type(report : str) -> str:
+    """
+    Finds the type of the bug in a sanitizer or libFuzzer report.
+    Returns 'unknown' if the report does not contain any recognised error line.
+    """
+    for line in report.splitlines():
+        match = re.search(SANITIZER_PATTERN, line)
+        if match:
+            return f'{match.group(1)}: {match.group(2).strip()}'
+
+    for line in report.splitlines():
+        match = re.search(UBSAN_PATTERN, line)
+        if match:
+            return f'UndefinedBehaviorSanitizer: {match.group(1).strip()}'
+
+    for line in report.splitlines():
+        match = re.search(LIBFUZZER_PATTERN, line)
+        if match:
+            return f'libFuzzer: {match.group(1).strip()}'
+
+    return 'unknown'
+
+
+def _parse_frames(report : str) -> list:
+    """
+    Returns the function names of the first stack trace in the report, which is the stack of
+    the crash itself. Stacks of e.g. the allocation or free site are not taken into account.
+    """
+    frames = []
+    started = False
+    for line in report.splitlines():
+        match = re.match(FRAME_PATTERN, line)
+        if match is None:
+            # the first stack ends at the first line that is not a frame
+            if started:
+                break
+            continue
+
+        # a new stack starts at frame #0
+        if started and int(match.group(1)) == 0:
+            break
+        started = True
+
+        # separate the function from its location, e.g. 'foo(int) /path/file.cpp:10:3'
+        function = match.group(2).strip()
+        parts = function.rsplit(' ', 1)
+        if len(parts) == 2 and (':' in parts[1] or parts[1].startswith('(')):
+            function = parts[0]
+        frames.append(function)
+    return frames
+
+
+def parse_sanitizer_report(report : str, num_frames : int = 3) -> tuple:
+    """
+    Parses a sanitizer report.
+
+    Parameters:
+        report (str): output of replaying a crash against a fuzzing binary
+        num_frames (int): number of frames of the crashing stack to return
+
+    Returns:
+        bug_type (str): type of the bug, e.g. 'AddressSanitizer: heap-use-after-free'
+        frames (list): the top num_frames frames that do not belong to the runtimes
+    """
+    frames = [frame for frame in _parse_frames(report)
+              if not frame.startswith(IGNORED_FRAME_PREFIXES) and frame not in IGNORED_FRAMES]
+    return _parse_bug_type(report), frames[:num_frames]
+
+
+def bucket_id(bug_type : str, frames : list) -> str:
+    """
+    Returns a short, stable identifier of the bucket a crash with this bug type and frames
+    belongs to.
+    """
+    key = '|'.join([bug_type] + frames)
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:12]
+
+
+def binary_for_crash(crash_name : str, default_binary : str) -> str:
+    """
+    Returns the fuzzing binary a crash has to be replayed with. Crashes confirmed by the
+    sanitizer re-check of two-tier fuzzing or by a sanitizer configuration belong to the
+    corresponding build.
+    """
+    for build in SANITIZER_CONFIGS:
+        if crash_name.startswith(f'crash-{build}-'):
+            return f'fuzz_{build}'
+    return default_binary
+
+
+class CrashTriage:
+    """
+    Class that buckets the crashes in the fuzzing mount folder. It expects every crash file
+    crash-<name> to be accompanied by the report crash-<name>.log of its replay.
+    """
+
+    def __init__(self, path_mount_folder : str, num_frames : int = 3):
+        """
+        Constructor of the CrashTriage class.
+
+        Parameters:
+            path_mount_folder (str): local path of the fuzzing mount folder
+            num_frames (int): number of top frames that determine the bucket of a crash
+        """
+        self.path_mount_folder = path_mount_folder
+        self.num_frames = num_frames
+        self.path_triage_folder = os.path.join(path_mount_folder, FOLDER_NAME_TRIAGE)
+
+    @property
+    def crash_files(self) -> list:
+        """
+        Returns the names of all crash files in the mount folder which have a report
+        """
+        return sorted(
+            name for name in os.listdir(self.path_mount_folder)
+            if name.startswith('crash-') and not name.endswith('.log')
+            and os.path.exists(os.path.join(self.path_mount_folder, name + '.log')))
+
+    def bucket_crashes(self) -> list:
+        """
+        Parses the report of every crash and groups the crashes with the same bug type and
+        top frames. The smallest crash of a bucket is its representative.
+
+        Returns:
+            buckets (list): list of dictionaries, one per bucket, ordered by the number of
+            crashes in the bucket
+        """
+        buckets = {}
+        for name in self.crash_files:
+            with open(os.path.join(self.path_mount_folder, name + '.log'), 'r',
+                      encoding='utf-8', errors='replace') as file:
+                bug_type, frames = parse_sanitizer_report(file.read(), self.num_frames)
+
+            identifier = bucket_id(bug_type, frames)
+            bucket = buckets.setdefault(identifier, {
+                'id': identifier,
+                'bug_type': bug_type,
+                'frames': frames,
+                'crashes': [],
+            })
+            bucket['crashes'].append(name)
+
+        for bucket in buckets.values():
+            bucket['count'] = len(bucket['crashes'])
+            bucket['representative'] = min(
+                bucket['crashes'],
+                key=lambda name: os.path.getsize(os.path.join(self.path_mount_folder, name)))
+            bucket['minimized'] = f'{FOLDER_NAME_TRIAGE}/bucket-{bucket["id"]}.min'
+
+        return sorted(buckets.values(), key=lambda bucket: -bucket['count'])
+
+    def write_index(self, buckets : list) -> str:
+        """
+        Writes the bucket index to the triage folder.
+
+        Returns:
+            path_index (str): local path of the written index
+        """
+        os.makedirs(self.path_triage_folder, exist_ok=True)
+        path_index = os.path.join(self.path_triage_folder, 'index.json')
+        with open(path_index, 'w', encoding='utf-8') as file:
+            json.dump(buckets, file, indent=4)
+        return path_index
+
+    @staticmethod
+    def summary(buckets : list) -> str:
+        """
+        Returns a human readable summary of the buckets.
+        """
+        num_crashes = sum(bucket['count'] for bucket in buckets)
+        lines = [f'{num_crashes} crash(es) in {len(buckets)} distinct bucket(s)']
+        for bucket in buckets:
+            lines.append(f'[{bucket["id"]}] {bucket["count"]}x {bucket["bug_type"]}')
+            for frame in bucket['frames']:
+                lines.append(f'    in {frame}')
+        return '\n'.join(lines)
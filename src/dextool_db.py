@@ -0,0 +1,381 @@
+"""
+This module provides access to the SQLite database in which Dextool stores the mutants of a
+project and their results. The mutants without a result can be split over several copies of
+the database, such that several containers test a share of the mutants each, after which the
+results of the copies are merged back into the database. After a run the results are read
+from the database: the mutation score, the surviving mutants by file and line, the number of
+mutants every test killed and the time every mutant took. For a run on the changes of a
+revision range, the mutants on the changed lines are told apart from those that were skipped.
+
+Classes:
+    - DextoolDatabase(object)
+
+Functions:
+    - kind_operator(kind)
+"""
+
+import os
+import sqlite3
+
+# status of a mutant in the mutation_status table of Dextool, by value
+STATUSES = ['unknown', 'killed', 'alive', 'killedByCompiler', 'timeout', 'noCoverage',
+            'equivalent', 'skipped', 'memOverload']
+STATUS_UNKNOWN = STATUSES.index('unknown')
+STATUS_SKIPPED = STATUSES.index('skipped')
+
+# statuses of the mutants that the tests detected and of those that survived, the other
+# mutants do not count for the mutation score
+DETECTED_STATUSES = ['killed', 'timeout', 'killedByCompiler', 'memOverload']
+SURVIVED_STATUSES = ['alive', 'noCoverage']
+
+# kinds of mutants in the mutation table of Dextool, by value, in the order of Mutation.Kind
+KINDS = ['none', 'rorLT', 'rorLE', 'rorGT', 'rorGE', 'rorEQ', 'rorNE', 'lcrAnd', 'lcrOr',
+         'aorMul', 'aorDiv', 'aorRem', 'aorAdd', 'aorSub', 'aorMulAssign', 'aorDivAssign',
+         'aorRemAssign', 'aorAddAssign', 'aorSubAssign', 'uoiPostInc', 'uoiPostDec',
+         'uoiPreInc', 'uoiPreDec', 'uoiAddress', 'uoiIndirection', 'uoiNegation',
+         'uoiComplement', 'absPos', 'absNeg', 'absZero', 'stmtDel', 'corAnd', 'corOr',
+         'corFalse', 'corLhs', 'corRhs', 'corEQ', 'corNE', 'corTrue', 'rorTrue', 'rorFalse',
+         'dcrTrue', 'dcrFalse', 'dcrBomb', 'dcrCaseDel', 'lcrRhs', 'lcrLhs', 'lcrTrue',
+         'lcrFalse', 'aorLhs', 'aorRhs', 'uoiDel']
+
+# operators of dextool_config.toml by the prefix of the kinds of their mutants
+OPERATOR_PREFIXES = {'ror': 'ror', 'lcr': 'lcr', 'aor': 'aor', 'uoi': 'uoi', 'stmtDel': 'sdl',
+                     'abs': 'abs', 'cor': 'cor', 'dcr': 'dcr'}
+
+
+def kind_operator(kind : int) -> str:
+    """
+    Returns the mutation operator of a kind of mutant, e.g. 'ror' for rorLT, or 'other' for
+    a kind that is not known.
+    """
+    name = KINDS[kind] if 0 <= kind < len(KINDS) else ''
+    return next((operator for prefix, operator in OPERATOR_PREFIXES.items()
+                 if name.startswith(prefix)), 'other')
+
+
+class DextoolDatabase:
+    """
+    Class that reads and edits the mutants of a Dextool database.
+    """
+
+    def __init__(self, path_database : str):
+        """
+        Constructor of the DextoolDatabase class.
+
+        Parameters:
+            path_database (str): path of the database that Dextool created
+        """
+        self.path_database = path_database
+        self.connection = sqlite3.connect(path_database)
+
+    def _columns(self, table : str) -> list:
+        """
+        Returns the columns of a table, which differ between versions of Dextool.
+        """
+        return [row[1] for row in self.connection.execute(f'PRAGMA table_info({table})')]
+
+    def status_counts(self) -> dict:
+        """
+        Returns the number of mutants per status, for the statuses that occur.
+        """
+        rows = self.connection.execute(
+            'SELECT status, COUNT(*) FROM mutation_status GROUP BY status ORDER BY status')
+        return {STATUSES[status] if status < len(STATUSES) else str(status): count
+                for status, count in rows}
+
+    def untested(self) -> list:
+        """
+        Returns the ids of the mutation statuses that have no result yet, i.e. the mutants
+        that the next run of Dextool tests.
+        """
+        return [row[0] for row in self.connection.execute(
+            'SELECT id FROM mutation_status WHERE status = ? ORDER BY id', (STATUS_UNKNOWN,))]
+
+    def untested_files(self) -> list:
+        """
+        Returns the id of every mutation status without a result, with the path of the file of
+        its first mutant, relative to the root of the project, and the kind of that mutant.
+        """
+        return [tuple(row) for row in self.connection.execute(
+            'SELECT mutation_status.id, MIN(files.path), MIN(mutation.kind) FROM mutation_status '
+            'JOIN mutation ON mutation.st_id = mutation_status.id '
+            'JOIN mutation_point ON mutation_point.id = mutation.mp_id '
+            'JOIN files ON files.id = mutation_point.file_id '
+            'WHERE status = ? GROUP BY mutation_status.id ORDER BY mutation_status.id',
+            (STATUS_UNKNOWN,))]
+
+    def untested_lines(self) -> list:
+        """
+        Returns the id of every mutation status without a result, with the path of the file of
+        its first mutant, relative to the root of the project, and the first and last line of
+        the mutated code.
+        """
+        return [tuple(row) for row in self.connection.execute(
+            'SELECT mutation_status.id, MIN(files.path), MIN(mutation_point.line), '
+            'MAX(COALESCE(mutation_point.line_end, mutation_point.line)) FROM mutation_status '
+            'JOIN mutation ON mutation.st_id = mutation_status.id '
+            'JOIN mutation_point ON mutation_point.id = mutation.mp_id '
+            'JOIN files ON files.id = mutation_point.file_id '
+            'WHERE status = ? GROUP BY mutation_status.id ORDER BY mutation_status.id',
+            (STATUS_UNKNOWN,))]
+
+    def checksums(self) -> dict:
+        """
+        Returns the checksum of every mutation status without a result, by id. Dextool exports
+        it in DEXTOOL_MUTID to the test command when the mutant is activated in a schema, as
+        an unsigned 64 bit integer, while SQLite stores it signed.
+        """
+        return {status_id: checksum % 2 ** 64 for status_id, checksum in self.connection.execute(
+            'SELECT id, checksum0 FROM mutation_status WHERE status = ? AND checksum0 IS NOT NULL',
+            (STATUS_UNKNOWN,))}
+
+    def test_kills(self) -> list:
+        """
+        Returns the name of every test with the number of mutants it killed, the test that
+        killed the most mutants first.
+        """
+        return self.connection.execute(
+            'SELECT name, COUNT(DISTINCT st_id) FROM all_test_case LEFT JOIN killed_test_case '
+            'ON killed_test_case.tc_id = all_test_case.id GROUP BY all_test_case.id '
+            'ORDER BY COUNT(DISTINCT st_id) DESC, name').fetchall()
+
+    def statuses(self, status_ids : list) -> dict:
+        """
+        Returns the status of mutants by name, per id of their mutation status.
+        """
+        marks = ', '.join('?' * len(status_ids))
+        return {status_id: STATUSES[status] for status_id, status in self.connection.execute(
+            f'SELECT id, status FROM mutation_status WHERE id IN ({marks})', list(status_ids))}
+
+    def set_statuses(self, statuses : dict) -> None:
+        """
+        Sets the status of mutants, given per id of their mutation status by name.
+        """
+        with self.connection:
+            self.connection.executemany(
+                'UPDATE mutation_status SET status = ? WHERE id = ?',
+                [(STATUSES.index(status), status_id) for status_id, status in statuses.items()])
+
+    def copy_statuses(self, duplicates : dict) -> None:
+        """
+        Gives every duplicate mutant the status of the mutant it duplicates, given per id of
+        the duplicate, once that mutant has a result.
+        """
+        with self.connection:
+            for duplicate, original in duplicates.items():
+                self.connection.execute(
+                    'UPDATE mutation_status SET status = (SELECT status FROM mutation_status '
+                    'WHERE id = ?) WHERE id = ? AND EXISTS (SELECT 1 FROM mutation_status '
+                    'WHERE id = ? AND status != ?)',
+                    (original, duplicate, original, STATUS_UNKNOWN))
+
+    @staticmethod
+    def shard_path(path_database : str, shard : int) -> str:
+        """
+        Returns the path of the copy of a database for a shard.
+        """
+        root, extension = os.path.splitext(path_database)
+        return f'{root}.shard-{shard}{extension}'
+
+    def shard(self, shards : int) -> list:
+        """
+        Splits the untested mutants round-robin over copies of the database. In every copy the
+        untested mutants of the other shards are marked as skipped, so Dextool only tests the
+        mutants of its own shard.
+
+        Parameters:
+            shards (int): number of copies
+
+        Returns:
+            paths (list): path of the copy of every shard
+        """
+        untested = self.untested()
+        paths = []
+        for shard in range(shards):
+            path_shard = self.shard_path(self.path_database, shard)
+            if os.path.exists(path_shard):
+                os.remove(path_shard)
+
+            # the backup API gives a consistent copy, also of a database in use
+            with sqlite3.connect(path_shard) as connection:
+                self.connection.backup(connection)
+                others = [status_id for position, status_id in enumerate(untested)
+                          if position % shards != shard]
+                connection.executemany('UPDATE mutation_status SET status = ? WHERE id = ?',
+                                       [(STATUS_SKIPPED, status_id) for status_id in others])
+            connection.close()
+            paths.append(path_shard)
+        return paths
+
+    def merge(self, paths : list, failed : list = ()) -> int:
+        """
+        Merges the results of the copies of the shards back into the database: the statuses
+        of the untested mutants and the test cases that killed them.
+
+        Parameters:
+            paths (list): paths of the copies, as returned by shard()
+            failed (list): indices of the shards that failed, their results are not merged
+
+        Returns:
+            merged (int): number of mutants that got a result
+        """
+        untested = self.untested()
+        columns = [column for column in self._columns('mutation_status') if column != 'id']
+        merged = 0
+        with self.connection:
+            for shard, path_shard in enumerate(paths):
+                if shard in failed:
+                    continue
+                mine = untested[shard::len(paths)]
+                with sqlite3.connect(path_shard) as connection:
+                    for status_id in mine:
+                        row = connection.execute(
+                            f'SELECT {", ".join(columns)} FROM mutation_status WHERE id = ?',
+                            (status_id,)).fetchone()
+                        if row is None or row[columns.index('status')] == STATUS_UNKNOWN:
+                            continue
+                        self.connection.execute(
+                            f'UPDATE mutation_status SET {", ".join(c + " = ?" for c in columns)} '
+                            'WHERE id = ?', list(row) + [status_id])
+                        self._merge_killed(connection, status_id)
+                        merged += 1
+                connection.close()
+        return merged
+
+    def _merge_killed(self, connection : sqlite3.Connection, status_id : int) -> None:
+        """
+        Copies the test cases that killed a mutant from the copy of a shard, the ids of the
+        test cases differ between the copies as they are added while testing.
+        """
+        self.connection.execute('DELETE FROM killed_test_case WHERE st_id = ?', (status_id,))
+        killed = connection.execute(
+            'SELECT all_test_case.name, killed_test_case.location FROM killed_test_case '
+            'JOIN all_test_case ON all_test_case.id = killed_test_case.tc_id '
+            'WHERE killed_test_case.st_id = ?', (status_id,)).fetchall()
+        for name, location in killed:
+            row = self.connection.execute('SELECT id FROM all_test_case WHERE name = ?',
+                                          (name,)).fetchone()
+            test_case_id = row[0] if row is not None else self.connection.execute(
+                'INSERT INTO all_test_case (name) VALUES (?)', (name,)).lastrowid
+            self.connection.execute(
+                'INSERT INTO killed_test_case (st_id, tc_id, location) VALUES (?, ?, ?)',
+                (status_id, test_case_id, location))
+
+    def _mutants(self, statuses : list) -> list:
+        """
+        Returns the mutants with the given statuses, one per mutation status, with the file
+        and the position of their first occurrence.
+        """
+        timings = [column for column in ['compile_time_ms', 'test_time_ms']
+                   if column in self._columns('mutation_status')]
+        rows = self.connection.execute(
+            'SELECT mutation_status.id, status, files.path, mutation_point.line, '
+            f'mutation_point.column, mutation.kind{"".join(", " + c for c in timings)} '
+            'FROM mutation_status JOIN mutation ON mutation.st_id = mutation_status.id '
+            'JOIN mutation_point ON mutation_point.id = mutation.mp_id '
+            'JOIN files ON files.id = mutation_point.file_id '
+            f'WHERE status IN ({", ".join("?" * len(statuses))}) '
+            'GROUP BY mutation_status.id ORDER BY files.path, mutation_point.line',
+            [STATUSES.index(status) for status in statuses]).fetchall()
+
+        mutants = []
+        for row in rows:
+            mutant = dict(zip(['id', 'status', 'path', 'line', 'column', 'kind'], row))
+            mutant['status'] = STATUSES[mutant['status']]
+            mutant.update({timing: row[6 + index] or 0 for index, timing in enumerate(timings)})
+            mutants.append(mutant)
+        return mutants
+
+    def results(self, slowest : int = 10) -> dict:
+        """
+        Returns the results of the mutants that were tested.
+
+        Parameters:
+            slowest (int): number of slowest mutants to return
+
+        Returns:
+            results (dict): the mutation score in percent (None without tested mutants), the
+            number of mutants per status, the surviving mutants per file ordered by line, the
+            number of mutants every test killed and the mutants that took longest
+        """
+        counts = self.status_counts()
+        detected = sum(counts.get(status, 0) for status in DETECTED_STATUSES)
+        survived = sum(counts.get(status, 0) for status in SURVIVED_STATUSES)
+
+        survivors = {}
+        for mutant in self._mutants(SURVIVED_STATUSES):
+            survivors.setdefault(mutant.pop('path'), []).append(mutant)
+
+        # the time of a mutant is the time to compile it and to run the tests on it
+        tested = self._mutants(DETECTED_STATUSES + SURVIVED_STATUSES)
+        for mutant in tested:
+            mutant['time_ms'] = mutant.get('compile_time_ms', 0) + mutant.get('test_time_ms', 0)
+
+        return {
+            'score': round(100 * detected / (detected + survived), 2)
+                     if detected + survived else None,
+            'counts': counts,
+            'survivors': survivors,
+            'tests': [{'name': name, 'kills': count} for name, count in self.test_kills()],
+            'slowest': sorted(tested, key=lambda mutant: -mutant['time_ms'])[:slowest],
+        }
+
+    @staticmethod
+    def summary(results : dict, limit : int = 10) -> str:
+        """
+        Returns a human readable summary of the results, see results().
+        """
+        score = 'n/a' if results['score'] is None else f'{results["score"]:.2f}%'
+        counts = ', '.join(f'{count} {status}' for status, count in results['counts'].items())
+        lines = [f'Mutation score {score} ({counts or "no mutants"})']
+
+        survivors = [(path, mutant) for path, mutants in results['survivors'].items()
+                     for mutant in mutants]
+        lines.append(f'{len(survivors)} surviving mutant(s)')
+        lines += [f'  {path}:{mutant["line"]}:{mutant["column"]} kind {mutant["kind"]} '
+                  f'{mutant["status"]}' for path, mutant in survivors[:limit]]
+
+        lines.append('Mutants killed per test')
+        lines += [f'  {test["kills"]:>5} {test["name"]}' for test in results['tests'][:limit]]
+
+        lines.append('Slowest mutants')
+        lines += [f'  {mutant["time_ms"] / 1000:>8.1f} s {mutant["path"]}:{mutant["line"]} '
+                  f'{mutant["status"]}' for mutant in results['slowest'][:limit]]
+        return '\n'.join(lines)
+
+    def diff_scope(self, changes : dict) -> dict:
+        """
+        Returns how many mutants are on the changed lines of a diff and how many mutants
+        elsewhere were skipped, as they have no result.
+
+        Parameters:
+            changes (dict): per path of a file the (first, last) ranges of the changed lines,
+            see utils.git_diff.changed_lines()
+
+        Returns:
+            scope (dict): the number of mutants on the changed lines ('changed'), how many of
+            them have no result ('untested'), and the number of mutants without a result
+            elsewhere ('skipped')
+        """
+        rows = self.connection.execute(
+            'SELECT mutation_status.id, status, files.path, mutation_point.line, '
+            'mutation_point.line_end FROM mutation_status '
+            'JOIN mutation ON mutation.st_id = mutation_status.id '
+            'JOIN mutation_point ON mutation_point.id = mutation.mp_id '
+            'JOIN files ON files.id = mutation_point.file_id').fetchall()
+
+        changed, untested = set(), set()
+        for status_id, status, path, line, line_end in rows:
+            if any(first <= (line_end or line) and line <= last
+                   for first, last in changes.get(path, [])):
+                changed.add(status_id)
+            if status == STATUS_UNKNOWN:
+                untested.add(status_id)
+        return {'changed': len(changed), 'untested': len(changed & untested),
+                'skipped': len(untested - changed)}
+
+    def close(self) -> None:
+        """
+        Closes the connection to the database.
+        """
+        self.connection.close()
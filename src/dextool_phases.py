@@ -0,0 +1,248 @@
+"""
+This module provides the phases of Dextool that Consept runs in separate containers, instead
+of running Dextool in one go: the analysis, the filtering of equivalent and duplicate mutants,
+the sampling of the mutants, the coverage based selection of their tests, the testing, by one
+container or by a container per shard, and the report. It also provides the database and the
+build volumes of a project, which are kept across runs.
+
+Classes:
+    - DextoolPhases(ToolHandler)
+"""
+import hashlib
+import json
+import os
+import re
+
+from application_manager import ApplicationManager
+from consept_vars import FOLDER_NAME_MUTATION_DATABASES, MOUNTED_MUTATION_FOLDER, \
+    NAME_CONTAINER_MUTATION, NAME_FILE_COMPILE_DB, NAME_FILE_MUTANT_TESTS, \
+    NAME_FILE_TCE_HASHES, NAME_FILE_TEST_COVERAGE, NAME_SCRIPT_TCE, NAME_VOLUME_CCACHE, \
+    NAME_VOLUME_MUTATION_BUILD, PATH_CCACHE
+from dextool_db import DextoolDatabase
+from fuzz_cluster import split_cpus
+import mutant_coverage
+from mutant_equivalence import TrivialCompilerEquivalence, object_commands
+import mutant_sampling
+from tool_handler import ToolHandler
+
+
+class DextoolPhases(ToolHandler):
+    """
+    Class that runs the phases of Dextool in separate containers.
+    """
+    def run_phases(self, project_root, shards, *, tce=False, sample=None, coverage=False):
+        '''
+        Runs Dextool phase by phase in separate containers: the project is analysed, the
+        equivalent and duplicate mutants are filtered out if tce is set, a sample is drawn if a
+        (sample, strata) pair is given, after which the uncovered sampled mutants are marked by
+        coverage if coverage is set, the mutants are tested by one container or by a container
+        per shard, and the report is created. Returns the estimate of the mutation
+        score of a sample, see mutant_sampling.estimate(), or None.
+        '''
+        script = f'{MOUNTED_MUTATION_FOLDER}/run_dextool.sh'
+        super().run_tool(f'bash {script} analyze', project_root,
+                         volumes=self.volumes(project_root))
+
+        duplicates = self.run_tce(project_root) if tce else {}
+        population, sampled = self.sample_mutants(project_root, *sample) if sample else ([], [])
+        try:
+            if coverage:
+                self.select_tests(project_root)
+            if shards > 1:
+                self.test_shards(project_root, shards)
+            else:
+                super().run_tool(f'bash {script} test', project_root,
+                                 volumes=self.volumes(project_root))
+        finally:
+            # the mutants left out of the sample are tested by a later run, also if this one
+            # fails
+            if sample:
+                database = DextoolDatabase(self.database_path(project_root))
+                database.set_statuses({mutant[0]: 'unknown' for mutant in population
+                                       if mutant[0] not in set(sampled)})
+                database.close()
+
+        # the duplicates get the results of the mutants they duplicate
+        database = DextoolDatabase(self.database_path(project_root))
+        database.copy_statuses(duplicates)
+        estimated = None
+        if sample:
+            estimated = mutant_sampling.estimate(population, sampled,
+                                                 database.statuses(sampled), sample[1])
+        database.close()
+
+        super().run_tool(f'bash {script} report', project_root,
+                         volumes=self.volumes(project_root))
+        return estimated
+
+    def sample_mutants(self, project_root, sample, strata):
+        '''
+        Draws a random sample of the untested mutants, stratified by the given strata, and
+        marks the other untested mutants as skipped for this run. Returns the untested mutants
+        and the ids of the sampled mutants.
+        '''
+        database = DextoolDatabase(self.database_path(project_root))
+        population = database.untested_files()
+        sampled = mutant_sampling.draw(
+            population, mutant_sampling.sample_size(sample, len(population)), strata)
+        database.set_statuses({mutant[0]: 'skipped' for mutant in population
+                               if mutant[0] not in set(sampled)})
+        database.close()
+        stratified = f', stratified by {" and ".join(strata)}' if strata else ''
+        self.logger.info(f'Testing a sample of {len(sampled)} of {len(population)} mutants'
+                         f'{stratified}')
+        return population, sampled
+
+    def select_tests(self, project_root):
+        '''
+        Records the lines every test covers with an instrumented build in a container, marks
+        the untested mutants no test covers as not covered and writes the covering tests of
+        every other mutant, most likely to kill it first, to the file test.sh reads.
+        '''
+        super().run_tool(f'bash {MOUNTED_MUTATION_FOLDER}/run_dextool.sh coverage',
+                         project_root, volumes=self.volumes(project_root))
+        environment = ApplicationManager.container_environment('mutation', project_root)
+        coverage = mutant_coverage.read_coverage(
+            os.path.join(self.path_mount_folder, NAME_FILE_TEST_COVERAGE),
+            environment['EDITED_USER_PROJECT_PATH'])
+
+        database = DextoolDatabase(self.database_path(project_root))
+        mutants, checksums = database.untested_lines(), database.checksums()
+        uncovered, selection = mutant_coverage.select_tests(mutants, coverage,
+                                                            database.test_kills())
+        database.set_statuses({status_id: 'noCoverage' for status_id in uncovered})
+        database.close()
+        mutant_coverage.write_selection(
+            os.path.join(self.path_mount_folder, NAME_FILE_MUTANT_TESTS), selection, mutants,
+            checksums)
+        print(mutant_coverage.summary(uncovered, selection))
+
+    def run_tce(self, project_root):
+        '''
+        Compiles every untested mutant with optimisations in a container and marks the mutants
+        of which the object equals that of the original file as equivalent, those that equal
+        another mutant as duplicates and those that do not compile as killed by the compiler.
+        Returns the duplicates of all runs of the project, by id of the duplicate.
+        '''
+        environment = ApplicationManager.container_environment('mutation', project_root)
+        commands = object_commands(os.path.join(self.path_mount_folder, NAME_FILE_COMPILE_DB),
+                                   environment['EDITED_USER_PROJECT_PATH'])
+        tce = TrivialCompilerEquivalence(commands,
+                                         f'{MOUNTED_MUTATION_FOLDER}/{NAME_FILE_TCE_HASHES}')
+
+        database = DextoolDatabase(self.database_path(project_root))
+        mutants = [mutant for mutant in database.untested_files() if mutant[1] in commands]
+        self.open_new_script(NAME_SCRIPT_TCE)
+        for line in tce.script(mutants):
+            self.add_command(line)
+        self.convert_script()
+        super().run_tool(f'bash {MOUNTED_MUTATION_FOLDER}/run_dextool.sh tce', project_root,
+                         volumes=self.volumes(project_root))
+
+        statuses, duplicates = tce.classify(os.path.join(self.path_mount_folder,
+                                                         NAME_FILE_TCE_HASHES))
+        database.set_statuses(statuses)
+        database.close()
+        print(tce.summary(len(mutants), statuses))
+        return self.merge_duplicates(project_root, duplicates)
+
+    def merge_duplicates(self, project_root, duplicates):
+        '''
+        Merges the duplicates found by this run with those of earlier runs of the project,
+        which were not tested yet, and stores them next to the database. Returns the merged
+        duplicates, by id of the duplicate.
+        '''
+        path_duplicates = os.path.splitext(self.database_path(project_root))[0] + \
+            '.duplicates.json'
+        merged = {}
+        if os.path.exists(path_duplicates):
+            # JSON keys are strings, the ids of the duplicates are integers
+            with open(path_duplicates, 'r', encoding='utf-8') as file:
+                merged = {int(key): value for key, value in json.load(file).items()}
+        merged.update(duplicates)
+        with open(path_duplicates, 'w', encoding='utf-8') as file:
+            json.dump(merged, file)
+        return merged
+
+    def test_shards(self, project_root, shards):
+        '''
+        Splits the untested mutants of the database over a copy of the database per shard and
+        tests the shards in parallel containers, each pinned to its own CPUs and with its own
+        build tree. The results of the shards are merged back into the database, except those
+        of the shards that failed, of which the output is printed; their mutants stay untested.
+        '''
+        script = f'{MOUNTED_MUTATION_FOLDER}/run_dextool.sh'
+        database = DextoolDatabase(self.database_path(project_root))
+        paths = database.shard(shards)
+        self.logger.info(f'Testing {len(database.untested())} mutants in {shards} shards')
+
+        containers = []
+        cpusets = split_cpus(shards, self.app_man.cpu_count())
+        for shard, (path_shard, cpuset) in enumerate(zip(paths, cpusets)):
+            path_container = (f'{MOUNTED_MUTATION_FOLDER}/{FOLDER_NAME_MUTATION_DATABASES}/'
+                              f'{os.path.basename(path_shard)}')
+            containers.append(self.app_man.start_container(
+                'mutation', f'bash {script} test {path_container}', project_root,
+                name_container=f'{NAME_CONTAINER_MUTATION}_shard_{shard}',
+                cpuset_cpus=cpuset, volumes=self.volumes(project_root, shard)))
+
+        # wait for all shards, the output of every shard is logged when it is done and printed
+        # if the shard failed, e.g. because its build broke, as its results can not be trusted
+        failed = []
+        for shard, container in enumerate(containers):
+            status = container.wait()['StatusCode']
+            output = container.logs().decode('utf-8', errors='replace')
+            self.logger.info(output)
+            container.remove()
+            if status != 0:
+                failed.append(shard)
+                print(f'Shard {shard} failed with exit code {status}, its results are not '
+                      f'merged:\n{output}')
+
+        merged = database.merge(paths, failed)
+        database.close()
+        for path_shard in paths:
+            os.remove(path_shard)
+        self.logger.info(f'Merged the results of {merged} mutants of '
+                         f'{shards - len(failed)} of {shards} shards')
+
+    @staticmethod
+    def project_key(project_root):
+        '''
+        Returns the key of a project: the name of the project folder and the hash of its path,
+        such that projects with the same name do not share their database or build tree.
+        '''
+        project_root = os.path.abspath(project_root)
+        path_hash = hashlib.sha1(project_root.encode('utf-8')).hexdigest()[:8]
+        name = re.sub(r'[^a-zA-Z0-9_.-]', '_', os.path.basename(project_root))
+        return f'{name}-{path_hash}'
+
+    def database_name(self, project_root):
+        '''
+        Returns the name of the Dextool database of a project.
+        '''
+        return f'{self.project_key(project_root)}.sqlite3'
+
+    def volumes(self, project_root, shard=None):
+        '''
+        Returns the named Docker volumes of the mutation container of a project, by target
+        path: the build tree of the project and the compiler cache shared by all projects. Both
+        survive the container, so a run only recompiles what changed since the last run. Every
+        shard has a build tree of its own.
+        '''
+        environment = ApplicationManager.container_environment('mutation', project_root)
+        name_build = f'{NAME_VOLUME_MUTATION_BUILD}_{self.project_key(project_root)}'
+        return {
+            environment['EDITED_USER_PROJECT_PATH'] + '/build':
+                name_build if shard is None else f'{name_build}_shard_{shard}',
+            PATH_CCACHE: NAME_VOLUME_CCACHE,
+        }
+
+    def database_path(self, project_root):
+        '''
+        Returns the path on the host of the Dextool database of a project. The database is
+        kept across runs, so Dextool only analyses the files that changed and only tests the
+        mutants it has no result for yet.
+        '''
+        return os.path.join(self.path_mount_folder, FOLDER_NAME_MUTATION_DATABASES,
+                            self.database_name(project_root))
@@ -0,0 +1,230 @@
+"""
+This module provides a utility to fuzz one target with a cluster of fuzzing containers. Every
+node of the cluster is a container pinned to its own set of CPUs, possibly on another Docker
+endpoint. The nodes share the corpus folder on the host volume: a node fuzzes in rounds and
+after every round merges its new inputs into the shared corpus with libFuzzer's -merge=1, such
+that the other nodes pick them up in their next round. The results of the nodes are aggregated
+when all of them have finished.
+
+Classes:
+    - FuzzCluster(object)
+
+Functions:
+    - split_cpus(nodes, cpu_count)
+"""
+
+import json
+import os
+
+from fuzz_stats import parse_status_line
+from consept_vars import FOLDER_FUZZ_CORPUS, NAME_CONTAINER_FUZZ
+
+# folder (inside the fuzzing mount folder) with the private corpus and the log of every node
+FOLDER_NAME_CLUSTER = 'cluster'
+
+
+def split_cpus(nodes : int, cpu_count : int) -> list:
+    """
+    Splits the CPUs of a host into one CPU set per node. Every node gets an equal, contiguous
+    share of at least one CPU; if there are more nodes than CPUs, nodes share CPUs.
+
+    Parameters:
+        nodes (int): number of nodes on the host
+        cpu_count (int): number of CPUs of the host
+
+    Returns:
+        cpusets (list): CPU set per node in the notation of Docker, e.g. '0-3'
+    """
+    if nodes >= cpu_count:
+        return [str(node % cpu_count) for node in range(nodes)]
+
+    share = cpu_count // nodes
+    cpusets = []
+    for node in range(nodes):
+        first = node * share
+        last = first + share - 1
+        cpusets.append(str(first) if first == last else f'{first}-{last}')
+    return cpusets
+
+
+class FuzzCluster:
+    """
+    Class that runs a fuzzing campaign on several fuzzing containers with a shared corpus.
+    """
+
+    def __init__(self, fuzz_handler, nodes : int, endpoints : list = None,
+                 sync_interval : int = 60):
+        """
+        Constructor of the FuzzCluster class.
+
+        Parameters:
+            fuzz_handler (FuzzHandler): handler with the options and the application manager
+            of the campaign
+            nodes (int): number of fuzzing containers
+            endpoints (list): base urls of the Docker endpoints the nodes are spread over,
+            None to run all nodes on the local Docker daemon
+            sync_interval (int): number of seconds between two merges into the shared corpus
+        """
+        self.fuzz_handler = fuzz_handler
+        self.nodes = nodes
+        self.endpoints = endpoints or [None]
+        self.sync_interval = sync_interval
+        self.path_cluster_folder = os.path.join(fuzz_handler.path_mount_folder,
+                                                FOLDER_NAME_CLUSTER)
+
+    def placements(self) -> list:
+        """
+        Spreads the nodes round-robin over the endpoints and pins every node to a CPU set of
+        the host behind its endpoint.
+
+        Returns:
+            placements (list): one dictionary per node with its name, endpoint and CPU set
+        """
+        endpoint_nodes = {endpoint: [] for endpoint in self.endpoints}
+        for node in range(self.nodes):
+            endpoint_nodes[self.endpoints[node % len(self.endpoints)]].append(node)
+
+        placements = []
+        for endpoint, nodes in endpoint_nodes.items():
+            if not nodes:
+                continue
+            cpusets = split_cpus(len(nodes), self.fuzz_handler.app_man.cpu_count(endpoint))
+            for node, cpuset in zip(nodes, cpusets):
+                placements.append({'node': node,
+                                   'name': f'{NAME_CONTAINER_FUZZ}_node_{node}',
+                                   'endpoint': endpoint,
+                                   'cpuset': cpuset})
+        return sorted(placements, key=lambda placement: placement['node'])
+
+    def node_commands(self, node : int, binary : str, time_limit : int) -> list:
+        """
+        Returns the commands a node runs. The node fuzzes in rounds of at most the sync
+        interval, reading the shared corpus and writing new inputs to its private corpus.
+        After every round the private corpus is merged into the shared one, which only adds
+        inputs that increase the coverage of the shared corpus.
+
+        Parameters:
+            node (int): number of the node
+            binary (str): name of the fuzzing binary inside the mount folder
+            time_limit (int): number of seconds the node is allowed to fuzz
+
+        Returns:
+            commands (list): the commands of the script of the node
+        """
+        folder = f'tmp/fuzz/{FOLDER_NAME_CLUSTER}/node-{node}'
+        return [
+            f'mkdir -p {FOLDER_FUZZ_CORPUS} {folder}',
+            f'END=$(( $(date +%s) + {time_limit} ))',
+            'while [ "$(date +%s)" -lt "$END" ]; do',
+            'ROUND=$(( END - $(date +%s) ))',
+            f'if [ "$ROUND" -gt {self.sync_interval} ]; then ROUND={self.sync_interval}; fi',
+            f'{self.fuzz_handler.fuzz_command(binary)} -max_total_time=$ROUND '
+            f'{folder} {FOLDER_FUZZ_CORPUS} >> {folder}.log 2>&1',
+            f'tmp/fuzz/{binary} -merge=1 {FOLDER_FUZZ_CORPUS} {folder} >> {folder}.merge.log 2>&1',
+            'done',
+        ]
+
+    def run(self, binary : str, time_limit : int) -> dict:
+        """
+        Starts every node with its own script, waits for all of them to finish and
+        aggregates their results. The fuzzing binary has to be compiled beforehand.
+
+        Parameters:
+            binary (str): name of the fuzzing binary inside the mount folder
+            time_limit (int): number of seconds the nodes are allowed to fuzz
+
+        Returns:
+            report (dict): the aggregated results, see aggregate()
+        """
+        placements = self.placements()
+
+        containers = []
+        for placement in placements:
+            # every node gets its own script, as all scripts are written at the same time
+            script_name = f'fuzz_node_{placement["node"]}.sh'
+            self.fuzz_handler.open_new_script(script_name)
+            for command in self.node_commands(placement['node'], binary, time_limit):
+                self.fuzz_handler.add_command(command)
+            self.fuzz_handler.convert_script()
+
+            containers.append(self.fuzz_handler.app_man.start_container(
+                'fuzz', f'sh /home/consept/tmp/fuzz/{script_name}',
+                name_container=placement['name'],
+                cpuset_cpus=placement['cpuset'],
+                endpoint=placement['endpoint']))
+
+        self.fuzz_handler.logger.info(f'Started {len(containers)} fuzzing nodes for '
+                                      f'{time_limit} seconds')
+        for container in containers:
+            container.wait()
+            container.remove()
+
+        report = self.aggregate(placements)
+        print(self.summary(report))
+        return report
+
+    def node_stats(self, node : int) -> dict:
+        """
+        Returns the last status line of the fuzzing log of a node, with the executions of all
+        its rounds added up, or None if the node did not report any status.
+        """
+        path_log = os.path.join(self.path_cluster_folder, f'node-{node}.log')
+        if not os.path.exists(path_log):
+            return None
+
+        with open(path_log, 'r', encoding='utf-8', errors='replace') as file:
+            series = [stats for stats in map(parse_status_line, file) if stats is not None]
+        if not series:
+            return None
+
+        # the executions start at zero again in every round
+        execs = sum(previous['execs'] for previous, current in zip(series, series[1:])
+                    if current['execs'] < previous['execs'])
+        return dict(series[-1], execs=execs + series[-1]['execs'])
+
+    def aggregate(self, placements : list) -> dict:
+        """
+        Aggregates the results of all nodes and writes them to summary.json in the cluster
+        folder.
+
+        Returns:
+            report (dict): per node its placement and last status, in total the executions,
+            the size of the shared corpus and the number of crashes
+        """
+        nodes = []
+        for placement in placements:
+            nodes.append(dict(placement, stats=self.node_stats(placement['node'])))
+
+        path_corpus = os.path.join(self.fuzz_handler.path_mount_folder,
+                                   os.path.basename(FOLDER_FUZZ_CORPUS))
+        report = {
+            'nodes': nodes,
+            'execs': sum(node['stats']['execs'] for node in nodes if node['stats']),
+            'cov': max((node['stats']['cov'] for node in nodes if node['stats']), default=0),
+            'corpus': len(os.listdir(path_corpus)) if os.path.exists(path_corpus) else 0,
+            'crashes': len([name for name in self.fuzz_handler.mount_files
+                            if name.startswith('crash-') and not name.endswith('.log')]),
+        }
+
+        os.makedirs(self.path_cluster_folder, exist_ok=True)
+        with open(os.path.join(self.path_cluster_folder, 'summary.json'), 'w',
+                  encoding='utf-8') as file:
+            json.dump(report, file, indent=4)
+        return report
+
+    @staticmethod
+    def summary(report : dict) -> str:
+        """
+        Returns a human readable summary of the aggregated results.
+        """
+        lines = ['\n ========= CLUSTER RESULTS =========',
+                 f'{len(report["nodes"])} node(s), {report["execs"]} executions, '
+                 f'cov {report["cov"]}, shared corpus {report["corpus"]}, '
+                 f'crashes {report["crashes"]}']
+        for node in report['nodes']:
+            stats = node['stats']
+            status = 'no status reported' if stats is None else \
+                f'execs {stats["execs"]}, exec/s {stats["exec_s"]}, cov {stats["cov"]}'
+            lines.append(f'node {node["node"]} [{node["endpoint"] or "local"}, '
+                         f'CPUs {node["cpuset"]}]: {status}')
+        return '\n'.join(lines)
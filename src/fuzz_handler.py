@@ -3,11 +3,17 @@ This module provides a utility to run libfuzzer on a given file to be tested. Th
 functions which ask for the fuzzing target and automatically annotate the file to enable fuzzing.  
 """
 
+import os
 import string
 
 from tuut_file import TuutFile
 from application_manager import ApplicationManager
 from tool_handler import ToolHandler
+from consept_vars import FOLDER_FUZZ_CORPUS, FOLDER_FUZZ_RECHECK, ARTIFACT_PREFIX_FUZZ
+from crash_triage import CrashTriage, binary_for_crash, FOLDER_NAME_TRIAGE
+from fuzz_stats import FuzzStatsMonitor
+from fuzz_profiles import FUZZ_PROFILES
+from sanitizer_builds import SANITIZER_CONFIGS, replay_commands
 
 def generate_next_letter(counter):
     """
@@ -61,6 +67,12 @@ class FuzzHandler(ToolHandler):
         # initialize the counter responisble for generating unique variable names
         self.counter = 0
 
+        # container path of the libFuzzer dictionary passed to every fuzzing run, if any
+        self.dictionary = None
+
+        # name of the profile with the engine and sanitizer options of every fuzzing run
+        self.profile = 'default'
+
     def increase_counter(self):
         """
         This function increases the counter
@@ -95,88 +107,279 @@ class FuzzHandler(ToolHandler):
             None
         """
 
-        content = []
         row = int(choice)
 
-        #open file to be annotated and read its contents
-        with open(tuut.path_file, 'r', encoding='utf-8') as file:
-            content = file.readlines()
-
-        #write annotations to a new file
-        with open(tuut.path_fuzz_annotated, 'w', encoding='utf-8') as output_file:
-            output_file.writelines(content)
-            output_file.write(
-            '\nextern "C" int LLVMFuzzerTestOneInput(const uint8_t *Data, size_t Size) {\n\n')
-
-            #create list store the names of variables(the vars we feed as params)
-            var_names = []
-            #count the total size of the params
-            size_counter = 0
-
-            #declare variables to be fed as params
-            for param in tuut.func_details.get(row)[2]:
-                if str(param[0]) == 'constantarray':
-                    name = str(self.next_letter())
-                    var_names.append(name)
-                    size_counter += int(param[2])
-                    output_file.write("    " + str(param[1]) + " " +
-                                        name + "[" + str(param[2]) + "];\n")
-                else:
-                    name = str(self.next_letter())
-                    var_names.append(name)
-                    size_counter += 1
-                    output_file.write("    " + str(param[0]) + " " + name + "[1];\n")
-
-            #check size of input of the fuzzer
-            output_file.write("\n    if(Size == " + str(size_counter) + "){\n\n")
-
-            #keep count of how memory to allocate to each param
-            memory = 0
-
-            #perform memcpy from data given by fuzzer to declared vars
-            for index, param in enumerate(tuut.func_details.get(row)[2]):
-                #check to see if the parameter is an array or not
-                if str(param[0]) == 'constantarray':
-                    output_file.write(
-                        f'        memcpy({var_names[index]}, Data + {memory}, {param[2]});\n')
-                    memory += param[2]
-                else:
-                    output_file.write(
-                        f'        memcpy({var_names[index]}, Data + {memory}, 1);\n')
-                    memory += 1
-
-            #call the function to be fuzzed
-            output_file.write(f'        {tuut.func_details.get(row)[0]}(')
-
-            #pass the params to the function to be fuzzed
-            for index, param in enumerate(tuut.func_details.get(row)[2]):
-                if index != len(var_names) - 1:
-                    if str(param[0]) == 'constantarray':
-                        output_file.write(f'{var_names[index]}, ')
-                    else:
-                        output_file.write(f'{var_names[index]}[0], ')
-                else:
-                    if str(param[0]) == 'constantarray':
-                        output_file.write(f'{var_names[index]});')
-                    else:
-                        output_file.write(f'{var_names[index]}[0]);')
-
-            #return 0 and close the square brackets of the main function
-            output_file.write("\n\n    }")
-            output_file.write("\n    return 0;\n}")
-
-    def run(self):
+        #declare, fill and pass the params of the function to be fuzzed
+        self.write_fuzz_target(tuut, self.gen_target_call(tuut.func_details.get(row)))
+
+    def write_fuzz_target(self, tuut : TuutFile, body : str):
+        """
+        Writes the file to be tested, followed by a fuzz target with the given body, to the
+        annotated file.
+
+        Parameters:
+            tuut (TuutFile): To be tested file abstraction
+            body (str): code of the fuzz target before its return statement
+
+        Returns:
+            None
+        """
+
+        #return 0 and close the square brackets of the fuzz target
+        target = '\nextern "C" int LLVMFuzzerTestOneInput(const uint8_t *Data, size_t Size) {\n\n'
+        target += body + "\n    return 0;\n}"
+
+        #append the fuzz target to the file, after tuut.start_rewrite() together with the
+        #other edits of the annotated file
+        tuut.rewrite(lambda rewriter: rewriter.append(target), tuut.path_file)
+
+    def gen_target_call(self, details : list, offset : int = 0, indent : str = '    ') -> str:
+        """
+        Generates the part of the fuzz target which declares the params of a function, copies
+        the data given by the fuzzer into them and calls the function.
+
+        Parameters:
+            details (list): function details [name, number of params, params] as generated by
+            TuutFile.gen_func_info()
+            offset (int): number of bytes at the start of the data that are not fed as params
+            indent (str): indentation of the generated code
+
+        Returns:
+            code (str): the generated code
+        """
+        code = ''
+
+        #create list store the names of variables(the vars we feed as params)
+        var_names = []
+        #count the total size of the params
+        size_counter = 0
+
+        #declare variables to be fed as params
+        for param in details[2]:
+            name = str(self.next_letter())
+            var_names.append(name)
+            if str(param[0]) == 'constantarray':
+                size_counter += int(param[2])
+                code += f'{indent}{param[1]} {name}[{param[2]}];\n'
+            else:
+                size_counter += 1
+                code += f'{indent}{param[0]} {name}[1];\n'
+
+        #check size of input of the fuzzer
+        code += f'\n{indent}if(Size == {offset + size_counter}){{\n\n'
+
+        #keep count of how memory to allocate to each param
+        memory = offset
+
+        #perform memcpy from data given by fuzzer to declared vars
+        for index, param in enumerate(details[2]):
+            #check to see if the parameter is an array or not
+            if str(param[0]) == 'constantarray':
+                code += f'{indent}    memcpy({var_names[index]}, Data + {memory}, {param[2]});\n'
+                memory += param[2]
+            else:
+                code += f'{indent}    memcpy({var_names[index]}, Data + {memory}, 1);\n'
+                memory += 1
+
+        #call the function to be fuzzed, arrays are passed as is, other params by value
+        arguments = [name if str(param[0]) == 'constantarray' else f'{name}[0]'
+                     for name, param in zip(var_names, details[2])]
+        code += f'{indent}    {details[0]}({", ".join(arguments)});'
+
+        #close the size check
+        code += f'\n\n{indent}}}'
+        return code
+
+    def add_compile_command(self, tuut : TuutFile, sanitizers : str,
+                            binary : str = 'fuzz_output', flags : str = None,
+                            background : bool = False):
+        """
+        Adds the command that compiles the annotated file into a fuzzing binary.
+
+        Parameters:
+            tuut (TuutFile): To be tested file abstraction
+            sanitizers (str): value passed to -fsanitize, e.g. 'address,fuzzer'
+            binary (str): name of the binary inside the fuzzing mount folder
+            flags (str): optional additional compiler flags, e.g. '-O2'
+            background (bool): whether the compiler runs in the background
+
+        Returns:
+            None
+        """
+        flags = '-g' if flags is None else f'-g {flags}'
+        self.add_command(
+            f'clang++ {flags} -fsanitize={sanitizers} -o tmp/fuzz/{binary} \
+                {tuut.path_container_fuzz}' + (' &' if background else ''))
+
+    def add_two_tier_commands(self, tuut : TuutFile, time_limit : int):
+        """
+        Adds the commands for two-tier fuzzing. A fast build without sanitizers explores the
+        code for coverage, while a second worker replays every new corpus entry against the
+        ASan and MSan builds. Inputs that fail under a sanitizer are stored as
+        crash-<sanitizer>-<input> in the mount folder together with their report.
+
+        Parameters:
+            tuut (TuutFile): To be tested file abstraction
+            time_limit (int): number of seconds the fast fuzzer is allowed to run
+
+        Returns:
+            None
+        """
+
+        # the fast coverage engine and the builds that confirm memory bugs
+        self.add_compile_command(tuut, 'fuzzer', 'fuzz_fast', '-O2')
+        self.add_compile_command(tuut, SANITIZER_CONFIGS['asan']['sanitizers'], 'fuzz_asan')
+        self.add_compile_command(tuut, SANITIZER_CONFIGS['msan']['sanitizers'], 'fuzz_msan')
+        self.add_command(f'mkdir -p {FOLDER_FUZZ_CORPUS} {FOLDER_FUZZ_RECHECK}')
+
+        # crashes of the fast build should not stop the exploration, hence the fork mode
+        self.add_command(
+            f'{self.fuzz_command("fuzz_fast")} -fork=1 -ignore_crashes=1 \
+                -max_total_time={time_limit} {FOLDER_FUZZ_CORPUS} 2>&1 \
+                | tee tmp/fuzz/fuzz_fast.log &')
+        self.add_command('FAST_PID=$!')
+
+        # second worker: replay unseen corpus entries until the fast fuzzer has finished,
+        # the last iteration after the fuzzer exited picks up the final corpus entries
+        self.add_command('RUNNING=1')
+        self.add_command('while [ $RUNNING -eq 1 ]; do')
+        self.add_command('    kill -0 $FAST_PID 2>/dev/null || RUNNING=0')
+        self.add_command(f'    for input in {FOLDER_FUZZ_CORPUS}/*; do')
+        self.add_command('        [ -f "$input" ] || continue')
+        self.add_command('        name=$(basename "$input")')
+        self.add_command(f'        [ -f {FOLDER_FUZZ_RECHECK}/seen-$name ] && continue')
+        self.add_command(f'        touch {FOLDER_FUZZ_RECHECK}/seen-$name')
+        self.add_command('        for build in asan msan; do')
+        self.add_command(f'            report={FOLDER_FUZZ_RECHECK}/$build-$name.log')
+        self.add_command('            if tmp/fuzz/fuzz_$build "$input" > $report 2>&1; then')
+        self.add_command('                rm -f $report')
+        self.add_command('            else')
+        self.add_command('                cp "$input" tmp/fuzz/crash-$build-$name')
+        self.add_command('                echo Sanitizer $build confirmed crash on $name')
+        self.add_command('            fi')
+        self.add_command('        done')
+        self.add_command('    done')
+        self.add_command('    [ $RUNNING -eq 1 ] && sleep 5')
+        self.add_command('done')
+
+    def add_replay_commands(self, binary : str):
+        """
+        Adds the commands that replay every crash in the mount folder and store the
+        sanitizer report of crash-<name> as crash-<name>.log, which is the input of the triage.
+
+        Parameters:
+            binary (str): fuzzing binary used for crashes that were not confirmed by a
+            specific sanitizer build
+
+        Returns:
+            None
+        """
+        for command in replay_commands(binary):
+            self.add_command(command)
+
+    def triage_crashes(self, binary : str, num_frames : int = 3) -> list:
+        """
+        Buckets the replayed crashes by bug type and top frames, minimises the representative
+        of every bucket with -minimize_crash inside the container and writes the bucket index
+        to the triage folder of the mount folder.
+
+        Parameters:
+            binary (str): fuzzing binary used for crashes that were not confirmed by a
+            specific sanitizer build
+            num_frames (int): number of top frames that determine the bucket of a crash
+
+        Returns:
+            buckets (list): the buckets as written to the index
+        """
+        triage = CrashTriage(self.path_mount_folder, num_frames)
+        buckets = triage.bucket_crashes()
+        if not buckets:
+            self.logger.info('No crashes to triage')
+            return buckets
+
+        # minimise one representative per bucket instead of every single crash
+        self.open_new_script()
+        self.add_command(f'mkdir -p tmp/fuzz/{FOLDER_NAME_TRIAGE}')
+        for bucket in buckets:
+            crash = bucket['representative']
+            self.add_command(
+                f'tmp/fuzz/{binary_for_crash(crash, binary)} -minimize_crash=1 -runs=10000 \
+                    -exact_artifact_path=tmp/fuzz/{bucket["minimized"]} tmp/fuzz/{crash}')
+        self.run_script()
+
+        path_index = triage.write_index(buckets)
+        print(CrashTriage.summary(buckets))
+        self.logger.info(f'Wrote crash bucket index to {path_index}')
+        return buckets
+
+    def add_fuzz_command(self, binary : str = 'fuzz_output', options : str = '-runs=1000'):
+        """
+        Adds the command that runs a fuzzing binary. Crash files are written straight to the
+        mount folder, such that they are available the moment they are found.
+
+        Parameters:
+            binary (str): name of the fuzzing binary inside the mount folder
+            options (str): libFuzzer options of the run
+
+        Returns:
+            None
+        """
+        self.add_command(f'{self.fuzz_command(binary)} {options}')
+
+    def fuzz_command(self, binary : str) -> str:
+        """
+        Returns the command that starts a fuzzing binary with the options shared by every
+        fuzzing run of this handler, preceded by the runtime options of the profile.
+        """
+        command = f'tmp/fuzz/{binary} {self.base_options}'
+        if FUZZ_PROFILES[self.profile]['options']:
+            command += f' {FUZZ_PROFILES[self.profile]["options"]}'
+        if FUZZ_PROFILES[self.profile]['environment']:
+            command = f'{FUZZ_PROFILES[self.profile]["environment"]} {command}'
+        return command
+
+    @property
+    def base_options(self) -> str:
+        """
+        Returns the libFuzzer options that do not depend on the profile.
+        """
+        options = f'-artifact_prefix={ARTIFACT_PREFIX_FUZZ}'
+        if self.dictionary is not None:
+            options += f' -dict={self.dictionary}'
+        return options
+
+    def run(self, output_callback=None, replay_binary : str = None):
         """
         This function runs a container of the image corresponding to this tool.
         In this container it runs the current script
-        Before calling the run() function of the super class, it adds the command to move all 
-        crash file to the mount folder such that these can be accessed from outside the container.
+        While the container runs, the libFuzzer status lines are parsed into a time series
+        which is written to fuzz_stats.jsonl in the mount folder.
+        If a replay binary is given, every crash is replayed afterwards to obtain its report.
 
         Arguments:
-            None
+            output_callback (callable): receives the output chunks in addition to the
+            statistics monitor
+            replay_binary (str): fuzzing binary used to replay the crashes, or None
         Returns:
             None
         """
 
-        self.add_command('cp ./crash* /home/consept/tmp/fuzz')
-        super().run()
+        if replay_binary is not None:
+            self.add_replay_commands(replay_binary)
+
+        monitor = FuzzStatsMonitor(os.path.join(self.path_mount_folder, 'fuzz_stats.jsonl'))
+
+        def feed(chunk):
+            monitor.feed(chunk)
+            if output_callback is not None:
+                output_callback(chunk)
+
+        super().run(output_callback=feed)
+        monitor.close()
+
+    def run_script(self, output_callback=None):
+        """
+        Runs the current script in the container without collecting fuzzing statistics,
+        which is used for runs that are not part of the fuzzing campaign itself.
+        """
+        super().run(output_callback=output_callback)
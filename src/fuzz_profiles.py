@@ -0,0 +1,175 @@
+"""
+This module provides named libFuzzer option profiles and the automatic selection of the best
+profile for a fuzzing target. For the selection, every profile is tried for a short time in
+parallel, the trials are scored on coverage growth per second and the winning profile is
+stored per target, such that later runs of the same target use it right away.
+
+Classes:
+    - ProfileSelector(object)
+
+Functions:
+    - score_trial(log, trial_time)
+"""
+
+import json
+import os
+
+from consept_vars import PATH_CONSEPT
+from fuzz_stats import parse_status_line
+
+# engine options and sanitizer runtime options per profile, every profile differs from the
+# defaults of libFuzzer, which already enable entropic scheduling and cmp tracing
+FUZZ_PROFILES = {
+    'default': {'options': '', 'environment': ''},
+    'value_profile': {'options': '-use_value_profile=1', 'environment': ''},
+    'entropic_rare': {'options': '-entropic_number_of_rarest_features=500 '
+                                 '-entropic_feature_frequency_threshold=32 '
+                                 '-entropic_scale_per_exec_time=1', 'environment': ''},
+    'no_entropic': {'options': '-entropic=0', 'environment': ''},
+    'no_cmp': {'options': '-use_cmp=0', 'environment': ''},
+    'no_len_control': {'options': '-len_control=0', 'environment': ''},
+    'deep_mutations': {'options': '-mutate_depth=20', 'environment': ''},
+    'throughput': {'options': '',
+                   'environment': 'ASAN_OPTIONS=detect_leaks=0:malloc_context_size=0'},
+}
+
+# local path of the file in which the winning profile of every target is stored
+PATH_PROFILE_STORE = os.path.join(PATH_CONSEPT, 'tmp', 'fuzz', 'profiles.json')
+
+# folder (inside the fuzzing mount folder) in which the trials are run
+FOLDER_NAME_TRIALS = 'trials'
+
+
+def score_trial(log : str, trial_time : int) -> float:
+    """
+    Scores a trial on the coverage it gained per second.
+
+    Parameters:
+        log (str): output of the trial
+        trial_time (int): number of seconds the trial was allowed to run
+
+    Returns:
+        score (float): coverage growth per second, 0 if the log contains no status lines
+    """
+    series = [stats for stats in map(parse_status_line, log.splitlines()) if stats is not None]
+    if not series:
+        return 0.0
+    return (series[-1]['cov'] - series[0]['cov']) / trial_time
+
+
+class ProfileSelector:
+    """
+    Class that selects the fuzzing profile of a target through short parallel trials.
+    """
+
+    def __init__(self, path_mount_folder : str, target_key : str, trial_time : int = 30):
+        """
+        Constructor of the ProfileSelector class.
+
+        Parameters:
+            path_mount_folder (str): local path of the fuzzing mount folder
+            target_key (str): identifies the fuzzing target, e.g. file name and functions
+            trial_time (int): number of seconds every profile is tried
+        """
+        self.path_mount_folder = path_mount_folder
+        self.target_key = target_key
+        self.trial_time = trial_time
+
+    @staticmethod
+    def _load_store() -> dict:
+        """
+        Returns the stored profiles of all targets.
+        """
+        if not os.path.exists(PATH_PROFILE_STORE):
+            return {}
+        with open(PATH_PROFILE_STORE, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def stored_profile(self) -> str:
+        """
+        Returns the profile that won the trials of this target earlier, or None.
+        """
+        entry = self._load_store().get(self.target_key)
+        if entry is None or entry['profile'] not in FUZZ_PROFILES:
+            return None
+        return entry['profile']
+
+    def trial_commands(self, binary : str, base_options : str) -> list:
+        """
+        Returns the commands that run a trial per profile in parallel, each with its own
+        corpus, and wait for all of them to finish.
+
+        Parameters:
+            binary (str): name of the fuzzing binary inside the mount folder
+            base_options (str): libFuzzer options that every trial shares
+
+        Returns:
+            commands (list): the commands to add to the script of the fuzzing container
+        """
+        commands = [f'rm -rf tmp/fuzz/{FOLDER_NAME_TRIALS}']
+        for name, profile in FUZZ_PROFILES.items():
+            folder = f'tmp/fuzz/{FOLDER_NAME_TRIALS}/{name}'
+            commands.append(f'mkdir -p {folder}')
+            command = f'tmp/fuzz/{binary} -max_total_time={self.trial_time} {base_options}'
+            if profile['options']:
+                command += f' {profile["options"]}'
+            if profile['environment']:
+                command = f'{profile["environment"]} {command}'
+            commands.append(f'{command} {folder} > {folder}.log 2>&1 &')
+        commands.append('wait')
+        return commands
+
+    def select(self) -> str:
+        """
+        Scores the trials, stores the winning profile for this target and returns it.
+        Profiles are ordered as listed, so on a tie the earlier profile wins.
+        """
+        scores = {}
+        for name in FUZZ_PROFILES:
+            path_log = os.path.join(self.path_mount_folder, FOLDER_NAME_TRIALS, name + '.log')
+            if os.path.exists(path_log):
+                with open(path_log, 'r', encoding='utf-8', errors='replace') as file:
+                    scores[name] = score_trial(file.read(), self.trial_time)
+            else:
+                scores[name] = 0.0
+
+        winner = max(scores, key=scores.get)
+
+        store = self._load_store()
+        store[self.target_key] = {'profile': winner, 'scores': scores}
+        os.makedirs(os.path.dirname(PATH_PROFILE_STORE), exist_ok=True)
+        with open(PATH_PROFILE_STORE, 'w', encoding='utf-8') as file:
+            json.dump(store, file, indent=4)
+
+        return winner
+
+    def select_for(self, fuzz_handler, build : tuple) -> str:
+        """
+        Selects the profile of a fuzz handler. A profile that won the trials of this target
+        before is reused, otherwise the trials are run in the fuzzing container first.
+
+        Parameters:
+            fuzz_handler (FuzzHandler): handler whose profile is selected
+            build (tuple): TuutFile, sanitizers, binary and compiler flags of the binary that
+            is fuzzed, as passed to FuzzHandler.add_compile_command()
+
+        Returns:
+            profile (str): the selected profile
+        """
+        profile = self.stored_profile()
+        if profile is not None:
+            fuzz_handler.logger.info(f'Using stored fuzzing profile {profile} for '
+                                     f'{self.target_key}')
+        else:
+            fuzz_handler.open_new_script()
+            fuzz_handler.add_compile_command(*build)
+            for command in self.trial_commands(build[2], fuzz_handler.base_options):
+                fuzz_handler.add_command(command)
+            fuzz_handler.run_script()
+
+            profile = self.select()
+            fuzz_handler.logger.info(f'Fuzzing profile {profile} won the trials for '
+                                     f'{self.target_key}')
+
+        fuzz_handler.profile = profile
+        return profile
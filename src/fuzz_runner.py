@@ -0,0 +1,179 @@
+"""
+This module provides the fuzzing flow of consept: it annotates the file given on the command
+line with a fuzz target and runs libFuzzer on it with the fuzzing options that were passed.
+
+Functions:
+    - run_fuzzing(args, parser)
+    - check_fuzzing_args(args, parser)
+    - sanitizer_config_name(args)
+    - load_tuut(path_file)
+"""
+
+from pathlib import Path
+
+from application_manager import ApplicationManager
+from fuzz_handler import FuzzHandler, ask_for_annotation_choice_fuzz
+from multi_fuzz_handler import MultiTargetFuzzHandler
+from fuzz_profiles import ProfileSelector
+from fuzz_cluster import FuzzCluster
+from sanitizer_builds import SANITIZER_CONFIGS, SanitizerCampaign
+
+from tuut_file import TuutFile
+from target_catalog import TargetCatalog
+from utils.misc import find_file_path
+
+def check_fuzzing_args(args, parser):
+    """
+    Checks that the fuzzing options passed on the command line can be combined.
+    """
+    if (args.use_libFuzzer_two_tier or args.all_functions or args.fuzz_cluster or
+            args.sanitizer_configs) and args.time_limit <= 0:
+        parser.error("The time limit must be a positive integer.")
+    if args.fuzz_cluster and (args.use_libFuzzer_two_tier or args.all_functions):
+        parser.error("A fuzzing cluster can not be combined with -ft or -af.")
+    if args.sanitizer_configs and (args.use_libFuzzer_two_tier or args.all_functions or
+                                   args.fuzz_cluster):
+        parser.error("Sanitizer configurations can not be combined with -ft, -af or -fc.")
+
+def sanitizer_config_name(args) -> str:
+    """
+    Returns the name of the sanitizer configuration selected on the command line. Of a
+    campaign with several configurations it is the first, with which crashes are replayed.
+    """
+    if args.sanitizer_configs:
+        return args.sanitizer_configs[0]
+    if args.use_libFuzzer_with_address_sanitizer:
+        return 'asan'
+    if args.use_libFuzzer_with_address_undefined_sanitizer:
+        return 'asan_ubsan'
+    return 'msan'
+
+def load_tuut(path_file) -> TuutFile:
+    """
+    Returns the TuutFile of the file to be tested with its function information, the
+    functions of unchanged files are taken from the catalog of earlier runs.
+    """
+    tuut = TuutFile(path_file)
+    catalog = TargetCatalog()
+    try:
+        tuut.gen_func_info(catalog=catalog)
+    finally:
+        catalog.close()
+    return tuut
+
+def run_fuzzing(args, parser):
+    """
+    Fuzz the cpp file given as positional argument with libFuzzer, using the fuzzing
+    options that were passed on the command line.
+    """
+    assert args.file.endswith('.cpp'), 'For fuzzing, one specific cpp file needs to be entered'
+
+    path_file = Path(args.file)
+
+    if len(path_file.parts) == 1: # only the basename was provided
+        path_file = find_file_path(args.file)
+    else: # path to the file is just the path that was provided
+        path_file = str(path_file)
+
+    check_fuzzing_args(args, parser)
+
+    # init ApplicationManager, FuzzHandler and TuutFile, with the function information about
+    # the file to be tested
+    tool_am = ApplicationManager(['fuzz'])
+    if args.all_functions:
+        fuzh = MultiTargetFuzzHandler(app_man=tool_am)
+    else:
+        fuzh = FuzzHandler(app_man=tool_am)
+    tuut = load_tuut(path_file)
+
+    # collect the fuzz target, the commented out main function and the includes, such that
+    # the annotated file is written once
+    tuut.start_rewrite()
+
+    if args.all_functions:
+        # annotate a single fuzz target that dispatches to every function of this file
+        rows = fuzh.annotate_fuzz_multi(tuut)
+    else:
+        # ask which function in the file to be tested will be the fuzzing target
+        choice = ask_for_annotation_choice_fuzz(tuut.func_dict, tuut.func_details)
+
+        # annotate specifically the funciton of this file
+        fuzh.annotate_fuzz(tuut, choice)
+        rows = [int(choice)]
+
+    # pass the literals of the fuzzed functions to libFuzzer as dictionary
+    tuut.gen_fuzz_dict(rows)
+    fuzh.dictionary = tuut.path_container_dict
+
+    # sanitizer configuration of the binary that is fuzzed, two-tier fuzzing and campaigns
+    # with several sanitizer configurations have their own builds, the profile trials of a
+    # campaign use its first configuration
+    config = SANITIZER_CONFIGS[sanitizer_config_name(args)]
+
+    # comment out the main function
+    tuut.comment_out_main()
+
+    #include fuzzing libraries in the to be tested file
+    tuut.include_fuzz()
+    tuut.write_annotated()
+
+    # select the engine options, automatically through short trials if requested,
+    # the trials compile the annotated file and thus need it to be complete. The trials use
+    # the build that is fuzzed, which is part of the key the profile is stored under
+    if args.fuzz_profile == 'auto':
+        build = (tuut, 'fuzzer', 'fuzz_fast', '-O2') if args.use_libFuzzer_two_tier \
+            else (tuut, config['sanitizers'], 'fuzz_output', config['flags'])
+        target_key = tuut.file_name + ':' + ','.join(tuut.func_details[row][0] for row in rows) \
+            + ':' + ('two_tier' if args.use_libFuzzer_two_tier else sanitizer_config_name(args))
+        ProfileSelector(fuzh.path_mount_folder, target_key).select_for(fuzh, build)
+    else:
+        fuzh.profile = args.fuzz_profile
+
+    # start a new script that will be executed inside the fuzzing container
+    fuzh.open_new_script()
+
+    if args.use_libFuzzer_two_tier:
+        fuzh.add_two_tier_commands(tuut, args.time_limit)
+    elif args.sanitizer_configs:
+        campaign = SanitizerCampaign(fuzh, args.sanitizer_configs)
+        campaign.add_build_commands(tuut)
+        campaign.add_fuzz_commands(args.time_limit)
+    else:
+        fuzh.add_compile_command(tuut, config['sanitizers'], flags=config['flags'])
+
+        if args.all_functions:
+            fuzh.add_multi_fuzz_commands(args.workers, args.time_limit)
+        elif not args.fuzz_cluster:
+            fuzh.add_fuzz_command()
+
+    # two-tier crashes of the fast build are replayed with the address sanitizer build,
+    # crashes of sanitizer configurations are replayed with the build that found them
+    replay_binary = 'fuzz_asan' if args.use_libFuzzer_two_tier else 'fuzz_output'
+    if args.sanitizer_configs:
+        replay_binary = f'fuzz_{args.sanitizer_configs[0]}'
+
+    if args.fuzz_cluster:
+        # compile once, the nodes of the cluster share the binary through the mount folder
+        fuzh.run_script()
+        FuzzCluster(fuzh, args.fuzz_cluster, args.docker_endpoints,
+                    args.sync_interval).run(replay_binary, args.time_limit)
+        if args.triage_crashes:
+            fuzh.open_new_script()
+            fuzh.add_replay_commands(replay_binary)
+            fuzh.run_script()
+    else:
+        # run the container and the script inside of it
+        fuzh.run(replay_binary=replay_binary if args.triage_crashes else None)
+
+    # report the crashes of every sanitizer configuration
+    if args.sanitizer_configs:
+        print(campaign.summary())
+
+    # attribute the corpus, crashes and coverage to the fuzzed functions
+    if args.all_functions:
+        fuzh.attribute_coverage(
+            tuut, 'fuzz_fast' if args.use_libFuzzer_two_tier else 'fuzz_output')
+
+    # bucket the crashes and minimise one crash per bucket
+    if args.triage_crashes:
+        fuzh.triage_crashes(replay_binary)
@@ -0,0 +1,186 @@
+"""
+This module provides the parsing of the status lines libFuzzer prints while fuzzing, e.g.
+'#4096 pulse cov: 12 ft: 14 corp: 5/34b lim: 4 exec/s: 2048 rss: 31Mb', or in fork mode
+'#65536: cov: 12 ft: 14 corp: 5 exec/s 2048 oom/timeout/crash: 0/0/1 time: 9s'. The lines
+are turned into a time series that is exported as JSONL and summarised live while the
+container runs.
+
+Classes:
+    - FuzzStatsMonitor(object)
+
+Functions:
+    - parse_status_line(line)
+"""
+
+import json
+import logging
+import re
+import sys
+import time
+
+STATUS_PATTERN = (r'^#(\d+)\s+(\w+)\s+cov: (\d+) ft: (\d+) corp: (\d+)/(\d+)(b|Kb|Mb)'
+                  r'.*?exec/s: (\d+) rss: (\d+)Mb')
+
+# status line of the parent process in fork mode (-fork=N), which merges the jobs of its
+# children and reports neither the corpus size in bytes nor the memory use
+FORK_STATUS_PATTERN = r'^#(\d+): cov: (\d+) ft: (\d+) corp: (\d+) exec/s:? (\d+)'
+
+# factors to convert the corpus size to bytes
+SIZE_UNITS = {'b': 1, 'Kb': 1024, 'Mb': 1024 * 1024}
+
+
+def parse_status_line(line : str) -> dict:
+    """
+    Parses one status line of libFuzzer.
+
+    Parameters:
+        line (str): line of the libFuzzer output
+
+    Returns:
+        stats (dict): execs, event, cov, ft, corp, corp_bytes, exec_s and rss_mb of the line,
+        or None if the line is not a status line. In fork mode the event is 'FORK' and
+        corp_bytes and rss_mb are None
+    """
+    match = re.match(FORK_STATUS_PATTERN, line.strip())
+    if match is not None:
+        return {
+            'execs': int(match.group(1)),
+            'event': 'FORK',
+            'cov': int(match.group(2)),
+            'ft': int(match.group(3)),
+            'corp': int(match.group(4)),
+            'corp_bytes': None,
+            'exec_s': int(match.group(5)),
+            'rss_mb': None,
+        }
+
+    match = re.match(STATUS_PATTERN, line.strip())
+    if match is None:
+        return None
+
+    return {
+        'execs': int(match.group(1)),
+        'event': match.group(2),
+        'cov': int(match.group(3)),
+        'ft': int(match.group(4)),
+        'corp': int(match.group(5)),
+        'corp_bytes': int(match.group(6)) * SIZE_UNITS[match.group(7)],
+        'exec_s': int(match.group(8)),
+        'rss_mb': int(match.group(9)),
+    }
+
+
+class FuzzStatsMonitor:
+    """
+    Class that consumes the raw output of a fuzzing container chunk by chunk, writes every
+    status line to a JSONL file and raises an alert when the executions per second collapse.
+    """
+
+    def __init__(self, path_jsonl : str, collapse_ratio : float = 0.1, live : bool = True):
+        """
+        Constructor of the FuzzStatsMonitor class.
+
+        Parameters:
+            path_jsonl (str): path of the JSONL file the time series is written to
+            collapse_ratio (float): an alert is raised when exec/s drops below this fraction
+            of the highest exec/s seen so far
+            live (bool): whether a compact summary is printed for every status line
+        """
+        self.path_jsonl = path_jsonl
+        self.collapse_ratio = collapse_ratio
+        self.live = live
+        self.logger = logging.getLogger('consept')
+
+        # the time series and the state needed to detect a collapse of exec/s
+        self.series = []
+        self.alerts = []
+        self.peak_exec_s = 0
+        self.collapsed = False
+
+        # output chunks do not end at line boundaries
+        self._buffer = ''
+        self._start = time.time()
+
+        # start with an empty time series
+        with open(self.path_jsonl, 'w', encoding='utf-8'):
+            pass
+
+    def feed(self, chunk : bytes) -> None:
+        """
+        Processes a chunk of container output. Complete lines are parsed, the remainder is
+        kept until the next chunk arrives.
+        """
+        self._buffer += chunk.decode('utf-8', errors='replace')
+        lines = re.split(r'[\r\n]', self._buffer)
+        self._buffer = lines.pop()
+        for line in lines:
+            self.process_line(line)
+
+    def process_line(self, line : str) -> dict:
+        """
+        Adds a line to the time series if it is a status line.
+
+        Returns:
+            stats (dict): the parsed status line with its time stamp, or None
+        """
+        stats = parse_status_line(line)
+        if stats is None:
+            return None
+
+        stats['time'] = round(time.time() - self._start, 3)
+        self.series.append(stats)
+        with open(self.path_jsonl, 'a', encoding='utf-8') as file:
+            file.write(json.dumps(stats) + '\n')
+
+        self._check_collapse(stats)
+        if self.live:
+            sys.stdout.write('\r' + self.summary_line(stats))
+            sys.stdout.flush()
+        return stats
+
+    def _check_collapse(self, stats : dict) -> None:
+        """
+        Raises an alert once when exec/s drops below the collapse ratio of its peak, and
+        resets the alert when the throughput recovers.
+        """
+        self.peak_exec_s = max(self.peak_exec_s, stats['exec_s'])
+        threshold = self.collapse_ratio * self.peak_exec_s
+
+        # libFuzzer reports exec/s 0 while initialising, which is not a collapse
+        if stats['event'] == 'INITED' or self.peak_exec_s == 0:
+            return
+
+        if stats['exec_s'] < threshold and not self.collapsed:
+            self.collapsed = True
+            alert = (f'exec/s collapsed to {stats["exec_s"]} (peak {self.peak_exec_s}) after '
+                     f'{stats["execs"]} executions' +
+                     (f', rss {stats["rss_mb"]}Mb' if stats['rss_mb'] is not None else ''))
+            self.alerts.append(alert)
+            self.logger.warning(alert)
+        elif stats['exec_s'] >= threshold:
+            self.collapsed = False
+
+    @staticmethod
+    def summary_line(stats : dict) -> str:
+        """
+        Returns a compact, single line summary of a status line.
+        """
+        return (f'[fuzz {stats["time"]:>8.1f}s] execs: {stats["execs"]} '
+                f'exec/s: {stats["exec_s"]} cov: {stats["cov"]} ft: {stats["ft"]} '
+                f'corp: {stats["corp"]}' +
+                (f' rss: {stats["rss_mb"]}Mb' if stats['rss_mb'] is not None else ''))
+
+    def close(self) -> None:
+        """
+        Processes the remaining output and logs the last state of the time series.
+        """
+        if self._buffer:
+            self.process_line(self._buffer)
+            self._buffer = ''
+
+        if self.live and self.series:
+            sys.stdout.write('\n')
+
+        if self.series:
+            self.logger.info(f'Fuzzing statistics written to {self.path_jsonl}, last state: ' +
+                             self.summary_line(self.series[-1]))
@@ -0,0 +1,271 @@
+"""
+This module provides the annotation of files to be tested for KLEE: it finds the variables of
+main, lets the user choose which of them to make symbolic, either all, specific ones or the
+branch relevant ones found by def-use analysis, annotates them and includes the KLEE library.
+In guarded mode every variable is annotated, and a selector in the environment of KLEE decides
+which of them are symbolic, such that one bitcode file is explored under many selections.
+
+Classes:
+    - KLEEAnnotator(ToolHandler)
+
+Functions:
+    - include_library(file_path, target_output_file_path)
+    - find_main_variables(file_path)
+    - annotate_variables(file_path, output_file_path, catalog, include_klee)
+    - insert_annotations(content, rows, unique_dict)
+    - add_annotations(rewriter, rows, unique_dict)
+    - ask_for_annotation_choice_klee(unique_dict, file_path)
+    - selection_mask(selection, file_path)
+"""
+import os
+import clang.cindex
+
+from consept_vars import PATH_CONSEPT
+from tool_handler import ToolHandler
+from symbolic_selection import BranchVariableSelector
+from utils.misc import include_lib, find_main_function_range
+from utils.source_rewriter import SourceRewriter
+from utils.compile_db import compile_args
+from utils.tu_cache import parse_translation_unit
+
+# include line of the KLEE library
+KLEE_INCLUDE = '#include <klee/klee.h>'
+
+# environment variable that selects the guarded variables that are symbolic: a bit mask over
+# the annotated variables in the order of the source, all of them are symbolic if it is not set
+SYMBOLIC_SELECTOR = 'CONSEPT_SYMBOLIC'
+
+# guard of the annotations in guarded mode. getenv and strtoull are external calls of KLEE, the
+# string of the selector is only passed between them and never read inside KLEE
+SYMBOLIC_GUARD = f'''
+static int consept_symbolic(int index) {{
+    const char *selection = getenv("{SYMBOLIC_SELECTOR}");
+    return selection == 0 || index >= 64 || (strtoull(selection, 0, 0) >> index & 1);
+}}
+
+'''
+
+class KLEEAnnotator(ToolHandler):
+    """
+    Class that annotates files to be tested for KLEE, the base of the KLEEHandler.
+    """
+    def __init__(self, app_man=None, tool : str = 'concolic', test : bool = False):
+        super().__init__(app_man=app_man, tool=tool, test=test)
+
+        # variables of main that are annotated with a guard, by row, see annotate_variables()
+        self.symbolic_candidates = {}
+    def include_library(self, file_path, target_output_file_path = None) -> str:
+        """
+        Includes the KLEE library in the specified C++ file in the compile_commands.
+
+        Parameters:
+        annotated_file_path (str): The path to the input, annotated C++ file.
+
+        Returns:
+        output_file_path (str): path of the annotated file.
+        """
+        include_line = KLEE_INCLUDE
+
+        annotated_filename = os.path.basename(file_path)
+        if target_output_file_path is not None:
+            output_file_path = target_output_file_path
+        else:
+            output_file_path = os.path.join(
+                PATH_CONSEPT, 'tmp', 'concolic', annotated_filename)
+
+        self.logger.info(f'Will now include klee in file {file_path}')
+        include_lib(file_path, output_file_path, include_line)
+
+        return output_file_path
+
+    def find_main_variables(self, file_path) -> list:
+        """
+        Finds the variables declared in the main method of the given file.
+        Args:
+            file_path (str): Path to the input file stored anywhere in Consept.
+        Returns:
+            variables (list) : (line, name) of every declared variable, in the order of the source
+        """
+        # Load the translation unit
+        translation_unit = parse_translation_unit(file_path)
+
+        # Collect variable names and line numbers of variable declarations
+        variables = []
+        for node in translation_unit.cursor.walk_preorder():
+            # Verify whether the declared variable is present in main method of source file
+            if (node.kind == clang.cindex.CursorKind.VAR_DECL and
+                node.semantic_parent.kind == clang.cindex.CursorKind.FUNCTION_DECL and
+                    node.semantic_parent.spelling == 'main'):
+                variables.append((node.extent.start.line, node.spelling))
+        return variables
+
+    def annotate_variables(self, file_path, target_output_file_path=None, catalog=None,
+                           include_klee=False, *, guarded=False) -> str:
+        """
+        Annotates variables in the given file with KLEE symbolic execution annotations,
+        and saves the annotated file as a new file.
+        Args:
+            file_path (str): Path to the input file stored anywhere in Consept.
+            output_file_path (str): Path to the annotated, output file.
+            catalog (TargetCatalog): optional catalog of the variables of earlier runs, which
+            is used instead of parsing an unchanged file
+            include_klee (bool): whether to also include the KLEE library, in the same write of
+            the annotated file instead of a separate include_library()
+            guarded (bool): whether to annotate all variables without asking, each guarded by the
+            selector SYMBOLIC_SELECTOR, see selection_mask()
+        Returns:
+            output_file_path (str) : Path to the annotated file.
+        """
+        flags = compile_args(file_path)
+        variables = None if catalog is None else catalog.load_variables(file_path, flags)
+        if variables is None:
+            variables = self.find_main_variables(file_path)
+            if catalog is not None:
+                catalog.store_variables(file_path, variables, flags)
+
+        # Create dictionary with declaration line and variable correspondence
+        dictionary = dict(variables)
+        # Remove duplicate declared variables while maintaining original order
+        unique_dict = {
+            key: value
+            for key, value in dictionary.items()
+            if list(dictionary.values()).count(value) == 1
+        }
+        if guarded:
+            # the selector decides at runtime which of the variables are symbolic
+            self.symbolic_candidates = unique_dict
+            rows = list(unique_dict)
+        else:
+            rows = self.ask_for_annotation_choice_klee(unique_dict, file_path)
+        # Read the original file content once and collect the annotations
+        rewriter = SourceRewriter(file_path)
+        self.add_annotations(rewriter, rows, unique_dict, guarded)
+        if include_klee:
+            rewriter.include(KLEE_INCLUDE)
+        if guarded:
+            # the guard is defined right before main
+            rewriter.include('#include <stdlib.h>')
+            rewriter.insert_after(find_main_function_range(file_path)[1] - 1, SYMBOLIC_GUARD)
+
+        # Write the annotated content to the output file
+        annotated_filename = 'annotated_' + os.path.basename(file_path)
+        if target_output_file_path is not None:
+            output_file_path = target_output_file_path
+        else:
+            output_file_path = os.path.join(
+                PATH_CONSEPT, 'tmp', 'concolic', annotated_filename)
+        return rewriter.write(output_file_path)
+
+    def insert_annotations(self, content, rows, unique_dict):
+        """
+        Insert annotations into the original content based on the selected rows.
+
+        Args:
+            content (list): List of lines in the original content.
+            rows (list): List of valid row numbers to annotate.
+            unique_dict (dict): Dictionary of declaration line and variable correspondence.
+        Returns:
+            list: List of lines with annotations.
+        """
+        rewriter = SourceRewriter(lines=content)
+        self.add_annotations(rewriter, rows, unique_dict)
+        return rewriter.render_lines()
+
+    def add_annotations(self, rewriter, rows, unique_dict, guarded=False):
+        """
+        Adds an annotation after every selected row to a rewriter of the original content.
+
+        Args:
+            rewriter (SourceRewriter): Rewriter of the original content.
+            rows (list): List of valid row numbers to annotate.
+            unique_dict (dict): Dictionary of declaration line and variable correspondence.
+            guarded (bool): Whether the annotations are guarded by their index in unique_dict.
+        Returns:
+            None
+        """
+        for line_number in sorted(set(rows)):
+            variable = unique_dict[line_number]
+            self.logger.info(
+                f'Making variable {variable} at line {line_number} symbolic')
+            # Create annotation and insert it after the declaration
+            guard = f'if (consept_symbolic({list(unique_dict).index(line_number)})) ' \
+                if guarded else ''
+            rewriter.insert_after(line_number, (
+                f'\t{guard}klee_make_symbolic(&{variable}, sizeof({variable}), '
+                f'"{variable}");\n'
+            ))
+
+    def selection_mask(self, selection, file_path=None) -> int:
+        """
+        Returns the value of the selector that makes the selected variables of the guarded
+        annotation symbolic.
+
+        Args:
+            selection (str): 'all', 'branch' for the branch relevant variables of the file, or
+            the comma-separated names of the variables.
+            file_path (str): Path to the file, needed for the branch relevant variables.
+        Returns:
+            mask (int): bit mask over the guarded variables in the order of the source.
+        """
+        names = list(self.symbolic_candidates.values())
+        if selection == 'all':
+            selected = names
+        elif selection == 'branch':
+            rows = BranchVariableSelector(file_path).select(self.symbolic_candidates)
+            selected = [self.symbolic_candidates[row] for row in rows]
+        else:
+            selected = [name.strip() for name in selection.split(',') if name.strip()]
+            assert all(name in names for name in selected), \
+                f'Variable not recognized in selection {selection}, should be one of {names}'
+        return sum(1 << names.index(name) for name in set(selected))
+
+    def ask_for_annotation_choice_klee(self, unique_dict, file_path=None):
+        """
+        Prompt the user for the choice of variable annotation for klee.
+
+        Args:
+            unique_dict (dict): Dictionary of declaration line and variable correspondence for klee.
+            file_path (str): Path to the file, needed to select the branch relevant variables.
+        Returns:
+            List[int]: List of valid row numbers of variable locations for klee.
+        """
+        while True:
+            print("\nChoose what to annotate:")
+            print("1. All variables")
+            print("2. Select specific variables")
+            # the branch relevant variables are found in the file, if it is known
+            if file_path is not None:
+                print("3. Variables that flow into branches, loop bounds and array indices")
+            choice = input("Enter your choice (1, 2 or 3): " if file_path is not None
+                           else "Enter your choice (1 or 2): ")
+
+            if choice == "1":
+                return list(unique_dict.keys())  # Annotate all variables
+            if choice == "3" and file_path is not None:
+                # Annotate the variables found by def-use analysis, and report the reduction
+                selector = BranchVariableSelector(file_path)
+                rows = selector.select(unique_dict)
+                print(selector.summary(unique_dict, rows))
+                return rows
+            if choice == "2":
+                # Display variables and their line numbers to the user
+                print("Choose what to annotate: ", unique_dict)
+                # Receive input and extract the code lines
+                to_be_annotated = input("Enter rows here (comma-separated): ")
+                rows = [int(row.strip()) for row in to_be_annotated.split(",")]
+
+                invalid_rows = False
+                if not rows:
+                    print("\nInvalid input provided")
+                    invalid_rows = True
+
+                # Check if all forws exist in dictionary of variables
+                if not all(row in unique_dict for row in rows):
+                    print("\nInvalid row(s) provided")
+                    invalid_rows = True
+
+                if not invalid_rows:
+                    return rows
+
+            # Print message to user for invalid characters in the input
+            print("\nInvalid choice")
@@ -1,32 +1,28 @@
 """
 This module provides a utility to run KLEE on a given file to be tested. It includes functions to
-start KLEE, process errors and output them in a readable format, inlude the KLEE library, 
-annotate the c++ with symbolic functions on the variables to be tested.
+start KLEE, process errors and output them in a readable format. Including the KLEE library
+and annotating the c++ file with symbolic functions on the variables to be tested is inherited
+from the KLEEAnnotator, see klee_annotator.py.
 
 Functions:
-    - run_klee(annotated_file_path)
-    - output_errors()
+    - run_klee(compile_commands_path, annotated_file_path, time_limit, selections)
+    - output_folders(selections)
+    - output_errors(name_output_folder)
     - analyze_ktest_files(ktests_directory)
     - print_error_inputs(tests, errors)
     - extract_errors(errors_path)
     - get_error_inputs(tests, num_of_errors)
-    - include_library(file_path, target_output_file_path)
-    - annotate_variables(file_path, output_file_path)
-    - insert_annotations(content, rows, unique_dict)
-    - ask_for_annotation_choice_klee(unique_dict)
 """
 import os
 import re
 import json
 import docker
-import clang.cindex
 
 from consept_vars import PATH_CONSEPT
-from tool_handler import ToolHandler
 from application_manager import ApplicationManager
-from utils.misc import include_lib
+from klee_annotator import KLEEAnnotator, SYMBOLIC_SELECTOR
 
-class KLEEHandler(ToolHandler):
+class KLEEHandler(KLEEAnnotator):
     """
     Class that handles interactions with KLEE symbolic execution tool.
     """
@@ -36,12 +32,16 @@ class KLEEHandler(ToolHandler):
         # Initialize any necessary variables or configurations here
         super().__init__(app_man=app_man, tool='concolic', test=test)
 
-    def run_klee(self, compile_commands_path, annotated_file_path, time_limit) -> None:
+    def run_klee(self, compile_commands_path, annotated_file_path, time_limit,
+                 selections=None) -> None:
         """
         This function runs the klee commands in order to generate the tests on the annotated
         variables set by the user.
         Output test statistics using 'klee-stats' inside a container.
-        Parameters: File path of the annotated file from the compile_commands_path, timelimit
+        With selections, the bitcode of a guarded annotation is compiled once and explored
+        under every selection in parallel, each with its own output folder.
+        Parameters: File path of the annotated file from the compile_commands_path, timelimit,
+        selections (dict) value of the selector by label, see KLEEAnnotator.selection_mask()
         Returns: None
         """
         # Retrieve the compile command from compile_commands.json
@@ -65,22 +65,41 @@ class KLEEHandler(ToolHandler):
         # Adjust the compile command to include the correct directory path
         compile_command = compile_command.replace(annotated_file_dir, '/home/consept/tmp/concolic')
         self.add_command(f'{compile_command} -o /home/consept/tmp/concolic/test.bc')
-        self.add_command('klee --external-calls=all '
-                        f'--max-time={time_limit} /home/consept/tmp/concolic/test.bc')
+        if selections:
+            # the same bitcode is explored under every selection in parallel
+            for label, mask in selections.items():
+                self.add_command(f'{SYMBOLIC_SELECTOR}={mask} klee --external-calls=all '
+                                 f'--max-time={time_limit} '
+                                 f'--output-dir=/home/consept/tmp/concolic/klee-out-{label} '
+                                 '/home/consept/tmp/concolic/test.bc &')
+            self.add_command('wait')
+        else:
+            self.add_command('klee --external-calls=all '
+                            f'--max-time={time_limit} /home/consept/tmp/concolic/test.bc')
         self.run()
 
         # Output stats regarding coverage
-        command = "klee-stats tmp/concolic/klee-out-0"
+        command = "klee-stats " + ' '.join(f'tmp/concolic/{name}'
+                                           for name in self.output_folders(selections))
         self.app_man.run_container(self.tool, command=command, remove_afterwards=False)
 
+    @staticmethod
+    def output_folders(selections=None) -> list:
+        """
+        Returns the names of the KLEE output folders of a run, one per selection if given.
+        """
+        if not selections:
+            return ['klee-out-0']
+        return [f'klee-out-{label}' for label in selections]
 
-    def output_errors(self) -> list:
+    def output_errors(self, name_output_folder='klee-out-0') -> list:
         """
         Extract and print the errors from the KLEE output folder.
+        Parameters:
+            name_output_folder (str): Name of the output folder in the concolic mount folder.
         Returns:
             errors (list): List of error messages.
         """
-        name_output_folder = 'klee-out-0'
         # Extract the errors and print
         local_errors_path = os.path.join(PATH_CONSEPT, 'tmp', self.tool, name_output_folder)
         errors = self.extract_errors(local_errors_path)
@@ -222,144 +241,3 @@ class KLEEHandler(ToolHandler):
                 found = True
 
         return inputs, names, int(num_of_objects)
-
-    def include_library(self, file_path, target_output_file_path = None) -> str:
-        """
-        Includes the KLEE library in the specified C++ file in the compile_commands.
-
-        Parameters:
-        annotated_file_path (str): The path to the input, annotated C++ file.
-
-        Returns:
-        output_file_path (str): path of the annotated file.
-        """
-        include_line = "#include <klee/klee.h>"
-
-        annotated_filename = os.path.basename(file_path)
-        if target_output_file_path is not None:
-            output_file_path = target_output_file_path
-        else:
-            output_file_path = os.path.join(
-                PATH_CONSEPT, 'tmp', 'concolic', annotated_filename)
-
-        self.logger.info(f'Will now include klee in file {file_path}')
-        include_lib(file_path, output_file_path, include_line)
-
-        return output_file_path
-
-    def annotate_variables(self, file_path, target_output_file_path=None) -> str:
-        """
-        Annotates variables in the given file with KLEE symbolic execution annotations,
-        and saves the annotated file as a new file.
-        Args:
-            file_path (str): Path to the input file stored anywhere in Consept.
-            output_file_path (str): Path to the annotated, output file.
-        Returns:
-            output_file_path (str) : Path to the annotated file.
-        """
-        # Load the translation unit
-        index = clang.cindex.Index.create()
-        translation_unit = index.parse(file_path)
-
-        # Collect variable names and line numbers of variable declarations
-        variables = []
-        var_decl_lines = []
-        for node in translation_unit.cursor.walk_preorder():
-            # Verify whether the declared variable is present in main method of source file
-            if (node.kind == clang.cindex.CursorKind.VAR_DECL and
-                node.semantic_parent.kind == clang.cindex.CursorKind.FUNCTION_DECL and
-                    node.semantic_parent.spelling == 'main'):
-                # Append variables and their declaration lines in arrays variables, var_decl_lines
-                variables.append(node.spelling)
-                var_decl_lines.append(node.extent.start.line)
-
-        # Create dictionary with declaration line and variable correspondence
-        dictionary = dict(zip(var_decl_lines, variables))
-        # Remove duplicate declared variables while maintaining original order
-        unique_dict = {
-            key: value
-            for key, value in dictionary.items()
-            if list(dictionary.values()).count(value) == 1
-        }
-        rows = self.ask_for_annotation_choice_klee(unique_dict)
-        # Read the original file content
-        with open(file_path, 'r', encoding='utf-8') as file:
-            content = file.readlines()
-
-        annotated_content = self.insert_annotations(content, rows, unique_dict)
-        # Write the annotated content to the output file
-        annotated_filename = 'annotated_' + os.path.basename(file_path)
-        if target_output_file_path is not None:
-            output_file_path = target_output_file_path
-        else:
-            output_file_path = os.path.join(
-                PATH_CONSEPT, 'tmp', 'concolic', annotated_filename)
-        with open(output_file_path, 'w', encoding='utf-8') as output_file:
-            output_file.writelines(annotated_content)
-        return output_file_path
-
-    def insert_annotations(self, content, rows, unique_dict):
-        """
-        Insert annotations into the original content based on the selected rows.
-
-        Args:
-            content (list): List of lines in the original content.
-            rows (list): List of valid row numbers to annotate.
-            unique_dict (dict): Dictionary of declaration line and variable correspondence.
-        Returns:
-            list: List of lines with annotations.
-        """
-        annotated_content = []
-        for line_number, line in enumerate(content, start=1):
-            annotated_content.append(line)
-            if line_number in rows:
-                variable = unique_dict[line_number]
-                self.logger.info(
-                    f'Making variable {variable} at line {line_number} symbolic')
-                # Create annotation and append it to the new annotated file
-                annotation = (
-                    f'\tklee_make_symbolic(&{variable}, sizeof({variable}), '
-                    f'"{variable}");\n'
-                )
-                annotated_content.append(annotation)
-        return annotated_content
-
-    def ask_for_annotation_choice_klee(self, unique_dict):
-        """
-        Prompt the user for the choice of variable annotation for klee.
-
-        Args:
-            unique_dict (dict): Dictionary of declaration line and variable correspondence for klee.
-        Returns:
-            List[int]: List of valid row numbers of variable locations for klee.
-        """
-        while True:
-            print("\nChoose what to annotate:")
-            print("1. All variables")
-            print("2. Select specific variables")
-            choice = input("Enter your choice (1 or 2): ")
-
-            if choice == "1":
-                return list(unique_dict.keys())  # Annotate all variables
-            if choice == "2":
-                # Display variables and their line numbers to the user
-                print("Choose what to annotate: ", unique_dict)
-                # Receive input and extract the code lines
-                to_be_annotated = input("Enter rows here (comma-separated): ")
-                rows = [int(row.strip()) for row in to_be_annotated.split(",")]
-
-                invalid_rows = False
-                if not rows:
-                    print("\nInvalid input provided")
-                    invalid_rows = True
-
-                # Check if all forws exist in dictionary of variables
-                if not all(row in unique_dict for row in rows):
-                    print("\nInvalid row(s) provided")
-                    invalid_rows = True
-
-                if not invalid_rows:
-                    return rows
-
-            # Print message to user for invalid characters in the input
-            print("\nInvalid choice")
@@ -0,0 +1,194 @@
+"""
+This module provides a utility to fuzz every function of a file to be tested with a single
+binary. The generated fuzz target dispatches on the first byte of the input to one of the
+fuzzable functions, such that the file is annotated, compiled and run only once.
+"""
+
+import os
+import re
+import shutil
+
+from application_manager import ApplicationManager
+from fuzz_handler import FuzzHandler
+from fuzz_stats import parse_status_line
+from tuut_file import TuutFile
+from consept_vars import FOLDER_FUZZ_CORPUS, ARTIFACT_PREFIX_FUZZ
+
+# folder (inside the fuzzing mount folder) with the corpus split per target
+FOLDER_NAME_TARGETS = 'targets'
+
+# marker printed inside the container before the coverage of a target is measured
+TARGET_MARKER = 'CONSEPT_TARGET'
+
+
+def fuzzable_rows(func_details : dict) -> list:
+    """
+    Returns the rows of all functions that can be fuzzed, i.e. functions with parameters.
+    The position of a row in the list is the value of the dispatch byte of that function.
+    """
+    return sorted(row for row, details in func_details.items() if details[1] > 0)
+
+
+class MultiTargetFuzzHandler(FuzzHandler):
+    """
+    Class that handles fuzzing all functions of a file with one LibFuzzer binary
+    """
+
+    def __init__(self,
+                 app_man: ApplicationManager = None,
+                 test: bool = False):
+        super().__init__(app_man=app_man, test=test)
+
+        # rows of the functions targeted by the fuzz target, in order of their dispatch byte
+        self.targets = []
+
+    def annotate_fuzz_multi(self, tuut : TuutFile) -> list:
+        """
+        Annotates the file that is to be tested with a fuzz target that calls the function
+        with index Data[0] % number of targets, fed with the remaining bytes of the input.
+
+        Parameters:
+            tuut (TuutFile): To be tested file abstraction
+
+        Returns:
+            targets (list): rows of the targeted functions, in order of their dispatch byte
+        """
+        self.targets = fuzzable_rows(tuut.func_details)
+        assert self.targets, f'No function with parameters found in {tuut.file_name}'
+
+        #the first byte selects the function, the remaining bytes are its params
+        body = '    if(Size < 1){\n        return 0;\n    }\n\n'
+        body += f'    switch(Data[0] % {len(self.targets)}){{\n'
+        for index, row in enumerate(self.targets):
+            body += f'    case {index}: {{\n'
+            body += self.gen_target_call(tuut.func_details.get(row), 1, ' ' * 8)
+            body += '\n        break;\n    }\n'
+        body += '    }'
+
+        self.write_fuzz_target(tuut, body)
+
+        return self.targets
+
+    def add_multi_fuzz_commands(self, workers : int, time_limit : int):
+        """
+        Adds the command that fuzzes the multi-target binary with parallel workers.
+        Crashes do not stop the campaign, such that every target keeps being fuzzed.
+
+        Parameters:
+            workers (int): number of parallel fuzzing processes
+            time_limit (int): number of seconds the campaign is allowed to run
+
+        Returns:
+            None
+        """
+        self.add_command(f'mkdir -p {FOLDER_FUZZ_CORPUS}')
+        self.add_fuzz_command(
+            options=f'-fork={workers} -ignore_crashes=1 -max_total_time={time_limit} '
+            f'{FOLDER_FUZZ_CORPUS}')
+
+    def target_of_input(self, path_input : str) -> int:
+        """
+        Returns the row of the function an input of the multi-target binary is fed to,
+        or None for an empty input.
+        """
+        with open(path_input, 'rb') as file:
+            first_byte = file.read(1)
+        if not first_byte:
+            return None
+        return self.targets[first_byte[0] % len(self.targets)]
+
+    def split_corpus(self) -> dict:
+        """
+        Copies every corpus entry to the folder of the target it belongs to.
+
+        Returns:
+            corpus (dict): row of the target -> number of corpus entries of that target
+        """
+        path_corpus = os.path.join(self.path_mount_folder, 'corpus')
+        path_targets = os.path.join(self.path_mount_folder, FOLDER_NAME_TARGETS)
+        shutil.rmtree(path_targets, ignore_errors=True)
+
+        corpus = {row: 0 for row in self.targets}
+        for row in self.targets:
+            os.makedirs(os.path.join(path_targets, str(row)))
+
+        if os.path.exists(path_corpus):
+            for name in os.listdir(path_corpus):
+                row = self.target_of_input(os.path.join(path_corpus, name))
+                if row is None:
+                    continue
+                shutil.copy(os.path.join(path_corpus, name),
+                            os.path.join(path_targets, str(row), name))
+                corpus[row] += 1
+        return corpus
+
+    def count_crashes(self) -> dict:
+        """
+        Returns the number of crash files per target row.
+        """
+        crashes = {row: 0 for row in self.targets}
+        for name in self.mount_files:
+            if name.startswith('crash-') and not name.endswith('.log'):
+                row = self.target_of_input(os.path.join(self.path_mount_folder, name))
+                if row is not None:
+                    crashes[row] += 1
+        return crashes
+
+    @staticmethod
+    def parse_target_coverage(output : str) -> dict:
+        """
+        Parses the output of the coverage replay, in which the replay of the corpus of every
+        target is preceded by a line 'CONSEPT_TARGET <row>'.
+
+        Returns:
+            coverage (dict): row of the target -> edge coverage reached by its corpus
+        """
+        coverage = {}
+        row = None
+        for line in re.split(r'[\r\n]+', output):
+            if line.startswith(TARGET_MARKER):
+                row = int(line.split()[1])
+                continue
+            stats = parse_status_line(line)
+            if stats is not None and row is not None:
+                coverage[row] = stats['cov']
+        return coverage
+
+    def attribute_coverage(self, tuut : TuutFile, binary : str = 'fuzz_output') -> list:
+        """
+        Attributes the results of a multi-target campaign to the targeted functions. The
+        corpus is split per target and the corpus of every target is replayed (-runs=0) to
+        measure the coverage it reaches on its own.
+
+        Parameters:
+            tuut (TuutFile): To be tested file abstraction
+            binary (str): name of the multi-target fuzzing binary
+
+        Returns:
+            report (list): one dictionary per target with its function, corpus entries,
+            crashes and coverage
+        """
+        corpus = self.split_corpus()
+        crashes = self.count_crashes()
+
+        # replay the corpus of every target separately
+        output = []
+        self.open_new_script()
+        for row in self.targets:
+            self.add_command(f'echo {TARGET_MARKER} {row}')
+            self.add_command(f'tmp/fuzz/{binary} -runs=0 -artifact_prefix={ARTIFACT_PREFIX_FUZZ} '
+                             f'tmp/fuzz/{FOLDER_NAME_TARGETS}/{row}')
+        self.run_script(output_callback=output.append)
+        coverage = self.parse_target_coverage(b''.join(output).decode('utf-8', errors='replace'))
+
+        report = [{'row': row,
+                   'function': tuut.func_dict.get(row),
+                   'corpus': corpus[row],
+                   'crashes': crashes[row],
+                   'coverage': coverage.get(row, 0)} for row in self.targets]
+
+        print('\n ========= PER-TARGET RESULTS =========')
+        for entry in report:
+            print(f'{entry["row"]:>5} {entry["function"]}: cov {entry["coverage"]}, '
+                  f'corpus {entry["corpus"]}, crashes {entry["crashes"]}')
+        return report
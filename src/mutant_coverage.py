@@ -0,0 +1,113 @@
+"""
+This module provides the coverage based selection of the tests of the mutants of Dextool.
+The line coverage of every test is recorded once per run with an instrumented build. A
+mutant on lines no test covers can not be killed and is marked as not covered without being
+tested. For every other mutant only the tests that cover its lines are run, the test that
+killed the most mutants in earlier runs first, and the first test that fails kills it.
+
+Functions:
+    - read_coverage(path_coverage, root)
+    - select_tests(mutants, coverage, kills)
+    - write_selection(path_selection, selection, mutants, checksums)
+    - summary(uncovered, selection)
+"""
+
+import os
+import posixpath
+
+
+def read_coverage(path_coverage : str, root : str) -> dict:
+    """
+    Reads the lines every test covers, as recorded by the coverage phase of run_dextool.sh.
+    Every line of the coverage file holds the name of a test, the path of a source file and a
+    covered line, separated by tabs.
+
+    Parameters:
+        path_coverage (str): path of the coverage file on the host
+        root (str): root of the project in the container, the paths of the coverage file are
+        paths in the container
+
+    Returns:
+        coverage (dict): per path of a file relative to the root, per line the tests that
+        cover it
+    """
+    coverage = {}
+    if not os.path.exists(path_coverage):
+        return coverage
+    with open(path_coverage, 'r', encoding='utf-8') as file:
+        for line in file:
+            fields = line.rstrip('\n').split('\t')
+            if len(fields) != 3 or not fields[2].isdigit():
+                continue
+            test, path, number = fields
+
+            # files outside the project, e.g. system headers, are not mutated
+            path = posixpath.relpath(posixpath.normpath(posixpath.join(root, path)), root)
+            if path.startswith('..'):
+                continue
+            coverage.setdefault(path, {}).setdefault(int(number), set()).add(test)
+    return coverage
+
+
+def select_tests(mutants : list, coverage : dict, kills : list) -> tuple:
+    """
+    Selects the tests of every mutant: the tests that cover any of its lines, in order of
+    their historical kill likelihood, i.e. the number of mutants they killed before.
+
+    Parameters:
+        mutants (list): (id, path, first line, last line) of every untested mutant
+        coverage (dict): per path per line the tests that cover it, see read_coverage()
+        kills (list): (name, kills) of every known test, see DextoolDatabase.test_kills()
+
+    Returns:
+        uncovered (list): ids of the mutants no test covers
+        selection (dict): per id of a covered mutant the names of the tests to run, in order
+    """
+    # tests without history come after those that killed a mutant, by name
+    ranks = {name: rank for rank, (name, _) in enumerate(kills)}
+    uncovered, selection = [], {}
+    for status_id, path, first, last in mutants:
+        lines = coverage.get(path, {})
+        tests = set().union(*(lines.get(number, set()) for number in range(first, last + 1)))
+        if tests:
+            selection[status_id] = sorted(tests, key=lambda test: (ranks.get(test, len(ranks)),
+                                                                   test))
+        else:
+            uncovered.append(status_id)
+    return uncovered, selection
+
+
+def write_selection(path_selection : str, selection : dict, mutants : list,
+                    checksums : dict) -> None:
+    """
+    Writes the tests of every mutant to the file test.sh reads, a line per mutant with its
+    checksum, the path of its file, its first and last line and the names of its tests,
+    separated by tabs. test.sh finds the mutant under test by the checksum Dextool exports
+    in DEXTOOL_MUTID for a mutant in a schema, and otherwise by the lines of the file that
+    Dextool changed.
+
+    Parameters:
+        path_selection (str): path of the file on the host
+        selection (dict): per id of a mutant the names of its tests, see select_tests()
+        mutants (list): (id, path, first line, last line) of every untested mutant
+        checksums (dict): per id of a mutant its checksum, see DextoolDatabase.checksums()
+    """
+    locations = {status_id: (path, first, last) for status_id, path, first, last in mutants}
+    with open(path_selection, 'w', encoding='utf-8') as file:
+        for status_id, tests in selection.items():
+            # a mutant without a checksum is only found by its lines
+            fields = [str(checksums.get(status_id, '-'))]
+            fields += [str(field) for field in locations[status_id]]
+            file.write('\t'.join(fields + tests) + '\n')
+
+
+def summary(uncovered : list, selection : dict) -> str:
+    """
+    Returns a human readable summary of the coverage based selection of the tests.
+    """
+    tests = set().union(*selection.values())
+    average = sum(len(names) for names in selection.values()) / len(selection) \
+        if selection else 0
+    return (f'Test coverage: {len(uncovered)} of {len(uncovered) + len(selection)} mutant(s) '
+            f'are not covered by any test and not tested, the other {len(selection)} run '
+            f'{average:.1f} of {len(tests)} covering test(s) on average')
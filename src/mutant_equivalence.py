@@ -0,0 +1,172 @@
+"""
+This module provides the trivial compiler equivalence (TCE) filter of the mutants of Dextool.
+Before the mutants are tested, the file of every untested mutant is compiled with the mutant
+applied and with optimisations, and the object file is hashed. A mutant of which the object
+equals the object of the original file can not be killed by any test and is marked as
+equivalent, a mutant of which the object equals that of another mutant of the same file has
+the same result as that mutant and is marked as its duplicate. Neither is ever tested.
+A mutant that does not compile is killed by the compiler.
+
+Classes:
+    - TrivialCompilerEquivalence(object)
+
+Functions:
+    - object_commands(path_compile_db, root)
+"""
+
+import json
+import os
+import posixpath
+import shlex
+
+# options that influence the object code without changing the program, removed such that
+# equal programs give equal objects
+DROPPED_OPTIONS = ['-c', '-g', '-g3', '-MD', '-MMD', '-MP']
+DROPPED_OPTIONS_WITH_VALUE = ['-o', '-MF', '-MT', '-MQ']
+
+# object file the scripts compile to and file the original source is saved to, in the
+# container
+PATH_OBJECT = '/tmp/consept_tce.o'
+PATH_SAVED_SOURCE = '/tmp/consept_tce_source'
+
+# hash of a mutant that does not compile
+FAILED = 'failed'
+
+
+def object_commands(path_compile_db : str, root : str) -> dict:
+    """
+    Returns the commands that compile the files of a compile database to an optimised object
+    file, by path of the file relative to the root of the project.
+
+    Parameters:
+        path_compile_db (str): path of the compile_commands.json of the project
+        root (str): root of the project in the container, the paths of the compile database
+        are paths in the container
+
+    Returns:
+        commands (dict): per relative path of a file the shell command that compiles it
+    """
+    with open(path_compile_db, 'r', encoding='utf-8') as file:
+        entries = json.load(file)
+
+    commands = {}
+    for entry in entries:
+        arguments = entry['arguments'] if 'arguments' in entry else shlex.split(entry['command'])
+        kept = []
+        remaining = iter(arguments)
+        for argument in remaining:
+            if argument in DROPPED_OPTIONS_WITH_VALUE:
+                next(remaining, None)
+            elif argument not in DROPPED_OPTIONS and not argument.startswith('-O'):
+                kept.append(argument)
+
+        path_file = posixpath.normpath(posixpath.join(entry['directory'], entry['file']))
+        commands[posixpath.relpath(path_file, root)] = \
+            f'(cd {shlex.quote(entry["directory"])} && ' \
+            f'{shlex.join(kept + ["-O2", "-c", "-o", PATH_OBJECT])})'
+    return commands
+
+
+class TrivialCompilerEquivalence:
+    """
+    Class that finds the equivalent and duplicate mutants through the hashes of their objects.
+    """
+
+    def __init__(self, commands : dict, path_hashes : str):
+        """
+        Constructor of the TrivialCompilerEquivalence class.
+
+        Parameters:
+            commands (dict): per relative path of a file the command that compiles it, see
+            object_commands()
+            path_hashes (str): path of the file the script writes the hashes to, in the
+            container
+        """
+        self.commands = commands
+        self.path_hashes = path_hashes
+
+    def script(self, mutants : list) -> list:
+        """
+        Returns the commands of the script that hashes the objects of the original files and of
+        the mutants. Every line of the hashes file holds the id of a mutation status, 0 for the
+        original file, the path of the file and the hash of the object.
+
+        Parameters:
+            mutants (list): (id, path, kind) of every untested mutant, the path relative to the
+            root of the project
+
+        Returns:
+            commands (list): the commands of the script, run in the root of the project
+        """
+        files = {}
+        for status_id, path, _ in mutants:
+            if path in self.commands:
+                files.setdefault(path, []).append(status_id)
+
+        lines = [f': > {self.path_hashes}']
+        hashed = f'$(sha256sum {PATH_OBJECT} | cut -d " " -f 1)'
+        for path, status_ids in files.items():
+            quoted = shlex.quote(path)
+            lines += [f'cp {quoted} {PATH_SAVED_SOURCE}',
+                      f'{self.commands[path]} && echo "0 {path} {hashed}" >> {self.path_hashes}']
+            for status_id in status_ids:
+                # every mutant is applied to the original file, which is restored afterwards
+                lines += [f'if dextool mutate generate --id {status_id}; then',
+                          f'if {self.commands[path]}; then',
+                          f'echo "{status_id} {path} {hashed}" >> {self.path_hashes}',
+                          f'else echo "{status_id} {path} {FAILED}" >> {self.path_hashes}; fi',
+                          'fi',
+                          f'cp {PATH_SAVED_SOURCE} {quoted}']
+        return lines
+
+    @staticmethod
+    def classify(path_hashes : str) -> tuple:
+        """
+        Classifies the mutants by the hashes of their objects. Of the mutants of a file with
+        the same object, the one with the lowest id is tested and the others are duplicates.
+
+        Parameters:
+            path_hashes (str): path of the hashes file on the host
+
+        Returns:
+            statuses (dict): per id the status of a mutant that does not need to be tested,
+            'equivalent', 'killedByCompiler' or 'skipped' for a duplicate
+            duplicates (dict): per id of a duplicate the id of the mutant it duplicates
+        """
+        if not os.path.exists(path_hashes):
+            return {}, {}
+        with open(path_hashes, 'r', encoding='utf-8') as file:
+            rows = [line.split() for line in file if len(line.split()) == 3]
+
+        originals = {path: digest for status_id, path, digest in rows if status_id == '0'}
+        statuses, duplicates, first = {}, {}, {}
+        for status_id, path, digest in sorted(rows, key=lambda row: int(row[0])):
+            status_id = int(status_id)
+            if status_id == 0:
+                continue
+            if path not in originals:
+                # without the object of the original file nothing can be concluded
+                continue
+            if digest == FAILED:
+                statuses[status_id] = 'killedByCompiler'
+            elif digest == originals.get(path):
+                statuses[status_id] = 'equivalent'
+            elif (path, digest) in first:
+                statuses[status_id] = 'skipped'
+                duplicates[status_id] = first[(path, digest)]
+            else:
+                first[(path, digest)] = status_id
+        return statuses, duplicates
+
+    @staticmethod
+    def summary(hashed : int, statuses : dict) -> str:
+        """
+        Returns a human readable summary of the equivalence statistics of the mutants.
+        """
+        counts = {status: list(statuses.values()).count(status)
+                  for status in ['equivalent', 'skipped', 'killedByCompiler']}
+        percentage = 100 * len(statuses) / hashed if hashed else 0
+        return (f'Trivial compiler equivalence: {hashed} mutant(s) compiled, '
+                f'{counts["equivalent"]} equivalent to the original, {counts["skipped"]} '
+                f'duplicate(s), {counts["killedByCompiler"]} killed by the compiler; '
+                f'{len(statuses)} ({percentage:.1f}%) are not tested')
@@ -0,0 +1,193 @@
+"""
+This module provides the statistical sampling of the mutants of Dextool. Instead of testing
+every untested mutant, a random sample of a fixed size or a percentage is tested, optionally
+stratified by mutation operator and by file: the population is split into strata, of which
+every one gets a share of the sample in proportion to its size. The mutation score of the
+untested mutants is estimated from the results of the sample, with a confidence interval that
+takes the finite population of every stratum into account.
+
+Functions:
+    - sample_spec(value)
+    - sample_size(spec, population)
+    - allocate(strata_sizes, size)
+    - draw(mutants, size, strata, seed)
+    - estimate(population, sample, results, strata)
+    - summary(estimated)
+"""
+
+import argparse
+import math
+import random
+
+from dextool_db import DETECTED_STATUSES, SURVIVED_STATUSES, kind_operator
+
+# z value of a two sided 95% confidence interval
+Z_95 = 1.96
+
+# properties of a mutant the population can be stratified by
+STRATA = ['operator', 'file']
+
+
+def sample_spec(value : str) -> str:
+    """
+    Checks the size of a sample given on the command line, a positive number of mutants, e.g.
+    '200', or a percentage above 0 and up to 100, e.g. '10%' or '2.5%', and returns it.
+    """
+    try:
+        if value.endswith('%'):
+            valid = 0 < float(value[:-1]) <= 100
+        else:
+            valid = int(value) > 0
+    except ValueError:
+        valid = False
+    if not valid:
+        raise argparse.ArgumentTypeError(
+            f"invalid sample size '{value}', expected a positive number of mutants, e.g. 200, "
+            "or a percentage, e.g. 10%")
+    return value
+
+
+def sample_size(spec : str, population : int) -> int:
+    """
+    Returns the size of a sample given as a number of mutants, e.g. '200', or as a percentage
+    of the population, e.g. '10%'. The sample is at least one mutant of a non-empty population
+    and at most the population.
+    """
+    if spec.endswith('%'):
+        size = math.ceil(population * float(spec[:-1]) / 100)
+    else:
+        size = int(spec)
+    return max(min(size, population), 1 if population else 0)
+
+
+def allocate(strata_sizes : dict, size : int) -> dict:
+    """
+    Allocates a sample over the strata in proportion to their size, rounding by the largest
+    remainder. If the sample is at least as large as the number of strata, every stratum
+    gets at least one mutant.
+
+    Parameters:
+        strata_sizes (dict): number of mutants per stratum
+        size (int): size of the sample
+
+    Returns:
+        allocation (dict): number of mutants to sample per stratum
+    """
+    population = sum(strata_sizes.values())
+    if population == 0:
+        return {stratum: 0 for stratum in strata_sizes}
+
+    minimum = 1 if size >= len(strata_sizes) else 0
+    shares = {stratum: size * count / population for stratum, count in strata_sizes.items()}
+    allocation = {stratum: min(max(int(share), minimum), strata_sizes[stratum])
+                  for stratum, share in shares.items()}
+
+    # the remaining mutants go to the strata with the largest remainders that have room
+    order = sorted(shares, key=lambda stratum: shares[stratum] - int(shares[stratum]),
+                   reverse=True)
+    while sum(allocation.values()) < size:
+        stratum = next(stratum for stratum in order
+                       if allocation[stratum] < strata_sizes[stratum])
+        allocation[stratum] += 1
+        order.remove(stratum)
+        order.append(stratum)
+    # the minimum can make the allocation too large, which is taken from the largest excesses
+    while sum(allocation.values()) > size:
+        stratum = max((stratum for stratum in allocation if allocation[stratum] > minimum),
+                      key=lambda stratum: allocation[stratum] - shares[stratum])
+        allocation[stratum] -= 1
+    return allocation
+
+
+def stratum_of(mutant : tuple, strata : list) -> tuple:
+    """
+    Returns the stratum of an (id, path, kind) mutant for the given stratification.
+    """
+    return tuple(kind_operator(mutant[2]) if stratum == 'operator' else mutant[1]
+                 for stratum in strata)
+
+
+def draw(mutants : list, size : int, strata : list = (), seed : int = None) -> list:
+    """
+    Draws a stratified random sample of mutants.
+
+    Parameters:
+        mutants (list): (id, path, kind) of every mutant of the population
+        size (int): size of the sample
+        strata (list): properties the population is stratified by, see STRATA
+        seed (int): seed of the random generator, None for a different sample every time
+
+    Returns:
+        ids (list): ids of the sampled mutants, sorted
+    """
+    groups = {}
+    for mutant in mutants:
+        groups.setdefault(stratum_of(mutant, strata), []).append(mutant[0])
+
+    generator = random.Random(seed)
+    allocation = allocate({stratum: len(ids) for stratum, ids in groups.items()}, size)
+    return sorted(status_id for stratum, ids in groups.items()
+                  for status_id in generator.sample(ids, allocation[stratum]))
+
+
+def estimate(population : list, sample : list, results : dict, strata : list = ()) -> dict:
+    """
+    Estimates the mutation score of a population from the results of a stratified sample.
+    The score of every stratum is weighted by its size, and the variance of every stratum is
+    corrected for its finite population.
+
+    Parameters:
+        population (list): (id, path, kind) of every mutant of the population
+        sample (list): ids of the sampled mutants
+        results (dict): status of every sampled mutant, by id
+        strata (list): properties the population was stratified by
+
+    Returns:
+        estimated (dict): the estimated score and the bounds of its 95% confidence interval
+        in percent (None without results), the margin of error, the size of the population
+        and the number of sampled mutants with a result
+    """
+    sampled = set(sample)
+    groups = {}
+    for mutant in population:
+        group = groups.setdefault(stratum_of(mutant, strata), {'size': 0, 'outcomes': []})
+        group['size'] += 1
+        status = results.get(mutant[0])
+        if mutant[0] in sampled and status in DETECTED_STATUSES + SURVIVED_STATUSES:
+            group['outcomes'].append(status in DETECTED_STATUSES)
+
+    # strata without results are left out of the estimate
+    counted = [group for group in groups.values() if group['outcomes']]
+    total = sum(group['size'] for group in counted)
+    if total == 0:
+        return {'score': None, 'low': None, 'high': None, 'margin': None,
+                'population': len(population), 'tested': 0}
+
+    score, variance = 0.0, 0.0
+    for group in counted:
+        weight = group['size'] / total
+        tested = len(group['outcomes'])
+        proportion = sum(group['outcomes']) / tested
+        correction = 1 - tested / group['size']
+        score += weight * proportion
+        variance += weight ** 2 * correction * proportion * (1 - proportion) / \
+            max(tested - 1, 1)
+
+    margin = Z_95 * math.sqrt(variance)
+    return {'score': round(100 * score, 2),
+            'low': round(100 * max(score - margin, 0.0), 2),
+            'high': round(100 * min(score + margin, 1.0), 2),
+            'margin': round(100 * margin, 2),
+            'population': len(population),
+            'tested': sum(len(group['outcomes']) for group in counted)}
+
+
+def summary(estimated : dict) -> str:
+    """
+    Returns a human readable summary of an estimate, see estimate().
+    """
+    if estimated['score'] is None:
+        return f'No sampled mutant of the {estimated["population"]} mutant(s) has a result'
+    return (f'Estimated mutation score {estimated["score"]:.2f}% ± {estimated["margin"]:.2f} '
+            f'(95% confidence interval {estimated["low"]:.2f}% - {estimated["high"]:.2f}%) '
+            f'from {estimated["tested"]} of {estimated["population"]} mutant(s)')
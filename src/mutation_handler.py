@@ -1,14 +1,20 @@
 """
 Class that handles interactions with Dextool.
 """
+import json
 import os
 import toml
 
 from application_manager import ApplicationManager
-from consept_vars import MOUNTED_MUTATION_FOLDER
-from tool_handler import ToolHandler
+from consept_vars import FOLDER_NAME_MUTATION_DATABASES, MOUNTED_MUTATION_FOLDER, \
+    NAME_FILE_BUILD_TIMES, NAME_FILE_MUTANT_TESTS, NAME_FILE_MUTATION_DIFF, \
+    NAME_FILE_MUTATION_RESULTS
+from dextool_db import DextoolDatabase
+from dextool_phases import DextoolPhases
+import mutant_sampling
+from utils.git_diff import changed_lines, git_diff
 
-class DextoolHandler(ToolHandler): # pylint: disable=consider-using-enumerate
+class DextoolHandler(DextoolPhases): # pylint: disable=consider-using-enumerate
     """
     Class that handles interactions with Dextool.
     """
@@ -18,23 +24,118 @@ class DextoolHandler(ToolHandler): # pylint: disable=consider-using-enumerate
         # Initialize any necessary variables or configurations here
         super().__init__(app_man=app_man, tool='mutation', test=test)
 
-    def start_dextool(self, cmakelists):
+    def start_dextool(self, cmakelists, shards=1, revision_range=None, *, tce=False,
+                      sample=None, strata=(), coverage=False):
         '''
-        Sets up Dextool by annotating relevent files and then starting up the docker container
+        Sets up Dextool by annotating relevent files and then starting up the docker container.
+        With more than one shard the mutants are tested by that many containers in parallel.
+        With a git revision range, e.g. 'main..HEAD', only the mutants on the lines changed in
+        that range are analysed and tested. With tce the equivalent and duplicate mutants are
+        filtered out before testing, see run_tce(). With a sample, e.g. '200' or '10%', only a
+        random sample of the untested mutants is tested, stratified by the given strata, see
+        sample_mutants(). With coverage every mutant is only tested by the tests that cover it,
+        see select_tests(). Returns the results of the mutants, see report_results().
         '''
         project_root = os.path.dirname(cmakelists)
         # self.annotate_cmakelists(project_root)
 
         # include_paths = self.include_paths(cmakelists)
-        self.annotate_config_file()
+
+        # the database of the project is kept on the host, in the mounted folder
+        os.makedirs(os.path.dirname(self.database_path(project_root)), exist_ok=True)
+        self.annotate_config_file(f'{MOUNTED_MUTATION_FOLDER}/{FOLDER_NAME_MUTATION_DATABASES}/'
+                                  f'{self.database_name(project_root)}')
+
+        # build.sh adds the duration of every build of this run to the build times
+        path_build_times = os.path.join(self.path_mount_folder, NAME_FILE_BUILD_TIMES)
+        if os.path.exists(path_build_times):
+            os.remove(path_build_times)
+
+        # run_dextool.sh passes the diff to Dextool if there is one
+        path_diff = os.path.join(self.path_mount_folder, NAME_FILE_MUTATION_DIFF)
+        changes = None
+        if os.path.exists(path_diff):
+            os.remove(path_diff)
+        if revision_range is not None:
+            diff = git_diff(project_root, revision_range)
+            changes = changed_lines(diff)
+            with open(path_diff, 'w', encoding='utf-8') as file:
+                file.write(diff)
+            self.logger.info(f'Mutating the lines changed in {revision_range}, '
+                             f'{len(changes)} file(s)')
+
+        # test.sh only selects the tests of the mutants if coverage was recorded in this run
+        path_selection = os.path.join(self.path_mount_folder, NAME_FILE_MUTANT_TESTS)
+        if os.path.exists(path_selection):
+            os.remove(path_selection)
 
         command = f'bash {MOUNTED_MUTATION_FOLDER}/run_dextool.sh'
 
-        return super().run_tool(command, project_root)
+        estimated = None
+        if shards > 1 or tce or sample is not None or coverage:
+            estimated = self.run_phases(
+                project_root, shards, tce=tce, coverage=coverage,
+                sample=(sample, strata) if sample is not None else None)
+        else:
+            super().run_tool(command, project_root, volumes=self.volumes(project_root))
+        print(self.build_summary(path_build_times))
+        if changes is not None:
+            print(self.diff_summary(project_root, changes, revision_range))
+        return self.report_results(project_root, estimated)
+
+    def diff_summary(self, project_root, changes, revision_range):
+        '''
+        Returns a summary of a run on the changes of a revision range: the number of mutants on
+        the changed lines and the number of mutants elsewhere that were skipped.
+        '''
+        database = DextoolDatabase(self.database_path(project_root))
+        scope = database.diff_scope(changes)
+        database.close()
+        ranges = sum(len(file_ranges) for file_ranges in changes.values())
+        return (f'{scope["changed"]} mutant(s) on {ranges} changed range(s) in {len(changes)} '
+                f'file(s) of {revision_range}, {scope["untested"]} of them untested; '
+                f'{scope["skipped"]} mutant(s) outside the changes were skipped')
+
+    def report_results(self, project_root, estimated=None):
+        '''
+        Reads the results of the mutants from the Dextool database of a project, writes them to
+        results.json in the mount folder and prints a summary of them. The estimate of a
+        sampled run is added to the results.
+        '''
+        database = DextoolDatabase(self.database_path(project_root))
+        results = database.results()
+        database.close()
+        if estimated is not None:
+            results['estimate'] = estimated
+            print(mutant_sampling.summary(estimated))
+
+        path_results = os.path.join(self.path_mount_folder, NAME_FILE_MUTATION_RESULTS)
+        with open(path_results, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4)
+        print(DextoolDatabase.summary(results))
+        print(f'The results are stored in {path_results}')
+        return results
+
+    @staticmethod
+    def build_summary(path_build_times):
+        '''
+        Returns a summary of the builds of a run, of which build.sh writes the duration in
+        seconds to the build times file, one build per line.
+        '''
+        if not os.path.exists(path_build_times):
+            return 'No builds were run'
+        with open(path_build_times, 'r', encoding='utf-8') as file:
+            durations = [float(line) for line in file if line.strip()]
+        if not durations:
+            return 'No builds were run'
+        return (f'{len(durations)} build(s) in {sum(durations):.1f} s, '
+                f'mean {sum(durations) / len(durations):.1f} s, '
+                f'first {durations[0]:.1f} s, slowest {max(durations):.1f} s')
 
-    def annotate_config_file(self):
+    def annotate_config_file(self, database='dextool_mutate.sqlite3'):
         '''
         Edits the dextool_config.toml file depending on the user project.
+        The database is the path of the Dextool database the results are stored in.
         '''
         config_file_path = os.path.join(os.path.dirname(__file__), 'tools',
                                         'mutation', 'dextool_config.toml')
@@ -43,7 +144,7 @@ class DextoolHandler(ToolHandler): # pylint: disable=consider-using-enumerate
             config = toml.load(file)
 
         config["workarea"]["root"] = "."
-        config["database"]["db"] = 'dextool_mutate.sqlite3'
+        config["database"]["db"] = database
         config["analyze"]["exclude"] = ["test/*"]
 
         with open('./tmp/mutation/.dextool_mutate.toml', "w", encoding='utf-8') as file:
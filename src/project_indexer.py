@@ -0,0 +1,202 @@
+"""
+This module provides a utility to index all files of a project at once. Every translation unit
+of the compile database is parsed with its own compile flags in a pool of processes, and the
+functions that can be fuzzed as well as the variables of main that can be made symbolic for
+KLEE are stored in the target catalog, together with their parameter types, input sizes and
+complexity metrics. Files that did not change since the last index are not parsed again.
+
+Classes:
+    - ProjectIndexer(object)
+
+Functions:
+    - index_file(entry)
+    - cyclomatic_complexity(node)
+"""
+
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+import clang.cindex
+
+from target_catalog import TargetCatalog
+from utils.compile_db import load_compile_db
+from utils.misc import binary_operator
+from utils.tu_cache import parse_translation_unit
+
+# statements that add a path through a function
+DECISION_KINDS = [clang.cindex.CursorKind.IF_STMT,
+                  clang.cindex.CursorKind.FOR_STMT,
+                  clang.cindex.CursorKind.CXX_FOR_RANGE_STMT,
+                  clang.cindex.CursorKind.WHILE_STMT,
+                  clang.cindex.CursorKind.DO_STMT,
+                  clang.cindex.CursorKind.CASE_STMT,
+                  clang.cindex.CursorKind.CONDITIONAL_OPERATOR,
+                  clang.cindex.CursorKind.CXX_CATCH_STMT]
+
+# parameter kinds for which FuzzHandler.gen_target_call() can generate a fuzz target
+FUZZABLE_PARAM_KINDS = ['int', 'short', 'long', 'float', 'double', 'bool', 'constantarray']
+
+
+def cyclomatic_complexity(node) -> int:
+    """
+    Returns the cyclomatic complexity of a function: one plus the number of decisions, where
+    every && and || counts as a decision of its own.
+    """
+    decisions = 0
+    for child in node.walk_preorder():
+        if child.kind in DECISION_KINDS:
+            decisions += 1
+        elif child.kind == clang.cindex.CursorKind.BINARY_OPERATOR and \
+                binary_operator(child) in ['&&', '||']:
+            decisions += 1
+    return decisions + 1
+
+
+def _type_bytes(clang_type) -> int:
+    """
+    Returns the size of a type in bytes, or 0 if the type has no size, e.g. a reference.
+    """
+    size = clang_type.get_size()
+    return size if size > 0 else 0
+
+
+def _function_target(node) -> dict:
+    """
+    Returns the target of a function definition.
+    """
+    params = [child for child in node.get_children()
+              if child.kind == clang.cindex.CursorKind.PARM_DECL]
+    kinds = [str(param.type.kind)[str(param.type.kind).index('.') + 1:].lower()
+             for param in params]
+    statements = sum(1 for child in node.walk_preorder() if child.kind.is_statement())
+    return {
+        'kind': 'function',
+        'line': node.location.line,
+        'name': node.spelling,
+        'type': node.type.spelling,
+        'param_count': len(params),
+        'input_bytes': sum(_type_bytes(param.type) for param in params),
+        'cyclomatic': cyclomatic_complexity(node),
+        'statements': statements,
+        'fuzzable': int(bool(params) and all(kind in FUZZABLE_PARAM_KINDS for kind in kinds)),
+        'params': [{'name': param.spelling, 'type': param.type.spelling,
+                    'bytes': _type_bytes(param.type)} for param in params],
+    }
+
+
+def _variable_target(node) -> dict:
+    """
+    Returns the target of a variable declared in main.
+    """
+    return {
+        'kind': 'variable',
+        'line': node.extent.start.line,
+        'name': node.spelling,
+        'type': node.type.spelling,
+        'param_count': 0,
+        'input_bytes': _type_bytes(node.type),
+        'cyclomatic': 0,
+        'statements': 0,
+        'fuzzable': 0,
+        'params': [],
+    }
+
+
+def index_file(entry : dict) -> tuple:
+    """
+    Parses one file of the compile database and collects its targets. The function runs in
+    the worker processes of the ProjectIndexer.
+
+    Parameters:
+        entry (dict): compile command with the path of the file ('file') and the arguments to
+        parse it with ('args'), see utils.compile_db.load_compile_db()
+
+    Returns:
+        file (str): path of the file
+        targets (list): one dictionary per function definition and variable of main
+    """
+    translation_unit = parse_translation_unit(entry['file'], entry['args'])
+    main_file = str(translation_unit.spelling)
+
+    targets = []
+    for node in translation_unit.cursor.walk_preorder():
+        if node.location.file is None or str(node.location.file) != main_file:
+            continue
+        if node.kind == clang.cindex.CursorKind.FUNCTION_DECL and node.is_definition() and \
+                node.spelling != 'main':
+            targets.append(_function_target(node))
+        elif (node.kind == clang.cindex.CursorKind.VAR_DECL and
+              node.semantic_parent.kind == clang.cindex.CursorKind.FUNCTION_DECL and
+              node.semantic_parent.spelling == 'main'):
+            targets.append(_variable_target(node))
+    return entry['file'], targets
+
+
+class ProjectIndexer:
+    """
+    Class that indexes the targets of all files of a compile database in parallel.
+    """
+
+    def __init__(self, path_compile_db : str, workers : int = None,
+                 catalog : TargetCatalog = None):
+        """
+        Constructor of the ProjectIndexer class.
+
+        Parameters:
+            path_compile_db (str): path of the compile_commands.json of the project
+            workers (int): number of processes that parse files, by default the number of CPUs
+            catalog (TargetCatalog): catalog the targets are stored in
+        """
+        self.path_compile_db = path_compile_db
+        self.workers = workers or os.cpu_count()
+        self.catalog = catalog if catalog is not None else TargetCatalog()
+        self.entries = [entry for entry in load_compile_db(path_compile_db)
+                        if os.path.exists(entry['file'])]
+
+    def run(self) -> list:
+        """
+        Indexes every file of the compile database that is not indexed with its current
+        content and flags yet.
+
+        Returns:
+            parsed (list): paths of the files that were parsed
+        """
+        outdated = [entry for entry in self.entries
+                    if not self.catalog.has_targets(entry['file'], entry['args'])]
+        if not outdated:
+            return []
+
+        args = {entry['file']: entry['args'] for entry in outdated}
+        with ProcessPoolExecutor(max_workers=self.workers) as executor:
+            for file_path, targets in executor.map(index_file, outdated):
+                self.catalog.store_targets(file_path, targets, args[file_path])
+
+        return [entry['file'] for entry in outdated]
+
+    def query(self, **conditions) -> list:
+        """
+        Returns the targets of the files of the compile database, see
+        TargetCatalog.query_targets() for the conditions.
+        """
+        file_keys = [self.catalog.file_key(entry['file'], entry['args'])
+                     for entry in self.entries]
+        return self.catalog.query_targets(file_keys, **conditions)
+
+    @staticmethod
+    def summary(targets : list, limit : int = 20) -> str:
+        """
+        Returns a human readable table of the most complex targets.
+        """
+        functions = [target for target in targets if target['kind'] == 'function']
+        variables = [target for target in targets if target['kind'] == 'variable']
+        lines = [f'{len(functions)} function(s), '
+                 f'{sum(target["fuzzable"] for target in functions)} fuzzable, and '
+                 f'{len(variables)} symbolic candidate(s) in main']
+        for target in functions[:limit]:
+            params = ', '.join(f'{param["type"]} ({param["bytes"]}B)'
+                               for param in target['params'])
+            lines.append(f'{"fuzzable" if target["fuzzable"] else "        "} '
+                         f'cc {target["cyclomatic"]:>3} stmts {target["statements"]:>4} '
+                         f'{os.path.basename(target["path"])}:{target["line"]} '
+                         f'{target["name"]}({params})')
+        return '\n'.join(lines)
@@ -0,0 +1,144 @@
+"""
+This module provides the sanitizer configurations a fuzzing binary can be built with, and a
+utility to fuzz one target with several of these configurations in one container session. The
+binaries are built in parallel and fuzzed in parallel on a shared corpus. The crashes of every
+build are stored as crash-<config>-<artifact> in the mount folder, such that the crashes of all
+builds are replayed with the right binary and end up in a single crash report.
+
+Classes:
+    - SanitizerCampaign(object)
+
+Functions:
+    - replay_commands(binary)
+"""
+
+import os
+
+from consept_vars import FOLDER_FUZZ_CORPUS
+
+# sanitizers and additional compiler flags per configuration, UBSan traps on the first error
+# such that undefined behaviour ends the run like any other crash
+SANITIZER_CONFIGS = {
+    'asan': {'sanitizers': 'address,fuzzer', 'flags': None},
+    'msan': {'sanitizers': 'memory,fuzzer', 'flags': None},
+    'ubsan': {'sanitizers': 'undefined,fuzzer', 'flags': '-fsanitize-trap=undefined'},
+    'asan_ubsan': {'sanitizers': 'address,undefined,fuzzer',
+                   'flags': '-fsanitize-trap=undefined'},
+}
+
+# folder (inside the fuzzing mount folder) in which every build writes its artifacts
+FOLDER_NAME_ARTIFACTS = 'artifacts'
+
+
+def replay_commands(binary : str) -> list:
+    """
+    Returns the commands that replay every crash in the mount folder and store the sanitizer
+    report of crash-<name> as crash-<name>.log. Crashes of a sanitizer configuration are
+    replayed with the binary of that configuration.
+
+    Parameters:
+        binary (str): fuzzing binary used for crashes that do not belong to a configuration
+
+    Returns:
+        commands (list): the commands to add to the script of the fuzzing container
+    """
+    commands = ['for crash in tmp/fuzz/crash-*; do',
+                '    [ -f "$crash" ] || continue',
+                '    case "$crash" in *.log) continue;; esac',
+                f'    build=tmp/fuzz/{binary}',
+                '    case "$crash" in']
+    for config in SANITIZER_CONFIGS:
+        commands.append(f'        tmp/fuzz/crash-{config}-*) build=tmp/fuzz/fuzz_{config};;')
+    commands += ['    esac',
+                 '    $build "$crash" > "$crash.log" 2>&1',
+                 'done']
+    return commands
+
+
+class SanitizerCampaign:
+    """
+    Class that fuzzes one target with several sanitizer configurations at once.
+    """
+
+    def __init__(self, fuzz_handler, configs : list):
+        """
+        Constructor of the SanitizerCampaign class.
+
+        Parameters:
+            fuzz_handler (FuzzHandler): handler to whose script the commands are added
+            configs (list): names of the sanitizer configurations, see SANITIZER_CONFIGS
+        """
+        for config in configs:
+            assert config in SANITIZER_CONFIGS, f'Sanitizer configuration not recognized ' \
+                f'({config}), should be one of {list(SANITIZER_CONFIGS)}'
+
+        self.fuzz_handler = fuzz_handler
+        self.configs = configs
+
+    def add_build_commands(self, tuut):
+        """
+        Adds the commands that compile a fuzzing binary fuzz_<config> per configuration.
+        The compilers run in parallel, the script continues once all of them have finished.
+
+        Parameters:
+            tuut (TuutFile): To be tested file abstraction
+
+        Returns:
+            None
+        """
+        for config in self.configs:
+            self.fuzz_handler.add_compile_command(
+                tuut, SANITIZER_CONFIGS[config]['sanitizers'], f'fuzz_{config}',
+                SANITIZER_CONFIGS[config]['flags'], background=True)
+        self.fuzz_handler.add_command('wait')
+
+    def add_fuzz_commands(self, time_limit : int):
+        """
+        Adds the commands that fuzz all builds in parallel on the shared corpus. Crashes do
+        not stop a build, and its artifacts are moved to crash-<config>-<artifact> once all
+        builds have finished.
+
+        Parameters:
+            time_limit (int): number of seconds every build is allowed to run
+
+        Returns:
+            None
+        """
+        folders = ' '.join(f'tmp/fuzz/{FOLDER_NAME_ARTIFACTS}/{config}' for config in self.configs)
+        self.fuzz_handler.add_command(f'mkdir -p {FOLDER_FUZZ_CORPUS} {folders}')
+
+        for config in self.configs:
+            # the last -artifact_prefix on the command line is the one libFuzzer uses
+            self.fuzz_handler.add_command(
+                f'{self.fuzz_handler.fuzz_command(f"fuzz_{config}")} '
+                f'-artifact_prefix=/home/consept/tmp/fuzz/{FOLDER_NAME_ARTIFACTS}/{config}/ '
+                f'-fork=1 -ignore_crashes=1 -max_total_time={time_limit} {FOLDER_FUZZ_CORPUS} '
+                f'2>&1 | tee tmp/fuzz/fuzz_{config}.log &')
+        self.fuzz_handler.add_command('wait')
+
+        for config in self.configs:
+            self.fuzz_handler.add_command(
+                f'for artifact in tmp/fuzz/{FOLDER_NAME_ARTIFACTS}/{config}/*; do '
+                f'[ -f "$artifact" ] && mv "$artifact" '
+                f'tmp/fuzz/crash-{config}-$(basename "$artifact"); done')
+
+    def count_crashes(self) -> dict:
+        """
+        Returns the number of crash files per configuration.
+        """
+        names = [name for name in self.fuzz_handler.mount_files if not name.endswith('.log')]
+        return {config: len([name for name in names if name.startswith(f'crash-{config}-')])
+                for config in self.configs}
+
+    def summary(self) -> str:
+        """
+        Returns a human readable summary of the crashes found by every configuration.
+        """
+        crashes = self.count_crashes()
+        lines = ['\n ========= SANITIZER RESULTS =========',
+                 f'{sum(crashes.values())} crash(es) found by {len(self.configs)} build(s)']
+        for config in self.configs:
+            lines.append(f'{config} ({SANITIZER_CONFIGS[config]["sanitizers"]}): '
+                         f'{crashes[config]} crash(es), log in '
+                         f'{os.path.join("tmp", "fuzz", f"fuzz_{config}.log")}')
+        return '\n'.join(lines)
@@ -0,0 +1,230 @@
+"""
+This module provides the automatic selection of the variables of main that are worth making
+symbolic for KLEE. Only the values that decide which path is taken multiply the paths KLEE
+explores, so a def-use analysis over the AST selects the variables that flow into branch
+conditions (if, while, do, for, switch and ?:), loop bounds and array indices, either directly,
+through assignments, or as arguments of functions of the file in which they do so. Loop
+counters, which the header of their for loop initialises from a constant or a value local to
+the loop, are left out of the header of that loop, and outputs are left out.
+
+Classes:
+    - BranchVariableSelector(object)
+
+Functions:
+    - symbolic_bits(sizes, rows)
+"""
+
+import clang.cindex
+
+from utils.misc import binary_operator
+from utils.tu_cache import parse_translation_unit
+
+# statements whose condition decides the path, and the position of the condition among the
+# children of the statement
+CONDITION_POSITIONS = {clang.cindex.CursorKind.IF_STMT: 0,
+                       clang.cindex.CursorKind.WHILE_STMT: 0,
+                       clang.cindex.CursorKind.SWITCH_STMT: 0,
+                       clang.cindex.CursorKind.CONDITIONAL_OPERATOR: 0,
+                       clang.cindex.CursorKind.DO_STMT: -1}
+
+# declarations of which the value can be made symbolic
+VARIABLE_KINDS = [clang.cindex.CursorKind.VAR_DECL, clang.cindex.CursorKind.PARM_DECL]
+
+
+def symbolic_bits(sizes : dict, rows : list) -> int:
+    """
+    Returns the number of symbolic input bits when the variables at the given rows are made
+    symbolic, every bit doubles the input space KLEE has to cover.
+
+    Parameters:
+        sizes (dict): size in bytes of the variable declared at a row
+        rows (list): rows of the symbolic variables
+
+    Returns:
+        bits (int): the number of symbolic bits
+    """
+    return sum(8 * sizes.get(row, 0) for row in rows)
+
+
+class BranchVariableSelector:
+    """
+    Class that selects the branch relevant variables of main through def-use analysis.
+    """
+
+    def __init__(self, file_path : str):
+        """
+        Constructor of the BranchVariableSelector class.
+
+        Parameters:
+            file_path (str): path of the file to be tested
+        """
+        translation_unit = parse_translation_unit(file_path)
+        main_file = str(translation_unit.spelling)
+
+        # definitions of the functions of the file, by name
+        self.functions = {node.spelling: node for node in translation_unit.cursor.get_children()
+                          if node.kind == clang.cindex.CursorKind.FUNCTION_DECL and
+                          node.is_definition() and node.location.file is not None and
+                          str(node.location.file) == main_file}
+
+        # positions of the relevant parameters per function, computed on first use
+        self.relevant_params = {}
+
+    @staticmethod
+    def _references(node) -> list:
+        """
+        Returns the declarations of the variables that an expression refers to.
+        """
+        return [child.referenced for child in node.walk_preorder()
+                if child.kind == clang.cindex.CursorKind.DECL_REF_EXPR and
+                child.referenced is not None and child.referenced.kind in VARIABLE_KINDS]
+
+    def _for_header(self, node) -> list:
+        """
+        Returns the variables used in the header of a for loop, without its loop counters, i.e.
+        the variables that the init statement of the header declares or assigns from a constant
+        or from a value local to the loop. Variables the header only modifies, such as the
+        bound n of for (; n > 0; n--), are read before they are modified and are kept.
+        """
+        header = list(node.get_children())[:-1]
+
+        # the init statement ends at the first semicolon of the header, a declaration includes it
+        end_init = next((token.extent.end.offset for token in node.get_tokens()
+                         if token.spelling == ';'), -1)
+        local, counters = [], []
+        for child in header:
+            if child.extent.end.offset > end_init:
+                continue
+            for part in child.walk_preorder():
+                if part.kind == clang.cindex.CursorKind.VAR_DECL:
+                    local.append(part)
+                    sources = [source for source in part.get_children()
+                               if source.kind.is_expression()]
+                    if all(ref in local for source in sources
+                           for ref in self._references(source)):
+                        counters.append(part)
+                elif part.kind == clang.cindex.CursorKind.BINARY_OPERATOR and \
+                        binary_operator(part) == '=':
+                    target, source = list(part.get_children())
+                    if all(ref in local for ref in self._references(source)):
+                        counters += self._references(target)[:1]
+        return [ref for child in header for ref in self._references(child)
+                if ref not in counters]
+
+    def _seeds_and_flows(self, function) -> tuple:
+        """
+        Returns the variables of a function that are used where they decide the path, and the
+        flows of values between its variables: every assigned variable maps to the variables
+        its value is computed from.
+        """
+        seeds, flows = [], {}
+        for node in function.walk_preorder():
+            if node.kind in CONDITION_POSITIONS:
+                children = list(node.get_children())
+                seeds += self._references(children[CONDITION_POSITIONS[node.kind]])
+            elif node.kind == clang.cindex.CursorKind.FOR_STMT:
+                seeds += self._for_header(node)
+            elif node.kind == clang.cindex.CursorKind.ARRAY_SUBSCRIPT_EXPR:
+                seeds += self._references(list(node.get_children())[-1])
+            elif node.kind == clang.cindex.CursorKind.CALL_EXPR:
+                seeds += self._call_seeds(node)
+
+            # definitions with an initial value and (compound) assignments
+            if node.kind == clang.cindex.CursorKind.VAR_DECL:
+                sources = [child for child in node.get_children() if child.kind.is_expression()]
+                flows.setdefault(node, []).extend(
+                    ref for source in sources for ref in self._references(source))
+            elif node.kind in [clang.cindex.CursorKind.BINARY_OPERATOR,
+                               clang.cindex.CursorKind.COMPOUND_ASSIGNMENT_OPERATOR] and \
+                    binary_operator(node) in ['=', '+=', '-=', '*=', '/=', '%=', '<<=', '>>=',
+                                              '&=', '|=', '^=']:
+                target, source = list(node.get_children())
+                for assigned in self._references(target)[:1]:
+                    flows.setdefault(assigned, []).extend(self._references(source))
+        return seeds, flows
+
+    def _call_seeds(self, call) -> list:
+        """
+        Returns the variables passed to a function of the file as arguments of parameters that
+        are relevant within that function.
+        """
+        if call.spelling not in self.functions:
+            return []
+        relevant = self._relevant_params(call.spelling)
+        arguments = list(call.get_arguments())
+        return [ref for position in relevant if position < len(arguments)
+                for ref in self._references(arguments[position])]
+
+    def _relevant_params(self, name : str) -> list:
+        """
+        Returns the positions of the parameters of a function of the file that are relevant
+        within that function. Recursive calls see the parameters as not relevant.
+        """
+        if name not in self.relevant_params:
+            self.relevant_params[name] = []
+            function = self.functions[name]
+            relevant = self.relevant(function)
+            self.relevant_params[name] = [position for position, argument
+                                          in enumerate(function.get_arguments())
+                                          if argument in relevant]
+        return self.relevant_params[name]
+
+    def relevant(self, function) -> set:
+        """
+        Returns the relevant variables of a function: those that decide the path and, through
+        assignments, the variables their values are computed from.
+
+        Parameters:
+            function (clang.cindex.Cursor): definition of the function
+
+        Returns:
+            relevant (set): declarations of the relevant variables
+        """
+        seeds, flows = self._seeds_and_flows(function)
+        relevant = set()
+        while seeds:
+            variable = seeds.pop()
+            if variable not in relevant:
+                relevant.add(variable)
+                seeds += flows.get(variable, [])
+        return relevant
+
+    def select(self, unique_dict : dict) -> list:
+        """
+        Returns the rows of the variables of main that are relevant.
+
+        Parameters:
+            unique_dict (dict): declaration line and variable correspondence of main
+
+        Returns:
+            rows (list): rows of the variables to make symbolic, in the order of unique_dict
+        """
+        if 'main' not in self.functions:
+            return []
+        relevant = {(variable.extent.start.line, variable.spelling)
+                    for variable in self.relevant(self.functions['main'])}
+        return [row for row, name in unique_dict.items() if (row, name) in relevant]
+
+    def sizes(self) -> dict:
+        """
+        Returns the size in bytes of the variables of main, by row.
+        """
+        if 'main' not in self.functions:
+            return {}
+        return {node.extent.start.line: max(node.type.get_size(), 0)
+                for node in self.functions['main'].walk_preorder()
+                if node.kind == clang.cindex.CursorKind.VAR_DECL}
+
+    def summary(self, unique_dict : dict, rows : list) -> str:
+        """
+        Returns a human readable summary of the selection and of the symbolic input bits it
+        saves compared to making all variables symbolic.
+        """
+        sizes = self.sizes()
+        all_bits = symbolic_bits(sizes, unique_dict)
+        selected_bits = symbolic_bits(sizes, rows)
+        names = ', '.join(unique_dict[row] for row in rows) or 'none'
+        return (f'Branch relevant variables: {names}\n'
+                f'{len(rows)} of {len(unique_dict)} variable(s) symbolic, '
+                f'{selected_bits} instead of {all_bits} symbolic bits, the search space is '
+                f'reduced by a factor 2^{all_bits - selected_bits}')
@@ -0,0 +1,277 @@
+"""
+This module provides a persistent catalog of the functions, their parameters and the variables
+of main that can be annotated for KLEE, per file to be tested. Files are keyed by their path,
+the hash of their content and the compile flags they were parsed with, such that repeated runs
+on unchanged files do not parse them again, and files with the same content at different
+paths, e.g. copies in several directories, keep their own rows and report their own path.
+The catalog also holds the targets of the project index, i.e. the fuzzable functions and
+symbolic candidates of all files of a project with their metrics, which can be queried
+across files.
+
+Classes:
+    - TargetCatalog(object)
+"""
+
+import hashlib
+import os
+import sqlite3
+
+from consept_vars import PATH_CATALOG
+
+# version of the schema, a catalog with another version is rebuilt
+SCHEMA_VERSION = 3
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS files (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL,
+    content_hash TEXT NOT NULL,
+    flags TEXT NOT NULL,
+    functions_indexed INTEGER NOT NULL DEFAULT 0,
+    variables_indexed INTEGER NOT NULL DEFAULT 0,
+    targets_indexed INTEGER NOT NULL DEFAULT 0,
+    UNIQUE (path, content_hash, flags)
+);
+CREATE TABLE IF NOT EXISTS functions (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    line INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    signature TEXT NOT NULL,
+    param_count INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS params (
+    function_id INTEGER NOT NULL REFERENCES functions(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    kind TEXT NOT NULL,
+    element_type TEXT NOT NULL,
+    array_size INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS variables (
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    line INTEGER NOT NULL,
+    name TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS targets (
+    id INTEGER PRIMARY KEY,
+    file_id INTEGER NOT NULL REFERENCES files(id) ON DELETE CASCADE,
+    kind TEXT NOT NULL,
+    line INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    param_count INTEGER NOT NULL,
+    input_bytes INTEGER NOT NULL,
+    cyclomatic INTEGER NOT NULL,
+    statements INTEGER NOT NULL,
+    fuzzable INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS target_params (
+    target_id INTEGER NOT NULL REFERENCES targets(id) ON DELETE CASCADE,
+    position INTEGER NOT NULL,
+    name TEXT NOT NULL,
+    type TEXT NOT NULL,
+    bytes INTEGER NOT NULL
+);
+'''
+
+# columns of a target as returned by query_targets()
+TARGET_COLUMNS = ['path', 'kind', 'line', 'name', 'type', 'param_count', 'input_bytes',
+                  'cyclomatic', 'statements', 'fuzzable']
+
+
+class TargetCatalog:
+    """
+    Class that stores the fuzzing targets and symbolic candidates of files in SQLite.
+    """
+
+    def __init__(self, path_catalog : str = PATH_CATALOG):
+        """
+        Constructor of the TargetCatalog class. The catalog is created if it does not exist.
+
+        Parameters:
+            path_catalog (str): path of the SQLite database
+        """
+        self.path_catalog = path_catalog
+        os.makedirs(os.path.dirname(os.path.abspath(path_catalog)), exist_ok=True)
+        self.connection = sqlite3.connect(path_catalog)
+
+        # the catalog only holds data derived from the files, so an outdated one is rebuilt
+        if self.connection.execute('PRAGMA user_version').fetchone()[0] != SCHEMA_VERSION:
+            tables = self.connection.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+            for (table,) in tables:
+                self.connection.execute(f'DROP TABLE {table}')
+            self.connection.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
+        self.connection.execute('PRAGMA foreign_keys = ON')
+        self.connection.executescript(SCHEMA)
+
+    @staticmethod
+    def file_key(file_path : str, flags : list = None) -> tuple:
+        """
+        Returns the key of a file: its absolute path, the SHA-1 of its content and its compile
+        flags.
+        """
+        with open(file_path, 'rb') as file:
+            content_hash = hashlib.sha1(file.read()).hexdigest()
+        return os.path.abspath(file_path), content_hash, ' '.join(flags or [])
+
+    def _file_id(self, file_path : str, flags : list, column : str = None) -> int:
+        """
+        Returns the id of the row of a file, or None if there is no row. If a column is given,
+        only a row for which that column is set counts.
+        """
+        query = 'SELECT id FROM files WHERE path = ? AND content_hash = ? AND flags = ?'
+        if column is not None:
+            query += f' AND {column} = 1'
+        row = self.connection.execute(query, self.file_key(file_path, flags)).fetchone()
+        return None if row is None else row[0]
+
+    def _ensure_file(self, file_path : str, flags : list) -> int:
+        """
+        Returns the id of the row of a file, adding the row if it does not exist yet.
+        """
+        self.connection.execute(
+            'INSERT OR IGNORE INTO files (path, content_hash, flags) VALUES (?, ?, ?)',
+            self.file_key(file_path, flags))
+        return self._file_id(file_path, flags)
+
+    def load_functions(self, file_path : str, flags : list = None) -> tuple:
+        """
+        Returns the function dictionary and the function details of a file, in the format of
+        TuutFile.func_dict and TuutFile.func_details, or None if the file is not in the catalog.
+        """
+        file_id = self._file_id(file_path, flags, 'functions_indexed')
+        if file_id is None:
+            return None
+
+        func_dict = {}
+        func_details = {}
+        functions = self.connection.execute(
+            'SELECT id, line, name, signature, param_count FROM functions '
+            'WHERE file_id = ? ORDER BY id', (file_id,)).fetchall()
+        for function_id, line, name, signature, param_count in functions:
+            params = self.connection.execute(
+                'SELECT kind, element_type, array_size FROM params '
+                'WHERE function_id = ? ORDER BY position', (function_id,)).fetchall()
+            func_dict[line] = signature
+            func_details[line] = [name, param_count, [list(param) for param in params]]
+        return func_dict, func_details
+
+    def store_functions(self, file_path : str, func_dict : dict, func_details : dict,
+                        flags : list = None) -> None:
+        """
+        Stores the function dictionary and the function details of a file, replacing the
+        functions stored for the same path, content and flags before.
+        """
+        with self.connection:
+            file_id = self._ensure_file(file_path, flags)
+            self.connection.execute('DELETE FROM functions WHERE file_id = ?', (file_id,))
+            for line, (name, param_count, params) in func_details.items():
+                cursor = self.connection.execute(
+                    'INSERT INTO functions (file_id, line, name, signature, param_count) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    (file_id, line, name, func_dict[line], param_count))
+                self.connection.executemany(
+                    'INSERT INTO params (function_id, position, kind, element_type, array_size) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(cursor.lastrowid, position, *param) for position, param in enumerate(params)])
+            self.connection.execute('UPDATE files SET functions_indexed = 1 WHERE id = ?',
+                                    (file_id,))
+
+    def load_variables(self, file_path : str, flags : list = None) -> list:
+        """
+        Returns the (line, name) pairs of the variables declared in main of a file, in the
+        order of the source, or None if the file is not in the catalog.
+        """
+        file_id = self._file_id(file_path, flags, 'variables_indexed')
+        if file_id is None:
+            return None
+        return [tuple(row) for row in self.connection.execute(
+            'SELECT line, name FROM variables WHERE file_id = ? ORDER BY position', (file_id,))]
+
+    def store_variables(self, file_path : str, variables : list, flags : list = None) -> None:
+        """
+        Stores the (line, name) pairs of the variables declared in main of a file.
+        """
+        with self.connection:
+            file_id = self._ensure_file(file_path, flags)
+            self.connection.execute('DELETE FROM variables WHERE file_id = ?', (file_id,))
+            self.connection.executemany(
+                'INSERT INTO variables (file_id, position, line, name) VALUES (?, ?, ?, ?)',
+                [(file_id, position, line, name)
+                 for position, (line, name) in enumerate(variables)])
+            self.connection.execute('UPDATE files SET variables_indexed = 1 WHERE id = ?',
+                                    (file_id,))
+
+    def has_targets(self, file_path : str, flags : list = None) -> bool:
+        """
+        Returns whether the targets of a file with this path, content and flags are indexed.
+        """
+        return self._file_id(file_path, flags, 'targets_indexed') is not None
+
+    def store_targets(self, file_path : str, targets : list, flags : list = None) -> None:
+        """
+        Stores the targets of a file, as generated by project_indexer.index_file().
+        """
+        with self.connection:
+            file_id = self._ensure_file(file_path, flags)
+            self.connection.execute('DELETE FROM targets WHERE file_id = ?', (file_id,))
+            for target in targets:
+                cursor = self.connection.execute(
+                    f'INSERT INTO targets (file_id, {", ".join(TARGET_COLUMNS[1:])}) '
+                    f'VALUES (?{", ?" * (len(TARGET_COLUMNS) - 1)})',
+                    [file_id] + [target[column] for column in TARGET_COLUMNS[1:]])
+                self.connection.executemany(
+                    'INSERT INTO target_params (target_id, position, name, type, bytes) '
+                    'VALUES (?, ?, ?, ?, ?)',
+                    [(cursor.lastrowid, position, param['name'], param['type'], param['bytes'])
+                     for position, param in enumerate(target['params'])])
+            self.connection.execute('UPDATE files SET targets_indexed = 1 WHERE id = ?',
+                                    (file_id,))
+
+    def query_targets(self, file_keys : list, kind : str = None, fuzzable : bool = None,
+                      min_cyclomatic : int = 0) -> list:
+        """
+        Returns the targets of the given files, ordered by decreasing cyclomatic complexity.
+
+        Parameters:
+            file_keys (list): keys of the files, as returned by file_key()
+            kind (str): only targets of this kind, 'function' or 'variable'
+            fuzzable (bool): only targets that can (True) or can not (False) be fuzzed
+            min_cyclomatic (int): only targets with at least this cyclomatic complexity
+
+        Returns:
+            targets (list): one dictionary per target with its columns and parameters
+        """
+        conditions = ['cyclomatic >= ?']
+        values = [min_cyclomatic]
+        if kind is not None:
+            conditions.append('kind = ?')
+            values.append(kind)
+        if fuzzable is not None:
+            conditions.append('fuzzable = ?')
+            values.append(int(fuzzable))
+
+        targets = []
+        query = (f'SELECT targets.id, files.path, {", ".join(TARGET_COLUMNS[1:])} FROM targets '
+                 'JOIN files ON files.id = targets.file_id '
+                 'WHERE files.path = ? AND content_hash = ? AND flags = ? AND '
+                 + ' AND '.join(conditions))
+        for file_key in file_keys:
+            for row in self.connection.execute(query, list(file_key) + values).fetchall():
+                target = dict(zip(TARGET_COLUMNS, row[1:]))
+                target['params'] = [dict(zip(['name', 'type', 'bytes'], param))
+                                    for param in self.connection.execute(
+                                        'SELECT name, type, bytes FROM target_params '
+                                        'WHERE target_id = ? ORDER BY position', (row[0],))]
+                targets.append(target)
+        return sorted(targets, key=lambda target: (-target['cyclomatic'], target['path'],
+                                                   target['line']))
+
+    def close(self) -> None:
+        """
+        Closes the connection to the catalog.
+        """
+        self.connection.close()
@@ -68,12 +68,16 @@ class ToolHandler:
         # Initialize the path to the current script
         self.path_cur_script = None
 
-    def run_tool(self, command, user_project_path=None) -> None:
+    def run_tool(self, command, user_project_path=None, output_callback=None,
+                 **container_options) -> None:
         """
         This function runs the container corresponding to this tool with a
-        specific command.
+        specific command. The optional output_callback receives the output of the
+        container chunk by chunk while it is running, the container_options are passed on
+        to ApplicationManager.start_container().
         """
-        self.app_man.run_container(self.tool, command, user_project_path)
+        self.app_man.run_container(self.tool, command, user_project_path,
+                                   output_callback=output_callback, **container_options)
 
     @property
     def path_mount_folder(self) -> str:
@@ -117,13 +121,15 @@ class ToolHandler:
         except PermissionError as exception:
             print(f"Error: {exception}. Failed to empty the mount folder.")
 
-    def open_new_script(self) -> None:
+    def open_new_script(self, cur_script_name : str = None) -> None:
         """
-        This container creates a new bash script in the mount folder corresponding to this tool
+        This container creates a new bash script in the mount folder corresponding to this tool.
+        By default the name of the script is derived from the tool and the current time.
         """
 
         # construct the name of the new bash script
-        cur_script_name = self.tool + '_' + datetime.now().strftime('%Y%m%d%H%M') + '.sh'
+        if cur_script_name is None:
+            cur_script_name = self.tool + '_' + datetime.now().strftime('%Y%m%d%H%M') + '.sh'
 
         # define the path at which the new bash script will be stored
         self.path_cur_script = os.path.join(
@@ -165,12 +171,12 @@ class ToolHandler:
         with open(self.path_cur_script, "wb") as dest:
             dest.write(buffer)
 
-    def run(self) -> None:
+    def run(self, output_callback=None) -> None:
         """
         This function runs a container of the image corresponding to this tool.
         In this container it runs the current script
         Arguments:
-            None
+            output_callback (callable): optional function that receives the output chunks
         Returns:
             None
         """
@@ -186,4 +192,4 @@ class ToolHandler:
 
         command = f'sh {path_container_script}'
 
-        return self.run_tool(command)
+        return self.run_tool(command, output_callback=output_callback)
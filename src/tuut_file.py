@@ -1,12 +1,91 @@
 """
 A model for TUUT files.
 """
+import hashlib
 import os
-import clang
+import re
+import clang.cindex
 
-from utils.misc import include_lib, find_main_function_range, comment_out
+from utils.misc import find_main_function_range, binary_operator
+from utils.compile_db import compile_args
+from utils.source_rewriter import SourceRewriter
+from utils.tu_cache import parse_translation_unit
+from target_catalog import TargetCatalog
 from consept_vars import PATH_CONSEPT
 
+# parse options of the fast path of gen_func_info, the bodies of functions are not needed
+# to enumerate them and errors in the includes should not stop the parse
+FAST_PARSE_OPTIONS = (clang.cindex.TranslationUnit.PARSE_SKIP_FUNCTION_BODIES |
+                      clang.cindex.TranslationUnit.PARSE_INCOMPLETE)
+
+# cursors whose children are declarations at file scope
+DECLARATION_CONTAINERS = [clang.cindex.CursorKind.NAMESPACE,
+                          clang.cindex.CursorKind.LINKAGE_SPEC,
+                          clang.cindex.CursorKind.UNEXPOSED_DECL]
+
+# libraries the fuzz target needs
+FUZZ_INCLUDES = ['#include <string.h>', '#include <stdint.h>', '#include <stddef.h>']
+
+# operators of which the operands are interesting values for the fuzzer
+COMPARISON_OPERATORS = ['==', '!=', '<', '>', '<=', '>=']
+
+# simple escape sequences of C and C++ character and string literals
+SIMPLE_ESCAPES = {'n': 10, 't': 9, 'r': 13, 'a': 7, 'b': 8, 'f': 12, 'v': 11,
+                  '\\': 92, "'": 39, '"': 34, '?': 63}
+
+
+def literal_to_bytes(spelling : str) -> bytes:
+    """
+    Converts the spelling of a character or string literal, e.g. 'a' or "ab\\n", to the bytes
+    it represents. Encoding prefixes such as L or u8 are ignored.
+    """
+    body = spelling[spelling.index(spelling[-1]) + 1:-1]
+    value = bytearray()
+    index = 0
+    while index < len(body):
+        char = body[index]
+        index += 1
+        if char != '\\' or index == len(body):
+            value += char.encode('utf-8')
+            continue
+
+        # escape sequences: hexadecimal, octal or a single character
+        escape = body[index]
+        if escape == 'x':
+            digits = re.match(r'[0-9a-fA-F]+', body[index + 1:])
+            value.append(int(digits.group(0), 16) % 256 if digits else ord('x'))
+            index += 1 + (len(digits.group(0)) if digits else 0)
+        elif escape in '01234567':
+            digits = re.match(r'[0-7]{1,3}', body[index:]).group(0)
+            value.append(int(digits, 8) % 256)
+            index += len(digits)
+        else:
+            value += bytes([SIMPLE_ESCAPES[escape]]) if escape in SIMPLE_ESCAPES \
+                else escape.encode('utf-8')
+            index += 1
+    return bytes(value)
+
+
+def integer_to_entries(value : int) -> list:
+    """
+    Returns the little-endian encodings of an integer in the widths in which it fits.
+    """
+    entries = []
+    for width in [1, 2, 4, 8]:
+        if -(1 << (8 * width - 1)) <= value < (1 << (8 * width)):
+            entries.append((value % (1 << (8 * width))).to_bytes(width, 'little'))
+    return entries
+
+
+def dict_entry(value : bytes) -> str:
+    """
+    Formats bytes as the quoted value of a libFuzzer dictionary entry.
+    """
+    escaped = ''.join(chr(byte) if 32 <= byte < 127 and chr(byte) not in '"\\'
+                      else f'\\x{byte:02X}' for byte in value)
+    return f'"{escaped}"'
+
+
 # pylint: disable=too-many-nested-blocks
 class TuutFile:
     """
@@ -51,6 +130,12 @@ class TuutFile:
         # dictionary containing the functions and their starting lines
         self.func_dict = None
 
+        # path to the libFuzzer dictionary generated for the fuzzed functions
+        self.path_fuzz_dict = None
+
+        # edits of the annotated file that are collected until write_annotated()
+        self.rewriter = None
+
     def get_file_extension(self):
         """
         Returns the file extension.
@@ -67,22 +152,44 @@ class TuutFile:
         valid_extensions = ['.cpp', '.cc', '.cxx', '.h']
         return self.file_extension in valid_extensions
 
-    def gen_func_info(self):
+    def gen_func_info(self, fast : bool = True, catalog : TargetCatalog = None):
         """
         Function that generates info about the functions in the file that is related to self.
         The function assigns function details (func_details) and function dictionary (func_dict)
         to self. Especially the function dictionary is important for deciding which function can
         be fuzzed by the FuzzHandler.
 
+        By default the file is parsed without function bodies and only the declarations of the
+        file itself are visited, which skips the cursors of all included headers. With fast set
+        to False the whole AST is walked instead.
+        The file is parsed with the arguments of its compile database, if there is one.
+        If a catalog is given, the functions of an unchanged file are taken from the catalog
+        instead of parsing the file, and are stored in the catalog otherwise.
+
         Parameters:
-            None
+            fast (bool): whether to only parse and visit the declarations of the file
+            catalog (TargetCatalog): optional catalog of the functions of earlier runs
 
         Returns:
             None
         """
 
-        index = clang.cindex.Index.create()
-        translation_unit  = index.parse(self.path_file)
+        flags = compile_args(self.path_file)
+        if catalog is not None:
+            cached = catalog.load_functions(self.path_file, flags)
+            if cached is not None:
+                self.func_dict, self.func_details = cached
+                return
+
+        if fast:
+            translation_unit = parse_translation_unit(self.path_file, flags, FAST_PARSE_OPTIONS)
+            nodes = self._main_file_declarations(translation_unit)
+        else:
+            translation_unit = parse_translation_unit(self.path_file, flags)
+            nodes = (node for node in translation_unit.cursor.walk_preorder()
+                     if not node.location.file is None and
+                     "include" not in str(node.location.file) and
+                     not str(node.location.file).endswith(".h"))
 
         func_decl_lines = []
         functions = []
@@ -90,26 +197,84 @@ class TuutFile:
 
         #traverse AST and create 2 dictionaries with the function details:
         #line -> func ; line -> [func name, # params]
-        for node in translation_unit.cursor.walk_preorder():
-            if not node.location.file is None and "include" not in str(node.location.file):
-                if not str(node.location.file).endswith(".h"):
-                    if (node.kind == clang.cindex.CursorKind.FUNCTION_DECL and
-                        node.spelling != "main"):
-                        func_decl_lines.append(node.location.line)
-                        functions.append(node.spelling + " " + node.type.spelling)
-                        param_count = 0
-                        params = []
-                        for child in node.get_children():
-                            if child.kind == clang.cindex.CursorKind.PARM_DECL:
-                                #append type of param and type of array if necessary
-                                child_type = str(child.type.kind)
-                                params.append([child_type[child_type.index(".") + 1:].lower(),
-                                                child.type.get_array_element_type().spelling,
-                                                child.type.get_array_size()])
-                                param_count += 1
-                        self.func_details[node.location.line] = [node.spelling, param_count, params]
+        for node in nodes:
+            if (node.kind == clang.cindex.CursorKind.FUNCTION_DECL and
+                node.spelling != "main"):
+                func_decl_lines.append(node.location.line)
+                functions.append(node.spelling + " " + node.type.spelling)
+                param_count = 0
+                params = []
+                for child in node.get_children():
+                    if child.kind == clang.cindex.CursorKind.PARM_DECL:
+                        #append type of param and type of array if necessary
+                        child_type = str(child.type.kind)
+                        params.append([child_type[child_type.index(".") + 1:].lower(),
+                                        child.type.get_array_element_type().spelling,
+                                        child.type.get_array_size()])
+                        param_count += 1
+                self.func_details[node.location.line] = [node.spelling, param_count, params]
         self.func_dict = dict(zip(func_decl_lines, functions))
 
+        if catalog is not None:
+            catalog.store_functions(self.path_file, self.func_dict, self.func_details, flags)
+
+    @staticmethod
+    def _main_file_declarations(translation_unit):
+        """
+        Yields the declarations of the parsed file itself in the order of the source, descending
+        into namespaces and extern "C" blocks but not into the included headers.
+        """
+        main_file = str(translation_unit.spelling)
+        stack = list(reversed(list(translation_unit.cursor.get_children())))
+        while stack:
+            node = stack.pop()
+            if node.location.file is None or str(node.location.file) != main_file:
+                continue
+            yield node
+            if node.kind in DECLARATION_CONTAINERS:
+                stack += reversed(list(node.get_children()))
+
+    def start_rewrite(self):
+        """
+        Starts collecting the edits of the annotated file, i.e. the fuzz target, the commented
+        out main function and the includes, against the file to be tested. They are applied in
+        a single pass and written at once by write_annotated().
+
+        Returns:
+            None
+        """
+        self.rewriter = SourceRewriter(self.path_file)
+
+    def write_annotated(self) -> str:
+        """
+        Writes the edits collected since start_rewrite() to the annotated file.
+
+        Returns:
+            path_fuzz_annotated (str): path to the annotated file
+        """
+        self.rewriter.write(self.path_fuzz_annotated)
+        self.rewriter = None
+        return self.path_fuzz_annotated
+
+    def rewrite(self, edit, path_source : str = None):
+        """
+        Applies an edit to the annotated file. After start_rewrite() the edit is only
+        collected, otherwise the source is read, edited and written to the annotated file.
+
+        Parameters:
+            edit (function): adds the edits to the SourceRewriter it is called with
+            path_source (str): file the edit applies to, by default the annotated file
+
+        Returns:
+            None
+        """
+        if self.rewriter is not None:
+            edit(self.rewriter)
+            return
+        rewriter = SourceRewriter(path_source or self.path_fuzz_annotated)
+        edit(rewriter)
+        rewriter.write(self.path_fuzz_annotated)
+
     def include_fuzz(self):
         """
         This functions includes libraries related to fuzzing to the file corresponding to self.
@@ -121,13 +286,16 @@ class TuutFile:
             None
         """
 
-        include_lib(self.path_fuzz_annotated, self.path_fuzz_annotated, "#include <string.h>")
-        include_lib(self.path_fuzz_annotated, self.path_fuzz_annotated, "#include <stdint.h>")
-        include_lib(self.path_fuzz_annotated, self.path_fuzz_annotated, "#include <stddef.h>")
+        def add_includes(rewriter):
+            for library in FUZZ_INCLUDES:
+                rewriter.include(library)
+        self.rewrite(add_includes)
 
     def comment_out_main(self):
         """
-        Function which finds out where the main function is and comments it out if it exists
+        Function which finds out where the main function is and comments it out if it exists.
+        The fuzz target is appended to the annotated file, so main is at the same lines as in
+        the file to be tested, whose translation unit is already cached.
 
         Parameters:
             self
@@ -135,9 +303,91 @@ class TuutFile:
         Returns:
             None
         """
-        main = find_main_function_range(self.path_fuzz_annotated)
+        main = find_main_function_range(self.path_file)
         if main[0]:
-            comment_out(self.path_fuzz_annotated, main[1], main[2])
+            self.rewrite(lambda rewriter: rewriter.comment_out(main[1], main[2]))
+
+    def gen_fuzz_dict(self, rows : list) -> str:
+        """
+        Generates a libFuzzer dictionary from the integer, character and string literals in
+        the functions starting at the given rows, as well as from the enum constants they are
+        compared with. The dictionary is cached in the fuzzing mount folder and only
+        regenerated when the file or the rows change.
+
+        Parameters:
+            rows (list): rows of the functions that are fuzzed
+
+        Returns:
+            path_fuzz_dict (str): path to the dictionary
+        """
+
+        with open(self.path_file, 'rb') as file:
+            key = hashlib.sha1(file.read() + str(sorted(rows)).encode('utf-8')).hexdigest()
+        self.path_fuzz_dict = os.path.join(
+            PATH_CONSEPT, 'tmp', 'fuzz', 'dicts', f'{self.file_name}-{key[:12]}.dict')
+        if os.path.exists(self.path_fuzz_dict):
+            return self.path_fuzz_dict
+
+        translation_unit = parse_translation_unit(self.path_file)
+
+        values = []
+        for node in translation_unit.cursor.walk_preorder():
+            if (node.kind == clang.cindex.CursorKind.FUNCTION_DECL and node.is_definition() and
+                    str(node.location.file) == str(translation_unit.spelling) and
+                    node.location.line in rows):
+                for child in node.walk_preorder():
+                    values += self._literal_values(child)
+
+        # remove duplicates while maintaining the order of the literals in the source
+        entries = list(dict.fromkeys(value for value in values if value))
+
+        os.makedirs(os.path.dirname(self.path_fuzz_dict), exist_ok=True)
+        with open(self.path_fuzz_dict, 'w', encoding='utf-8') as file:
+            for number, value in enumerate(entries):
+                file.write(f'kw{number}={dict_entry(value)}\n')
+        return self.path_fuzz_dict
+
+    @staticmethod
+    def _literal_values(node) -> list:
+        """
+        Returns the byte values a node of the AST contributes to the fuzzing dictionary.
+        """
+        kind = node.kind
+        tokens = [token.spelling for token in node.get_tokens()]
+        if kind == clang.cindex.CursorKind.INTEGER_LITERAL and tokens:
+            match = re.match(r'(0[xX][0-9a-fA-F]+|0[bB][01]+|[0-9]+)', tokens[0])
+            return integer_to_entries(int(match.group(0), 0 if match.group(0)[:2].lower()
+                                          in ['0x', '0b'] else 10)) if match else []
+        if kind in [clang.cindex.CursorKind.CHARACTER_LITERAL,
+                    clang.cindex.CursorKind.STRING_LITERAL] and tokens:
+            return [literal_to_bytes(tokens[0])]
+
+        # enum constants that are compared with or used as case label
+        operands = []
+        children = list(node.get_children())
+        if kind == clang.cindex.CursorKind.CASE_STMT and children:
+            operands = children[:1]
+        elif kind == clang.cindex.CursorKind.BINARY_OPERATOR and \
+                binary_operator(node) in COMPARISON_OPERATORS:
+            operands = children
+
+        values = []
+        for operand in operands:
+            for child in operand.walk_preorder():
+                referenced = child.referenced if child.kind == \
+                    clang.cindex.CursorKind.DECL_REF_EXPR else None
+                if referenced is not None and \
+                        referenced.kind == clang.cindex.CursorKind.ENUM_CONSTANT_DECL:
+                    values += integer_to_entries(referenced.enum_value)
+        return values
+
+    @property
+    def path_container_dict(self):
+        """
+        Property of self. Returns the path to the fuzzing dictionary inside the fuzzing
+        container when mounted.
+        """
+        return f'/home/consept/tmp/fuzz/dicts/{os.path.basename(self.path_fuzz_dict)}'
 
     @property
     def path_container_fuzz(self):
@@ -0,0 +1,157 @@
+'''
+Contains the functions to read a compile database (compile_commands.json) and to derive the
+arguments libclang needs to parse a file the way the project compiles it, as well as the
+compile databases of this process that every parse of a file takes its arguments from
+'''
+import json
+import os
+import shlex
+
+# options that take a path as their value, relative paths are relative to the directory of
+# the compile command
+PATH_OPTIONS = ['-I', '-isystem', '-iquote', '-idirafter', '-include', '-imacros']
+
+# options that only concern the output of the compiler, with and without a value
+DROPPED_OPTIONS = ['-c', '-S', '-E', '-MD', '-MMD', '-MP', '-emit-llvm']
+DROPPED_OPTIONS_WITH_VALUE = ['-o', '-MF', '-MT', '-MQ']
+
+# name of the compile database that is searched for next to a file and in its parent folders
+NAME_COMPILE_DB = 'compile_commands.json'
+
+# entries of the compile databases registered in this process, see register_compile_db()
+REGISTERED_ENTRIES = []
+
+# entries of the compile databases found next to files, by path and modification time
+FOUND_ENTRIES = {}
+
+
+def load_compile_db(path_compile_db):
+    """
+    Reads a compile database.
+
+    Parameters:
+    path_compile_db (str): The path to the compile_commands.json file.
+
+    Returns:
+    list: one dictionary per compile command with the absolute path of the file ('file') and
+    the arguments to parse it with ('args')
+    """
+    with open(path_compile_db, 'r', encoding='utf-8') as file:
+        commands = json.load(file)
+
+    entries = []
+    for command in commands:
+        directory = command.get('directory', os.path.dirname(os.path.abspath(path_compile_db)))
+        file_path = os.path.normpath(os.path.join(directory, command['file']))
+        arguments = command['arguments'] if 'arguments' in command \
+            else shlex.split(command['command'])
+        entries.append({'file': file_path,
+                        'args': parse_arguments(arguments, directory, command['file'])})
+    return entries
+
+
+def parse_arguments(arguments, directory, file_name):
+    """
+    Turns the arguments of a compile command into arguments for libclang: the compiler, the
+    source file and the output options are removed and paths are made absolute.
+
+    Parameters:
+    arguments (list): The arguments of the compile command, starting with the compiler.
+    directory (str): The directory the compile command is run in.
+    file_name (str): The source file of the compile command.
+
+    Returns:
+    list: the arguments to parse the file with
+    """
+    args = []
+    source = os.path.normpath(os.path.join(directory, file_name))
+    remaining = iter(arguments[1:])
+    for argument in remaining:
+        if argument in DROPPED_OPTIONS:
+            continue
+        if argument in DROPPED_OPTIONS_WITH_VALUE:
+            next(remaining, None)
+            continue
+        if os.path.normpath(os.path.join(directory, argument)) == source:
+            continue
+
+        # options with a path, either as separate argument or attached as in -Iinclude
+        if argument in PATH_OPTIONS:
+            args += [argument, os.path.normpath(os.path.join(directory, next(remaining, '')))]
+            continue
+        if argument.startswith('-I'):
+            argument = '-I' + os.path.normpath(os.path.join(directory, argument[2:]))
+        args.append(argument)
+    return args
+
+
+def find_compile_args(path_compile_db, file_path):
+    """
+    Returns the arguments of a file in a compile database, or None if the database has no
+    compile command for the file.
+    """
+    file_path = os.path.normpath(os.path.abspath(file_path))
+    for entry in load_compile_db(path_compile_db):
+        if entry['file'] == file_path:
+            return entry['args']
+    return None
+
+
+def register_compile_db(path_compile_db):
+    """
+    Registers a compile database, such that the files it compiles are parsed with their
+    arguments by compile_args(). Databases registered first take precedence.
+
+    Parameters:
+    path_compile_db (str): The path to the compile_commands.json file.
+
+    Returns:
+    None
+    """
+    REGISTERED_ENTRIES.extend(load_compile_db(path_compile_db))
+
+
+def find_compile_db(file_path):
+    """
+    Returns the path of the compile_commands.json in the folder of a file or in one of its
+    parent folders, also looking into their build folders, or None if there is none.
+    """
+    folder = os.path.dirname(os.path.abspath(file_path))
+    while True:
+        for candidate in [os.path.join(folder, NAME_COMPILE_DB),
+                          os.path.join(folder, 'build', NAME_COMPILE_DB)]:
+            if os.path.isfile(candidate):
+                return candidate
+        if os.path.dirname(folder) == folder:
+            return None
+        folder = os.path.dirname(folder)
+
+
+def compile_args(file_path):
+    """
+    Returns the arguments to parse a file with: those of the registered compile databases, or
+    those of the compile database found next to the file. Compile databases of a container,
+    such as those of KLEE, name their files by another path, so a file is also matched by its
+    name if exactly one entry has that name.
+
+    Parameters:
+    file_path (str): The path to the file to be parsed.
+
+    Returns:
+    list: the arguments to parse the file with, empty if no compile database knows the file
+    """
+    file_path = os.path.normpath(os.path.abspath(file_path))
+    entries = list(REGISTERED_ENTRIES)
+    path_compile_db = find_compile_db(file_path)
+    if path_compile_db is not None:
+        key = (path_compile_db, os.path.getmtime(path_compile_db))
+        if key not in FOUND_ENTRIES:
+            FOUND_ENTRIES[key] = load_compile_db(path_compile_db)
+        entries += FOUND_ENTRIES[key]
+
+    for entry in entries:
+        if entry['file'] == file_path:
+            return entry['args']
+    named = [entry for entry in entries
+             if os.path.basename(entry['file']) == os.path.basename(file_path)]
+    return named[0]['args'] if len(named) == 1 else []
@@ -0,0 +1,63 @@
+'''
+Contains the functions to compute the changes of a git revision range in a project: the diff
+in the unified format without context, which Dextool reads with --diff-from-stdin, and the
+ranges of the changed lines per file that it describes
+'''
+import re
+import subprocess
+
+# header of a hunk of a diff without context, e.g. '@@ -12,0 +13,2 @@'
+HUNK_HEADER = re.compile(r'^@@ -\d+(?:,\d+)? \+(\d+)(?:,(\d+))? @@')
+
+
+def git_diff(project_root, revision_range):
+    """
+    Returns the diff of a revision range of the git repository of a project, without context
+    lines and with the paths relative to the project root.
+
+    Parameters:
+    project_root (str): The folder of the project, inside a git repository.
+    revision_range (str): The revisions to compare, e.g. 'main..HEAD' or 'HEAD~3'.
+
+    Returns:
+    str: the diff in the unified format
+
+    Raises:
+    subprocess.CalledProcessError: if git fails, e.g. on an unknown revision
+    """
+    return subprocess.run(['git', '-C', project_root, 'diff', '-U0', '--relative',
+                           revision_range], check=True, capture_output=True,
+                          text=True).stdout
+
+
+def changed_lines(diff):
+    """
+    Returns the lines a diff adds or changes, per file. Files that are removed by the diff
+    have no changed lines.
+
+    Parameters:
+    diff (str): A diff in the unified format, as returned by git_diff().
+
+    Returns:
+    dict: per path of a changed file the (first, last) line ranges that changed
+    """
+    changes = {}
+    path = None
+    for line in diff.splitlines():
+        if line.startswith('+++ '):
+            path = line[4:]
+            if path == '/dev/null':
+                path = None
+            elif path.startswith('b/'):
+                path = path[2:]
+            continue
+
+        match = HUNK_HEADER.match(line)
+        if match and path is not None:
+            first = int(match.group(1))
+            count = 1 if match.group(2) is None else int(match.group(2))
+
+            # a hunk that only removes lines adds none
+            if count > 0:
+                changes.setdefault(path, []).append((first, first + count - 1))
+    return changes
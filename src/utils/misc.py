@@ -3,7 +3,10 @@ Contains all the miscellaneous functions
 '''
 import os
 import sys
-import clang
+import clang.cindex
+
+from utils.source_rewriter import SourceRewriter
+from utils.tu_cache import parse_translation_unit
 
 def find_file_path(name, start_dir="."):
     """
@@ -57,18 +60,14 @@ def comment_out(file_path, start_line, end_line):
     Returns:
     None
     """
-    with open(file_path, 'r', encoding='utf-8') as file:
-        lines = file.readlines()
-
-    lines[start_line - 1] = '/*' + lines[start_line - 1]
-    lines[end_line - 1] = lines[end_line - 1].rstrip() + '*/ \n'
-
-    with open(file_path, 'w', encoding='utf-8') as file:
-        file.writelines(lines)
+    rewriter = SourceRewriter(file_path)
+    rewriter.comment_out(start_line, end_line)
+    rewriter.write(file_path)
 
 def include_lib(file_path, output_file_path, library):
     """
     Includes the libraries needed for libFuzzer to work, in the specified C++ file.
+    The include line follows the first include of the file, or starts the file if it has none.
 
     Parameters:
     file_path (str): The path to the input C++ file.
@@ -78,34 +77,9 @@ def include_lib(file_path, output_file_path, library):
     Returns:
     None
     """
-    include_pos = None
-
-    # Open initial cpp file
-    with open(file_path, 'r', encoding='utf-8') as file:
-        content = file.read()
-
-    if library not in content:
-        # Find the position to insert the include line
-        include_pos = content.find("#include")
-        if include_pos != -1:
-            # Find the end of the line after the last include
-            include_end_pos = content.find('\n', include_pos)
-            if include_end_pos == -1:
-                include_end_pos = len(content)
-            # Insert the include line
-            content = (
-                content[:include_end_pos] + '\n' +
-                library + '\n' +
-                content[include_end_pos:]
-            )
-
-        else:
-            # If no existing includes are found, add the include line at the top of the file
-            content = library + '\n' + content
-
-    # Write the modified content back to the file
-    with open(output_file_path, 'w', encoding='utf-8') as file:
-        file.write(content)
+    rewriter = SourceRewriter(file_path)
+    rewriter.include(library)
+    rewriter.write(output_file_path)
 
 def find_main_function_range(file_path):
     """
@@ -119,11 +93,27 @@ def find_main_function_range(file_path):
     or
     False, 0, 0 - if the main function does not exists in the TUUT
     """
-    index = clang.cindex.Index.create()
-    translation_unit = index.parse(file_path)
+    translation_unit = parse_translation_unit(file_path)
 
     for node in translation_unit.cursor.walk_preorder():
         # chech to see if the method found is "main"
         if node.kind == clang.cindex.CursorKind.FUNCTION_DECL and node.spelling == 'main':
             return True, node.extent.start.line, node.extent.end.line
     return False, 0, 0
+
+def binary_operator(node):
+    """
+    Returns the spelling of the operator of a binary operator node of the AST
+
+    Parameters:
+    node (clang.cindex.Cursor): A node of kind BINARY_OPERATOR or COMPOUND_ASSIGNMENT_OPERATOR.
+
+    Returns:
+    The operator, e.g. '<' or '+=', or None if the node does not have two operands
+    """
+    children = list(node.get_children())
+    if len(children) != 2:
+        return None
+    operator = [token.spelling for token in node.get_tokens()
+                if token.extent.start.offset >= children[0].extent.end.offset][:1]
+    return operator[0] if operator else None
@@ -0,0 +1,111 @@
+'''
+Contains the rewrite engine of the annotated files: the edits of a file (insertions after
+lines, comment-outs, includes and appended code) are collected against the lines of the file
+as it was read, and are applied in a single pass over these lines, such that a file is read and
+written once no matter how many edits it gets
+'''
+
+
+class SourceRewriter:
+    """
+    Collects the edits of a source file and applies them in a single pass. All line numbers
+    refer to the lines of the file as it was read, so edits do not shift each other.
+    """
+
+    def __init__(self, file_path : str = None, lines : list = None):
+        """
+        Constructor of the SourceRewriter class.
+
+        Parameters:
+            file_path (str): path of the file to rewrite, read once
+            lines (list): lines of the file, instead of reading them from file_path
+        """
+        if lines is None:
+            with open(file_path, 'r', encoding='utf-8') as file:
+                lines = file.readlines()
+        self.lines = list(lines)
+        self.content = ''.join(self.lines)
+
+        # text inserted after a line, by line number
+        self.insertions = {}
+
+        # first and last line of every commented out range
+        self.comments = []
+
+        # include lines added after the first include of the file, and code added at its end
+        self.includes = []
+        self.appended = []
+
+    def insert_after(self, line : int, text : str) -> None:
+        """
+        Inserts text after a line. Texts inserted after the same line keep their order.
+        """
+        self.insertions.setdefault(line, []).append(text)
+
+    def comment_out(self, start_line : int, end_line : int) -> None:
+        """
+        Comments out the lines from start_line up to and including end_line with /* */.
+        """
+        self.comments.append((start_line, end_line))
+
+    def include(self, library : str) -> None:
+        """
+        Adds an include line, e.g. '#include <stdint.h>', unless the file already has it.
+        """
+        if library not in self.content and library not in self.includes:
+            self.includes.append(library)
+
+    def append(self, text : str) -> None:
+        """
+        Appends text to the end of the file.
+        """
+        self.appended.append(text)
+
+    def render_lines(self) -> list:
+        """
+        Returns the lines of the file with all edits applied, where every inserted text is an
+        element of its own. The includes follow the line of the first include of the file, or
+        start the file if it has no include.
+
+        Returns:
+            lines (list): the original lines, possibly edited, and the inserted texts
+        """
+        starts = {start for start, _ in self.comments}
+        ends = {end for _, end in self.comments}
+        include_line = next((number for number, line in enumerate(self.lines, start=1)
+                             if '#include' in line), 0)
+
+        output = [library + '\n' for library in self.includes] if include_line == 0 else []
+        for number, line in enumerate(self.lines, start=1):
+            if number in starts:
+                line = '/*' + line
+            if number in ends:
+                line = line.rstrip() + '*/ \n'
+            output.append(line)
+
+            if number == include_line and self.includes:
+                if not line.endswith('\n'):
+                    output.append('\n')
+                output += [library + '\n' for library in self.includes]
+            output += self.insertions.get(number, [])
+        return output + self.appended
+
+    def render(self) -> str:
+        """
+        Returns the content of the file with all edits applied, see render_lines().
+        """
+        return ''.join(self.render_lines())
+
+    def write(self, output_file_path : str) -> str:
+        """
+        Writes the rewritten content to a file.
+
+        Parameters:
+            output_file_path (str): path of the rewritten file, may be the file that was read
+
+        Returns:
+            output_file_path (str): path of the rewritten file
+        """
+        with open(output_file_path, 'w', encoding='utf-8') as file:
+            file.write(self.render())
+        return output_file_path
@@ -0,0 +1,201 @@
+'''
+Contains the process-wide cache of libclang translation units, such that every file is
+parsed at most once per run, no matter how many handlers inspect it. Files are parsed with the
+arguments of their compile database, and parsed units are saved to disk so later runs read
+them instead of parsing the file and its headers again
+'''
+import hashlib
+import os
+from collections import OrderedDict
+
+import clang.cindex
+
+from consept_vars import PATH_AST_CACHE
+from utils.compile_db import compile_args
+
+# number of translation units that are kept in memory
+MAX_CACHED_UNITS = 16
+
+# number of serialised translation units that are kept on disk
+MAX_SAVED_UNITS = 256
+
+# the preamble (the includes at the top of a file) is precompiled, such that a reparse of a
+# changed file only parses the file itself
+PREAMBLE_OPTIONS = clang.cindex.TranslationUnit.PARSE_PRECOMPILED_PREAMBLE
+
+
+class TranslationUnitCache:
+    """
+    Least recently used cache of translation units, sharing a single libclang index. A unit is
+    keyed by the path, the content hash and the arguments of the parse, so a unit of a file
+    that changed on disk is never returned; a unit that libclang parsed is reparsed on the next
+    parse of that file, reusing its precompiled preamble, a unit read from disk is parsed again.
+    If a folder for serialised units is given, every parsed unit is saved there and read back
+    by later runs, unless one of the files it includes changed after it was saved.
+    """
+
+    def __init__(self, max_units : int = MAX_CACHED_UNITS, path_ast_cache : str = None):
+        """
+        Constructor of the TranslationUnitCache class.
+
+        Parameters:
+            max_units (int): number of translation units kept in memory
+            path_ast_cache (str): folder of the serialised units, None to keep units in memory
+        """
+        self.max_units = max_units
+        self.path_ast_cache = path_ast_cache
+        self.units = OrderedDict()
+        self._index = None
+
+        # keys of the units parsed by libclang in this process, only those can be reparsed,
+        # libclang does not reparse a unit read from a serialised file
+        self.parsed = set()
+
+        # number of parses that were served from the cache and that went to libclang, and
+        # number of misses that were served by reading a serialised unit
+        self.hits = 0
+        self.misses = 0
+        self.reads = 0
+
+    @property
+    def index(self) -> clang.cindex.Index:
+        """
+        Returns the libclang index shared by all parses, which is created on first use.
+        """
+        if self._index is None:
+            self._index = clang.cindex.Index.create()
+        return self._index
+
+    @staticmethod
+    def key(file_path : str, args : list = None, options : int = 0) -> tuple:
+        """
+        Returns the cache key of a parse: the absolute path, the SHA-1 of the content of the
+        file, the arguments and the parse options.
+        """
+        with open(file_path, 'rb') as file:
+            digest = hashlib.sha1(file.read()).hexdigest()
+        return os.path.abspath(file_path), digest, tuple(args or []), options
+
+    def parse(self, file_path : str, args : list = None,
+              options : int = 0) -> clang.cindex.TranslationUnit:
+        """
+        Returns the translation unit of a file, parsing the file only if it was not parsed
+        before with the same content, arguments and options.
+
+        Parameters:
+            file_path (str): path to the C++ file
+            args (list): compiler arguments of the parse
+            options (int): libclang parse options, see clang.cindex.TranslationUnit
+
+        Returns:
+            translation_unit (clang.cindex.TranslationUnit): the parsed file
+        """
+        key = self.key(file_path, args, options)
+        if key in self.units:
+            self.hits += 1
+            self.units.move_to_end(key)
+            return self.units[key]
+        self.misses += 1
+
+        # a parsed unit of an older content of this file is reparsed with its precompiled
+        # preamble, reparse() takes reparse flags, the parse options are kept by the unit
+        stale = [cached for cached in self.units if cached[0] == key[0] and cached[2:] == key[2:]]
+        reparsable = [cached for cached in stale if cached in self.parsed]
+        translation_unit = self._read(key)
+        if translation_unit is None and reparsable:
+            translation_unit = self.units[reparsable[0]]
+            translation_unit.reparse()
+            self.parsed.add(key)
+            self._save(key, translation_unit)
+        elif translation_unit is None:
+            translation_unit = self.index.parse(file_path, args=args,
+                                                options=options | PREAMBLE_OPTIONS)
+            self.parsed.add(key)
+            self._save(key, translation_unit)
+        for cached in stale:
+            del self.units[cached]
+            self.parsed.discard(cached)
+
+        self.units[key] = translation_unit
+        if len(self.units) > self.max_units:
+            evicted, _ = self.units.popitem(last=False)
+            self.parsed.discard(evicted)
+        return translation_unit
+
+    def _ast_path(self, key : tuple) -> str:
+        """
+        Returns the path of the serialised unit of a cache key.
+        """
+        name = hashlib.sha1(repr(key).encode('utf-8')).hexdigest()
+        return os.path.join(self.path_ast_cache, f'{os.path.basename(key[0])}-{name[:16]}.ast')
+
+    def _read(self, key : tuple) -> clang.cindex.TranslationUnit:
+        """
+        Returns the serialised unit of a cache key, or None if there is none or if one of the
+        files it includes was modified after the unit was saved.
+        """
+        if self.path_ast_cache is None or not os.path.exists(self._ast_path(key)):
+            return None
+        path_ast = self._ast_path(key)
+        try:
+            translation_unit = clang.cindex.TranslationUnit.from_ast_file(path_ast, self.index)
+        except clang.cindex.TranslationUnitLoadError:
+            # e.g. a unit saved by another version of libclang
+            return None
+
+        saved = os.path.getmtime(path_ast)
+        for include in translation_unit.get_includes():
+            header = include.include.name
+            if not os.path.exists(header) or os.path.getmtime(header) > saved:
+                return None
+        self.reads += 1
+        return translation_unit
+
+    def _save(self, key : tuple, translation_unit : clang.cindex.TranslationUnit) -> None:
+        """
+        Saves a unit under its cache key, if units are serialised. Parallel processes may save
+        the same unit, so the unit is written to a file of this process and then moved.
+        """
+        if self.path_ast_cache is None:
+            return
+        os.makedirs(self.path_ast_cache, exist_ok=True)
+        path_temp = f'{self._ast_path(key)}.{os.getpid()}'
+        try:
+            translation_unit.save(path_temp)
+            os.replace(path_temp, self._ast_path(key))
+        except clang.cindex.TranslationUnitSaveError:
+            # e.g. a unit with errors, which is parsed again by the next run
+            if os.path.exists(path_temp):
+                os.remove(path_temp)
+
+        # the least recently saved units are removed once there are too many, other processes
+        # may be removing them at the same time
+        try:
+            saved = sorted((os.path.join(self.path_ast_cache, name)
+                            for name in os.listdir(self.path_ast_cache) if name.endswith('.ast')),
+                           key=os.path.getmtime)
+            for path_ast in saved[:-MAX_SAVED_UNITS]:
+                os.remove(path_ast)
+        except FileNotFoundError:
+            pass
+
+    def clear(self) -> None:
+        """
+        Drops all cached translation units.
+        """
+        self.units.clear()
+        self.parsed.clear()
+
+
+# the cache shared by all handlers of this process
+TU_CACHE = TranslationUnitCache(path_ast_cache=PATH_AST_CACHE)
+
+
+def parse_translation_unit(file_path : str, args : list = None,
+                           options : int = 0) -> clang.cindex.TranslationUnit:
+    """
+    Returns the translation unit of a file from the process-wide cache, see
+    TranslationUnitCache.parse(). Without arguments, the file is parsed with the arguments of
+    its compile database, see utils.compile_db.compile_args().
+    """
+    return TU_CACHE.parse(file_path, compile_args(file_path) if args is None else args, options)
@@ -0,0 +1,18 @@
+"""
+Fixtures shared by all test cases
+"""
+import importlib
+
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def no_saved_translation_units(monkeypatch):
+    """
+    Keeps the translation units parsed by a test in memory, such that tests do not write to
+    the tmp/ast_cache folder of the repository. The cache is imported both as part of src and
+    from the src folder itself, so both instances are patched.
+    """
+    for name in ['utils.tu_cache', 'src.utils.tu_cache']:
+        module = importlib.import_module(name)
+        monkeypatch.setattr(module.TU_CACHE, 'path_ast_cache', None)
@@ -0,0 +1,65 @@
+"""
+Creates test cases for the compile database module
+"""
+import json
+import os
+import tempfile
+
+from src.utils.compile_db import compile_args, find_compile_args, parse_arguments
+from src.utils.tu_cache import TranslationUnitCache
+
+
+def test_parse_arguments():
+    """
+    Tests the `parse_arguments()` function through checking if
+    the compiler, the source file and the output options are dropped and paths are made absolute
+    """
+    arguments = ['/usr/bin/g++', '-Iinclude', '-isystem', '../third_party', '-DNDEBUG',
+                 '-MD', '-MF', 'main.d', '-o', 'main.o', '-c', 'main.cpp']
+    assert parse_arguments(arguments, '/project/build', 'main.cpp') == \
+        ['-I/project/build/include', '-isystem', '/project/third_party', '-DNDEBUG']
+
+
+def test_find_compile_args():
+    """
+    Tests the `find_compile_args()` function through checking if
+    the arguments of a file are found for both forms of compile commands
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_compile_db = os.path.join(temp_dir, 'compile_commands.json')
+        with open(path_compile_db, 'w', encoding='utf-8') as file:
+            json.dump([{'directory': temp_dir, 'file': 'a.cpp',
+                        'command': 'clang++ -DA=1 -c a.cpp -o a.o'},
+                       {'directory': temp_dir, 'file': 'b.cpp',
+                        'arguments': ['clang++', '-std=c++17', '-c', 'b.cpp']}], file)
+
+        assert find_compile_args(path_compile_db, os.path.join(temp_dir, 'a.cpp')) == ['-DA=1']
+        assert find_compile_args(path_compile_db, os.path.join(temp_dir, 'b.cpp')) == \
+            ['-std=c++17']
+        assert find_compile_args(path_compile_db, os.path.join(temp_dir, 'c.cpp')) is None
+
+
+def test_compile_args_from_compile_db_next_to_file():
+    """
+    Tests the `compile_args()` function through checking if
+    a file in a project is parsed with the include paths and defines of its compile database
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        os.makedirs(os.path.join(temp_dir, 'include'))
+        os.makedirs(os.path.join(temp_dir, 'src'))
+        os.makedirs(os.path.join(temp_dir, 'build'))
+        with open(os.path.join(temp_dir, 'include', 'config.h'), 'w', encoding='utf-8') as file:
+            file.write('#define ENABLED 1\n')
+        path = os.path.join(temp_dir, 'src', 'main.cpp')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('#include "config.h"\n#if ENABLED && MODE\nint f(int a);\n#endif\n')
+        with open(os.path.join(temp_dir, 'build', 'compile_commands.json'), 'w',
+                  encoding='utf-8') as file:
+            json.dump([{'directory': os.path.join(temp_dir, 'build'), 'file': '../src/main.cpp',
+                        'command': 'c++ -I../include -DMODE=1 -c ../src/main.cpp'}], file)
+
+        args = compile_args(path)
+        assert args == ['-I' + os.path.join(temp_dir, 'include'), '-DMODE=1']
+        translation_unit = TranslationUnitCache().parse(path, args)
+        assert [node.spelling for node in translation_unit.cursor.get_children()
+                if str(node.location.file) == path] == ['f']
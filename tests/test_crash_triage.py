@@ -0,0 +1,111 @@
+"""
+Creates test cases for the crash triage module
+"""
+import os
+import json
+import tempfile
+
+from src.crash_triage import CrashTriage, parse_sanitizer_report, bucket_id, binary_for_crash
+
+ASAN_REPORT = """INFO: Running with entropic power schedule (0xFF, 100).
+==13==ERROR: AddressSanitizer: stack-buffer-overflow on address 0x7ffd3 at pc 0x55 bp 0x7f
+READ of size 1 at 0x7ffd3 thread T0
+    #0 0x55d2c1 in print_elements(char*) /home/consept/tmp/fuzz/address_memory.cpp:9:18
+    #1 0x55d3a0 in LLVMFuzzerTestOneInput /home/consept/tmp/fuzz/address_memory.cpp:40:9
+    #2 0x4ee5b3 in fuzzer::Fuzzer::ExecuteCallback(unsigned char const*, unsigned long) (/a+0x4e)
+    #3 0x4d8a22 in main (/home/consept/tmp/fuzz/fuzz_output+0x4d8a22)
+
+Address 0x7ffd3 is located in stack of thread T0 at offset 38 in frame
+    #0 0x55d3a0 in LLVMFuzzerTestOneInput /home/consept/tmp/fuzz/address_memory.cpp:32
+SUMMARY: AddressSanitizer: stack-buffer-overflow address_memory.cpp:9:18 in print_elements(char*)
+"""
+
+MSAN_REPORT = """==20==WARNING: MemorySanitizer: use-of-uninitialized-value
+    #0 0x49a5e1 in uninit_value(int) /home/consept/tmp/fuzz/address_memory.cpp:19:7
+    #1 0x49a7c0 in LLVMFuzzerTestOneInput /home/consept/tmp/fuzz/address_memory.cpp:40:9
+"""
+
+UBSAN_REPORT = """math.cpp:4:14: runtime error: division by zero
+SUMMARY: UndefinedBehaviorSanitizer: undefined-behavior math.cpp:4:14
+"""
+
+DEADLY_SIGNAL_REPORT = """==1== ERROR: libFuzzer: deadly signal
+    #0 0x52 in __sanitizer_print_stack_trace (/home/consept/tmp/fuzz/fuzz_fast+0x52)
+    #1 0x53 in fuzzer::PrintStackTrace() (/home/consept/tmp/fuzz/fuzz_fast+0x53)
+    #2 0x54 in divide(int) /home/consept/tmp/fuzz/math.cpp:4:14
+"""
+
+
+def test_parse_sanitizer_report_asan():
+    """
+    Tests the `parse_sanitizer_report()` function through checking if the bug type and the
+    frames of the crashing stack are extracted from an AddressSanitizer report
+    """
+    bug_type, frames = parse_sanitizer_report(ASAN_REPORT)
+    assert bug_type == 'AddressSanitizer: stack-buffer-overflow'
+    assert frames == ['print_elements(char*)', 'LLVMFuzzerTestOneInput']
+
+
+def test_parse_sanitizer_report_number_of_frames():
+    """
+    Tests the `parse_sanitizer_report()` function through checking if only the requested
+    number of frames is returned
+    """
+    _, frames = parse_sanitizer_report(ASAN_REPORT, 1)
+    assert frames == ['print_elements(char*)']
+
+
+def test_parse_sanitizer_report_msan_ubsan_libfuzzer():
+    """
+    Tests the `parse_sanitizer_report()` function for MemorySanitizer, UndefinedBehaviorSanitizer
+    and plain libFuzzer reports
+    """
+    assert parse_sanitizer_report(MSAN_REPORT) == (
+        'MemorySanitizer: use-of-uninitialized-value',
+        ['uninit_value(int)', 'LLVMFuzzerTestOneInput'])
+    assert parse_sanitizer_report(UBSAN_REPORT) == (
+        'UndefinedBehaviorSanitizer: division by zero', [])
+    assert parse_sanitizer_report(DEADLY_SIGNAL_REPORT) == (
+        'libFuzzer: deadly signal', ['divide(int)'])
+    assert parse_sanitizer_report('') == ('unknown', [])
+
+
+def test_binary_for_crash():
+    """
+    Tests the `binary_for_crash()` function through checking if crashes confirmed by a
+    sanitizer build or configuration are replayed with that build
+    """
+    assert binary_for_crash('crash-asan-0a1b', 'fuzz_output') == 'fuzz_asan'
+    assert binary_for_crash('crash-msan-0a1b', 'fuzz_output') == 'fuzz_msan'
+    assert binary_for_crash('crash-asan_ubsan-crash-0a1b', 'fuzz_output') == 'fuzz_asan_ubsan'
+    assert binary_for_crash('crash-0a1b', 'fuzz_output') == 'fuzz_output'
+
+
+def test_bucket_crashes():
+    """
+    Tests the `bucket_crashes()` and `write_index()` functions through checking if crashes with
+    the same report end up in one bucket with the smallest crash as representative
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        crashes = {'crash-aa': (ASAN_REPORT, b'123456'),
+                   'crash-bb': (ASAN_REPORT, b'12'),
+                   'crash-cc': (MSAN_REPORT, b'1')}
+        for name, (report, content) in crashes.items():
+            with open(os.path.join(temp_dir, name), 'wb') as file:
+                file.write(content)
+            with open(os.path.join(temp_dir, name + '.log'), 'w', encoding='utf-8') as file:
+                file.write(report)
+
+        triage = CrashTriage(temp_dir, num_frames=2)
+        buckets = triage.bucket_crashes()
+
+        assert len(buckets) == 2
+        assert buckets[0]['count'] == 2
+        assert buckets[0]['crashes'] == ['crash-aa', 'crash-bb']
+        assert buckets[0]['representative'] == 'crash-bb'
+        assert buckets[0]['id'] == bucket_id('AddressSanitizer: stack-buffer-overflow',
+                                             ['print_elements(char*)', 'LLVMFuzzerTestOneInput'])
+        assert buckets[1]['crashes'] == ['crash-cc']
+
+        with open(triage.write_index(buckets), 'r', encoding='utf-8') as file:
+            assert json.load(file) == buckets
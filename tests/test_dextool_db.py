@@ -0,0 +1,238 @@
+"""
+Creates test cases for the dextool database module
+"""
+import os
+import sqlite3
+import tempfile
+
+from src.dextool_db import DextoolDatabase, STATUS_SKIPPED, kind_operator
+
+# the tables of a Dextool database that Consept reads
+SCHEMA = '''
+CREATE TABLE files (id INTEGER PRIMARY KEY, path TEXT NOT NULL, checksum0 INTEGER,
+                    checksum1 INTEGER, lang INTEGER, timestamp DATETIME, root INTEGER);
+CREATE TABLE mutation_point (id INTEGER PRIMARY KEY, file_id INTEGER NOT NULL,
+                             offset_begin INTEGER, offset_end INTEGER, line INTEGER,
+                             column INTEGER, line_end INTEGER, column_end INTEGER);
+CREATE TABLE mutation (id INTEGER PRIMARY KEY, mp_id INTEGER NOT NULL, st_id INTEGER,
+                       kind INTEGER NOT NULL);
+CREATE TABLE mutation_status (id INTEGER PRIMARY KEY, status INTEGER NOT NULL,
+                              exit_code INTEGER NOT NULL DEFAULT 0,
+                              compile_time_ms INTEGER NOT NULL DEFAULT 0,
+                              test_time_ms INTEGER NOT NULL DEFAULT 0, update_ts DATETIME,
+                              added_ts DATETIME, checksum0 INTEGER, checksum1 INTEGER,
+                              prio INTEGER NOT NULL DEFAULT 0);
+CREATE TABLE all_test_case (id INTEGER PRIMARY KEY, name TEXT NOT NULL UNIQUE);
+CREATE TABLE killed_test_case (id INTEGER PRIMARY KEY, st_id INTEGER NOT NULL,
+                               tc_id INTEGER NOT NULL, location TEXT);
+'''
+
+
+def create_database(path, statuses):
+    """
+    Creates a Dextool database with one file and one mutant per status, on line 10, 11, ...
+    at column 5
+    """
+    with sqlite3.connect(path) as connection:
+        connection.executescript(SCHEMA)
+        connection.execute("INSERT INTO files (id, path) VALUES (1, 'src/game.cpp')")
+        for number, status in enumerate(statuses, start=1):
+            connection.execute('INSERT INTO mutation_point (id, file_id, line, column) '
+                               'VALUES (?, 1, ?, 5)', (number, 9 + number))
+            connection.execute('INSERT INTO mutation_status (id, status) VALUES (?, ?)',
+                               (number, status))
+            connection.execute('INSERT INTO mutation (id, mp_id, st_id, kind) VALUES (?, ?, ?, 0)',
+                               (number, number, number))
+    connection.close()
+
+
+def test_status_counts_and_untested():
+    """
+    Tests the `status_counts()` and `untested()` functions through checking the mutants of a
+    database per status and the mutants without a result
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [0, 1, 2, 0, 1])
+
+        database = DextoolDatabase(path)
+        assert database.status_counts() == {'unknown': 2, 'killed': 2, 'alive': 1}
+        assert database.untested() == [1, 4]
+        database.close()
+
+
+def test_shard_and_merge():
+    """
+    Tests the `shard()` and `merge()` functions through checking if every shard only tests its
+    own mutants and if the results of the shards, with the tests that killed the mutants, are
+    merged back into the database
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [0, 0, 0, 1, 0])
+
+        database = DextoolDatabase(path)
+        paths = database.shard(2)
+        assert paths == [os.path.join(temp_dir, 'project.shard-0.sqlite3'),
+                         os.path.join(temp_dir, 'project.shard-1.sqlite3')]
+
+        # the untested mutants 1, 2, 3 and 5 are split round-robin over the shards
+        assert DextoolDatabase(paths[0]).untested() == [1, 3]
+        assert DextoolDatabase(paths[1]).untested() == [2, 5]
+
+        # every shard tests its mutants, a test case gets another id in every shard
+        for path_shard, results in zip(paths, [{1: 1, 3: 2}, {2: 2, 5: 1}]):
+            with sqlite3.connect(path_shard) as connection:
+                connection.execute(f"INSERT INTO all_test_case (name) VALUES "
+                                   f"('{os.path.basename(path_shard)}'), ('test_move')")
+                for status_id, status in results.items():
+                    connection.execute('UPDATE mutation_status SET status = ?, '
+                                       'test_time_ms = 40 WHERE id = ?', (status, status_id))
+                    if status == 1:
+                        connection.execute("INSERT INTO killed_test_case (st_id, tc_id) SELECT "
+                                           "?, id FROM all_test_case WHERE name = 'test_move'",
+                                           (status_id,))
+            connection.close()
+
+        assert database.merge(paths) == 4
+        assert database.status_counts() == {'killed': 3, 'alive': 2}
+        assert database.connection.execute(
+            'SELECT SUM(test_time_ms) FROM mutation_status').fetchone()[0] == 160
+        killed = database.connection.execute(
+            'SELECT st_id, name FROM killed_test_case JOIN all_test_case '
+            'ON all_test_case.id = tc_id ORDER BY st_id').fetchall()
+        assert killed == [(1, 'test_move'), (5, 'test_move')]
+
+        # the mutants of the other shards are skipped in the copy of a shard only
+        assert DextoolDatabase(paths[0]).status_counts()['skipped'] == 2
+        assert STATUS_SKIPPED not in [row[0] for row in database.connection.execute(
+            'SELECT status FROM mutation_status')]
+        database.close()
+
+
+def test_results_and_summary():
+    """
+    Tests the `results()` and `summary()` functions through checking the mutation score, the
+    surviving mutants, the kills per test and the slowest mutants of a database
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [1, 2, 4, 5, 6, 0])
+        with sqlite3.connect(path) as connection:
+            connection.execute("INSERT INTO all_test_case (name) VALUES ('test_move'), "
+                               "('test_draw')")
+            connection.execute('INSERT INTO killed_test_case (st_id, tc_id) VALUES (1, 1)')
+            connection.execute('UPDATE mutation_status SET compile_time_ms = 1000, '
+                               'test_time_ms = id * 500')
+        connection.close()
+
+        database = DextoolDatabase(path)
+        results = database.results(slowest=2)
+        database.close()
+
+        # killed and timeout are detected, alive and noCoverage survived
+        assert results['score'] == 50.0
+        assert results['counts'] == {'unknown': 1, 'killed': 1, 'alive': 1, 'timeout': 1,
+                                     'noCoverage': 1, 'equivalent': 1}
+        assert [(mutant['line'], mutant['status'])
+                for mutant in results['survivors']['src/game.cpp']] == [(11, 'alive'),
+                                                                         (13, 'noCoverage')]
+        assert results['tests'] == [{'name': 'test_move', 'kills': 1},
+                                    {'name': 'test_draw', 'kills': 0}]
+        assert [(mutant['id'], mutant['time_ms']) for mutant in results['slowest']] == \
+            [(4, 3000), (3, 2500)]
+
+        summary = DextoolDatabase.summary(results)
+        assert summary.startswith('Mutation score 50.00% (1 unknown, 1 killed, 1 alive')
+        assert '  src/game.cpp:11:5 kind 0 alive' in summary
+        assert '      1 test_move' in summary
+        assert '       3.0 s src/game.cpp:13 noCoverage' in summary
+
+
+def test_diff_scope():
+    """
+    Tests the `diff_scope()` function through checking the mutants on the changed lines of a
+    diff and the untested mutants elsewhere that were skipped
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [1, 0, 0, 2, 0])
+
+        # the mutants are on the lines 10 up to 14
+        database = DextoolDatabase(path)
+        assert database.diff_scope({'src/game.cpp': [(10, 11), (13, 13)]}) == \
+            {'changed': 3, 'untested': 1, 'skipped': 2}
+        assert database.diff_scope({'src/other.cpp': [(10, 14)]}) == \
+            {'changed': 0, 'untested': 0, 'skipped': 3}
+        database.close()
+
+
+def test_statuses_of_equivalent_and_duplicate_mutants():
+    """
+    Tests the `untested_files()`, `set_statuses()` and `copy_statuses()` functions through
+    marking mutants as equivalent and duplicate and copying the result of a tested mutant to
+    its duplicate
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [0, 0, 0, 1])
+
+        database = DextoolDatabase(path)
+        assert database.untested_files() == [(1, 'src/game.cpp', 0), (2, 'src/game.cpp', 0),
+                                             (3, 'src/game.cpp', 0)]
+
+        database.set_statuses({1: 'equivalent', 3: 'skipped'})
+        database.copy_statuses({3: 2})
+        assert database.untested() == [2]
+        assert database.status_counts()['skipped'] == 1
+
+        # once the mutant is tested its duplicate gets its result
+        database.set_statuses({2: 'alive'})
+        database.copy_statuses({3: 2})
+        assert database.status_counts() == {'killed': 1, 'alive': 2, 'equivalent': 1}
+        database.close()
+
+
+def test_statuses_and_kind_operator():
+    """
+    Tests the `statuses()` and `kind_operator()` functions through checking the statuses of
+    sampled mutants by id and the operators of kinds of mutants
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [1, 0, 2, 4])
+
+        database = DextoolDatabase(path)
+        assert database.statuses([1, 3, 4]) == {1: 'killed', 3: 'alive', 4: 'timeout'}
+        database.close()
+
+    assert kind_operator(1) == 'ror'
+    assert kind_operator(30) == 'sdl'
+    assert kind_operator(0) == 'other'
+    assert kind_operator(1000) == 'other'
+
+
+def test_untested_lines_and_test_kills():
+    """
+    Tests the `untested_lines()`, `checksums()` and `test_kills()` functions through checking
+    the lines and the unsigned checksums of the untested mutants and the tests ordered by the
+    number of mutants they killed
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'project.sqlite3')
+        create_database(path, [0, 1, 0, 1])
+        with sqlite3.connect(path) as connection:
+            connection.execute('UPDATE mutation_point SET line_end = line + 2 WHERE id = 3')
+            connection.execute('UPDATE mutation_status SET checksum0 = -id')
+            connection.execute("INSERT INTO all_test_case (name) VALUES ('test_move'), "
+                               "('test_draw')")
+            connection.execute('INSERT INTO killed_test_case (st_id, tc_id) VALUES (2, 2), '
+                               '(4, 2)')
+        connection.close()
+
+        database = DextoolDatabase(path)
+        assert database.untested_lines() == [(1, 'src/game.cpp', 10, 10),
+                                             (3, 'src/game.cpp', 12, 14)]
+        assert database.checksums() == {1: 2 ** 64 - 1, 3: 2 ** 64 - 3}
+        assert database.test_kills() == [('test_draw', 2), ('test_move', 0)]
+        database.close()
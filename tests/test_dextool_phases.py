@@ -0,0 +1,135 @@
+"""
+Creates test cases for the dextool phases module
+"""
+import os
+import sqlite3
+import tempfile
+
+import pytest
+
+from src.dextool_db import DextoolDatabase
+from src.dextool_phases import DextoolPhases
+from tests.test_dextool_db import create_database
+
+
+class FakeContainer:
+    """
+    Container of a shard that marks the mutants of its database as killed, or fails
+    """
+
+    def __init__(self, path_shard, status_code):
+        self.path_shard = path_shard
+        self.status_code = status_code
+
+    def wait(self):
+        """
+        Tests the mutants of the shard, unless it fails
+        """
+        if self.status_code == 0:
+            with sqlite3.connect(self.path_shard) as connection:
+                connection.execute('UPDATE mutation_status SET status = 1 WHERE status = 0')
+            connection.close()
+        return {'StatusCode': self.status_code}
+
+    def logs(self):
+        """
+        Returns the output of the shard
+        """
+        return b'build failed' if self.status_code else b'all mutants tested'
+
+    def remove(self):
+        """
+        Removes the container
+        """
+
+
+class FakeApplicationManager:
+    """
+    Application manager that starts fake containers, of which the second shard fails
+    """
+
+    def __init__(self, path_databases):
+        self.path_databases = path_databases
+
+    @staticmethod
+    def cpu_count():
+        """
+        Returns the number of CPUs to split over the shards
+        """
+        return 4
+
+    def start_container(self, _tool, command, _project_root, **_options):
+        """
+        Starts the container of the shard of which the database is given in the command
+        """
+        path_shard = os.path.join(self.path_databases, os.path.basename(command.split()[-1]))
+        return FakeContainer(path_shard, 1 if path_shard.endswith('shard-1.sqlite3') else 0)
+
+
+def test_test_shards_skips_failed_shards(monkeypatch, capsys):
+    """
+    Tests the `test_shards()` function through checking if the results of a failed shard are
+    not merged, its mutants stay untested, and if its output is printed
+    """
+    phases = DextoolPhases(tool='mutation', test=True)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setattr(DextoolPhases, 'path_mount_folder', property(lambda _: temp_dir))
+        path = phases.database_path('/home/user/project')
+        os.makedirs(os.path.dirname(path))
+        create_database(path, [0, 0, 0, 0])
+        phases.app_man = FakeApplicationManager(os.path.dirname(path))
+
+        phases.test_shards('/home/user/project', 2)
+
+        database = DextoolDatabase(path)
+        assert database.untested() == [2, 4]
+        assert database.status_counts() == {'killed': 2, 'unknown': 2}
+        database.close()
+        assert 'Shard 1 failed with exit code 1' in capsys.readouterr().out
+        assert os.listdir(os.path.dirname(path)) == [os.path.basename(path)]
+
+
+def test_merge_duplicates(monkeypatch):
+    """
+    Tests the `merge_duplicates()` function through checking if the duplicates of a second
+    run are merged with those stored by the first, where the second run wins
+    """
+    phases = DextoolPhases(tool='mutation', test=True)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setattr(DextoolPhases, 'path_mount_folder', property(lambda _: temp_dir))
+        os.makedirs(os.path.join(temp_dir, 'databases'))
+        assert phases.merge_duplicates('/home/user/project', {3: 1, 4: 1}) == {3: 1, 4: 1}
+        assert phases.merge_duplicates('/home/user/project', {4: 2, 6: 5}) == \
+            {3: 1, 4: 2, 6: 5}
+
+
+def test_run_phases_resets_skipped_mutants(monkeypatch):
+    """
+    Tests the `run_phases()` function through checking if the mutants left out of a sample are
+    untested again after the test phase failed
+    """
+    class FailingApplicationManager:
+        """
+        Application manager of which the test phase fails
+        """
+        @staticmethod
+        def run_container(_tool, command, _project_root, **_options):
+            """
+            Runs a phase, the test phase fails
+            """
+            if command.endswith(' test'):
+                raise RuntimeError('test phase failed')
+
+    phases = DextoolPhases(tool='mutation', test=True)
+    phases.app_man = FailingApplicationManager()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setattr(DextoolPhases, 'path_mount_folder', property(lambda _: temp_dir))
+        path = phases.database_path('/home/user/project')
+        os.makedirs(os.path.dirname(path))
+        create_database(path, [0, 0, 0, 0])
+
+        with pytest.raises(RuntimeError):
+            phases.run_phases('/home/user/project', 1, sample=('2', ()))
+        database = DextoolDatabase(path)
+        assert database.untested() == [1, 2, 3, 4]
+        database.close()
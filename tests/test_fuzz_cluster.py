@@ -0,0 +1,88 @@
+"""
+Creates test cases for the fuzzing cluster module
+"""
+import os
+import tempfile
+
+from src.fuzz_cluster import FuzzCluster, split_cpus
+from src.fuzz_handler import FuzzHandler
+
+
+class StubApplicationManager:  # pylint: disable=too-few-public-methods
+    """
+    Application manager that reports a fixed number of CPUs per endpoint
+    """
+    def cpu_count(self, endpoint=None):
+        """
+        Returns 8 CPUs for the local Docker daemon and 2 CPUs for any other endpoint
+        """
+        return 8 if endpoint is None else 2
+
+
+def test_split_cpus():
+    """
+    Tests the `split_cpus()` function through checking if
+    every node gets its own contiguous share of the CPUs
+    """
+    assert split_cpus(2, 8) == ['0-3', '4-7']
+    assert split_cpus(3, 8) == ['0-1', '2-3', '4-5']
+    assert split_cpus(4, 4) == ['0', '1', '2', '3']
+    assert split_cpus(3, 2) == ['0', '1', '0']
+
+
+def test_placements():
+    """
+    Tests the `placements()` function through checking if
+    the nodes are spread round-robin over the endpoints with their own names and CPU sets
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    fuzz_handler.app_man = StubApplicationManager()
+
+    cluster = FuzzCluster(fuzz_handler, 3, [None, 'tcp://remote:2375'])
+    assert cluster.placements() == [
+        {'node': 0, 'name': 'container_consept_fuzz_node_0', 'endpoint': None, 'cpuset': '0-3'},
+        {'node': 1, 'name': 'container_consept_fuzz_node_1', 'endpoint': 'tcp://remote:2375',
+         'cpuset': '0-1'},
+        {'node': 2, 'name': 'container_consept_fuzz_node_2', 'endpoint': None, 'cpuset': '4-7'}]
+
+
+def test_node_commands():
+    """
+    Tests the `node_commands()` function through checking if
+    a node fuzzes in rounds of the sync interval and merges into the shared corpus
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    commands = FuzzCluster(fuzz_handler, 2, sync_interval=30).node_commands(1, 'fuzz_output', 600)
+
+    assert commands[0] == 'mkdir -p tmp/fuzz/corpus tmp/fuzz/cluster/node-1'
+    assert commands[1] == 'END=$(( $(date +%s) + 600 ))'
+    assert 'if [ "$ROUND" -gt 30 ]; then ROUND=30; fi' in commands
+    assert ('tmp/fuzz/fuzz_output -artifact_prefix=/home/consept/tmp/fuzz/ -max_total_time=$ROUND '
+            'tmp/fuzz/cluster/node-1 tmp/fuzz/corpus >> tmp/fuzz/cluster/node-1.log 2>&1'
+            in commands)
+    assert ('tmp/fuzz/fuzz_output -merge=1 tmp/fuzz/corpus tmp/fuzz/cluster/node-1 '
+            '>> tmp/fuzz/cluster/node-1.merge.log 2>&1' in commands)
+    assert commands[-1] == 'done'
+
+
+def test_node_stats():
+    """
+    Tests the `node_stats()` function through checking if
+    the executions of all rounds of a node are added up
+    """
+    cluster = FuzzCluster(FuzzHandler(test=True), 1)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        cluster.path_cluster_folder = temp_dir
+        assert cluster.node_stats(0) is None
+
+        with open(os.path.join(temp_dir, 'node-0.log'), 'w', encoding='utf-8') as file:
+            file.write('#2\tINITED cov: 10 ft: 10 corp: 1/1b exec/s: 0 rss: 30Mb\n'
+                       '#1000\tDONE   cov: 20 ft: 22 corp: 3/9b lim: 4 exec/s: 500 rss: 31Mb\n'
+                       'INFO: Running with entropic power schedule (0xFF, 100).\n'
+                       '#4\tINITED cov: 20 ft: 22 corp: 3/9b exec/s: 0 rss: 30Mb\n'
+                       '#3000\tDONE   cov: 25 ft: 30 corp: 5/20b lim: 8 exec/s: 1500 rss: 32Mb\n')
+
+        stats = cluster.node_stats(0)
+        assert stats['execs'] == 4000
+        assert stats['cov'] == 25
+        assert stats['exec_s'] == 1500
@@ -190,3 +190,91 @@ def test_next_letter_all_letters_larger_counter():
 
     for i in range(52):
         assert fuzz_handler.next_letter() == string.ascii_lowercase[i % 26]
+
+
+def test_add_compile_command():
+    """
+    Tests the `add_compile_command()` function through checking if
+    the compile command with the requested sanitizers is added to the script
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    tuut = TuutFile(find_file_path("address_memory.cpp"))
+    fuzz_handler.open_new_script()
+
+    fuzz_handler.add_compile_command(tuut, 'memory,fuzzer')
+
+    with open(fuzz_handler.path_cur_script, 'r', encoding='utf-8') as file:
+        file_contents = file.read()
+        assert 'clang++ -g -fsanitize=memory,fuzzer -o tmp/fuzz/fuzz_output' in file_contents
+        assert '/home/consept/tmp/fuzz/address_memory.cpp' in file_contents
+
+
+def test_add_two_tier_commands():
+    """
+    Tests the `add_two_tier_commands()` function through checking if
+    the fast build runs in the background while the sanitizer builds re-check the corpus
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    tuut = TuutFile(find_file_path("address_memory.cpp"))
+    fuzz_handler.open_new_script()
+
+    fuzz_handler.add_two_tier_commands(tuut, 120)
+
+    with open(fuzz_handler.path_cur_script, 'r', encoding='utf-8') as file:
+        file_contents = file.read()
+        assert 'clang++ -g -O2 -fsanitize=fuzzer -o tmp/fuzz/fuzz_fast' in file_contents
+        assert 'clang++ -g -fsanitize=address,fuzzer -o tmp/fuzz/fuzz_asan' in file_contents
+        assert 'clang++ -g -fsanitize=memory,fuzzer -o tmp/fuzz/fuzz_msan' in file_contents
+        assert '-max_total_time=120' in file_contents
+        assert 'FAST_PID=$!' in file_contents
+        assert 'for build in asan msan; do' in file_contents
+        assert 'cp "$input" tmp/fuzz/crash-$build-$name' in file_contents
+
+
+def test_add_replay_commands():
+    """
+    Tests the `add_replay_commands()` function through checking if
+    every crash is replayed and its report is stored next to it
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    fuzz_handler.open_new_script()
+
+    fuzz_handler.add_replay_commands('fuzz_output')
+
+    with open(fuzz_handler.path_cur_script, 'r', encoding='utf-8') as file:
+        file_contents = file.read()
+        assert 'for crash in tmp/fuzz/crash-*; do' in file_contents
+        assert 'build=tmp/fuzz/fuzz_output' in file_contents
+        assert '$build "$crash" > "$crash.log" 2>&1' in file_contents
+
+
+def test_add_fuzz_command():
+    """
+    Tests the `add_fuzz_command()` function through checking if
+    crash files are written directly to the mount folder
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    fuzz_handler.open_new_script()
+
+    fuzz_handler.add_fuzz_command()
+
+    with open(fuzz_handler.path_cur_script, 'r', encoding='utf-8') as file:
+        file_contents = file.read()
+        assert ('tmp/fuzz/fuzz_output -artifact_prefix=/home/consept/tmp/fuzz/ -runs=1000'
+                in file_contents)
+
+
+def test_fuzz_command_profile_and_dictionary():
+    """
+    Tests the `fuzz_command()` function through checking if
+    the dictionary and the options of the profile are passed to the fuzzing binary
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    fuzz_handler.dictionary = '/home/consept/tmp/fuzz/dicts/file.cpp-0123.dict'
+    fuzz_handler.profile = 'throughput'
+    assert fuzz_handler.fuzz_command('fuzz_output') == (
+        'ASAN_OPTIONS=detect_leaks=0:malloc_context_size=0 tmp/fuzz/fuzz_output '
+        '-artifact_prefix=/home/consept/tmp/fuzz/ -dict=/home/consept/tmp/fuzz/dicts/file.cpp-0123.dict')
+
+    fuzz_handler.profile = 'value_profile'
+    assert fuzz_handler.fuzz_command('fuzz_output').endswith(' -use_value_profile=1')
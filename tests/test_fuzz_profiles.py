@@ -0,0 +1,58 @@
+"""
+Creates test cases for the fuzzing profiles module
+"""
+import os
+import tempfile
+
+import src.fuzz_profiles
+from src.fuzz_profiles import ProfileSelector, FUZZ_PROFILES, score_trial
+
+TRIAL_LOG = ('INFO: Seed: 1\n'
+             '#2\tINITED cov: 10 ft: 10 corp: 1/1b exec/s: 0 rss: 30Mb\n'
+             '#64\tNEW    cov: 25 ft: 30 corp: 4/9b lim: 4 exec/s: 0 rss: 30Mb\n'
+             '#4096\tpulse  cov: 40 ft: 52 corp: 9/30b lim: 8 exec/s: 2048 rss: 31Mb\n')
+
+
+def test_score_trial():
+    """
+    Tests the `score_trial()` function through checking if
+    a trial is scored on its coverage growth per second
+    """
+    assert score_trial(TRIAL_LOG, 10) == 3.0
+    assert score_trial('INFO: Seed: 1\n', 10) == 0.0
+
+
+def test_trial_commands():
+    """
+    Tests the `trial_commands()` function through checking if
+    every profile is tried in parallel with its own options and corpus
+    """
+    selector = ProfileSelector('.', 'file.cpp:func', 15)
+    commands = selector.trial_commands('fuzz_output', '-artifact_prefix=/home/consept/tmp/fuzz/')
+
+    assert len([command for command in commands if command.endswith('&')]) == len(FUZZ_PROFILES)
+    assert ('tmp/fuzz/fuzz_output -max_total_time=15 -artifact_prefix=/home/consept/tmp/fuzz/ '
+            '-entropic=0 tmp/fuzz/trials/no_entropic > tmp/fuzz/trials/no_entropic.log 2>&1 &'
+            in commands)
+    assert any(command.startswith('ASAN_OPTIONS=detect_leaks=0:malloc_context_size=0 ')
+               for command in commands)
+    assert commands[-1] == 'wait'
+
+
+def test_select_and_stored_profile(monkeypatch):
+    """
+    Tests the `select()` and `stored_profile()` functions through checking if
+    the profile with the highest coverage growth wins and is stored for the target
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monkeypatch.setattr(src.fuzz_profiles, 'PATH_PROFILE_STORE',
+                            os.path.join(temp_dir, 'profiles.json'))
+        os.makedirs(os.path.join(temp_dir, 'trials'))
+        with open(os.path.join(temp_dir, 'trials', 'no_cmp.log'), 'w', encoding='utf-8') as file:
+            file.write(TRIAL_LOG)
+
+        selector = ProfileSelector(temp_dir, 'file.cpp:func', 10)
+        assert selector.stored_profile() is None
+        assert selector.select() == 'no_cmp'
+        assert ProfileSelector(temp_dir, 'file.cpp:func').stored_profile() == 'no_cmp'
+        assert ProfileSelector(temp_dir, 'file.cpp:other').stored_profile() is None
@@ -0,0 +1,82 @@
+"""
+Creates test cases for the fuzzing statistics module
+"""
+import os
+import json
+import tempfile
+
+from src.fuzz_stats import FuzzStatsMonitor, parse_status_line
+
+
+def test_parse_status_line():
+    """
+    Tests the `parse_status_line()` function through checking if all statistics are
+    extracted from a libFuzzer status line
+    """
+    line = '#4096\tNEW    cov: 12 ft: 14 corp: 5/2Kb lim: 4 exec/s: 2048 rss: 31Mb L: 2/2 MS: 1'
+    assert parse_status_line(line) == {'execs': 4096, 'event': 'NEW', 'cov': 12, 'ft': 14,
+                                       'corp': 5, 'corp_bytes': 2048, 'exec_s': 2048,
+                                       'rss_mb': 31}
+
+
+def test_parse_fork_status_line():
+    """
+    Tests the `parse_status_line()` function through checking if the statistics are
+    extracted from a status line of libFuzzer in fork mode, and if they are summarised
+    without the memory use
+    """
+    line = ('#1048576: cov: 120 ft: 340 corp: 85 exec/s 52428 oom/timeout/crash: 0/0/1 '
+            'time: 20s job: 4 dft_time: 0')
+    stats = parse_status_line(line)
+    assert stats == {'execs': 1048576, 'event': 'FORK', 'cov': 120, 'ft': 340, 'corp': 85,
+                     'corp_bytes': None, 'exec_s': 52428, 'rss_mb': None}
+
+    stats['time'] = 20.0
+    assert FuzzStatsMonitor.summary_line(stats) == \
+        '[fuzz     20.0s] execs: 1048576 exec/s: 52428 cov: 120 ft: 340 corp: 85'
+
+
+def test_parse_status_line_no_status():
+    """
+    Tests the `parse_status_line()` function through checking if lines that are not
+    status lines are ignored
+    """
+    assert parse_status_line('INFO: Seed: 1234') is None
+    assert parse_status_line('==1==ERROR: AddressSanitizer: heap-use-after-free') is None
+
+
+def test_feed_chunks_and_jsonl():
+    """
+    Tests the `feed()` function through checking if status lines that are split over
+    several chunks end up in the time series and the JSONL file
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_jsonl = os.path.join(temp_dir, 'stats.jsonl')
+        monitor = FuzzStatsMonitor(path_jsonl, live=False)
+
+        monitor.feed(b'INFO: Seed: 1\r\n#2\tINITED cov: 3 ft: 3 corp: 1/1b exec/s: 0 rss: 30')
+        monitor.feed(b'Mb\r\n#16\tNEW    cov: 4 ft: 5 corp: 2/3b lim: 4 exec/s: 0 rss: 30Mb\r\n')
+        monitor.feed(b'#1024\tpulse  cov: 4 ft: 5 corp: 2/3b lim: 4 exec/s: 512 rss: 31Mb')
+        monitor.close()
+
+        assert [stats['execs'] for stats in monitor.series] == [2, 16, 1024]
+        with open(path_jsonl, 'r', encoding='utf-8') as file:
+            lines = [json.loads(line) for line in file]
+        assert [stats['cov'] for stats in lines] == [3, 4, 4]
+        assert lines[2]['exec_s'] == 512
+
+
+def test_exec_s_collapse_alert():
+    """
+    Tests the collapse detection through checking if exactly one alert is raised when
+    exec/s drops below the collapse ratio of its peak and does not recover
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        monitor = FuzzStatsMonitor(os.path.join(temp_dir, 'stats.jsonl'), 0.5, live=False)
+        for execs, exec_s in [(1000, 1000), (2000, 900), (2100, 100), (2200, 90), (4000, 800)]:
+            monitor.process_line(f'#{execs}\tpulse  cov: 4 ft: 5 corp: 2/3b exec/s: {exec_s} '
+                                 'rss: 31Mb')
+
+        assert len(monitor.alerts) == 1
+        assert 'exec/s collapsed to 100 (peak 1000)' in monitor.alerts[0]
+        assert not monitor.collapsed
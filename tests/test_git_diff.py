@@ -0,0 +1,73 @@
+"""
+Creates test cases for the git diff module
+"""
+import os
+import subprocess
+import tempfile
+
+import pytest
+
+from src.utils.git_diff import changed_lines, git_diff
+
+DIFF = '''diff --git a/src/game.cpp b/src/game.cpp
+index 1111111..2222222 100644
+--- a/src/game.cpp
++++ b/src/game.cpp
+@@ -12,0 +13,2 @@ int move(int x)
++    if (x > 3)
++        return 0;
+@@ -20 +22 @@ int move(int x)
+-    return x;
++    return x + 1;
+@@ -30,2 +31,0 @@ int draw()
+-    clear();
+-    flush();
+diff --git a/src/old.cpp b/src/old.cpp
+deleted file mode 100644
+--- a/src/old.cpp
++++ /dev/null
+@@ -1,3 +0,0 @@
+-int old()
+-{
+-}
+'''
+
+
+def test_changed_lines():
+    """
+    Tests the `changed_lines()` function through checking the ranges of the added and changed
+    lines of a diff, where removed lines and removed files have no changed lines
+    """
+    assert changed_lines(DIFF) == {'src/game.cpp': [(13, 14), (22, 22)]}
+    assert changed_lines('') == {}
+
+
+def test_git_diff():
+    """
+    Tests the `git_diff()` function through checking the changed lines of a commit in a git
+    repository, relative to the folder of the project inside the repository
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project_root = os.path.join(temp_dir, 'project')
+        os.makedirs(project_root)
+        path_source = os.path.join(project_root, 'game.cpp')
+
+        def commit(content):
+            with open(path_source, 'w', encoding='utf-8') as file:
+                file.write(content)
+            subprocess.run(['git', '-C', temp_dir, 'add', '-A'], check=True)
+            subprocess.run(['git', '-C', temp_dir, '-c', 'user.name=test', '-c',
+                            'user.email=test@example.com', 'commit', '-q', '-m', 'change'],
+                           check=True)
+
+        subprocess.run(['git', 'init', '-q', temp_dir], check=True)
+        commit('int a;\nint b;\nint c;\n')
+        commit('int a;\nint b = 1;\nint c;\nint d;\n')
+
+        assert changed_lines(git_diff(project_root, 'HEAD~1..HEAD')) == \
+            {'game.cpp': [(2, 2), (4, 4)]}
+
+        # git explains why it can not diff an unknown revision range
+        with pytest.raises(subprocess.CalledProcessError) as error:
+            git_diff(project_root, 'HEAD~5..HEAD')
+        assert 'HEAD~5' in error.value.stderr
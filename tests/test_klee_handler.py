@@ -15,6 +15,7 @@ from unittest.mock import patch
 from application_manager import ApplicationManager
 
 from src.klee_handler import KLEEHandler
+from src.target_catalog import TargetCatalog
 PATH_ABSOLUTE   = str(Path(os.path.realpath(__file__)).parent)
 PATH_CONSEPT    = str(Path(PATH_ABSOLUTE).parents[0])
 sys.path.append(PATH_CONSEPT)
@@ -48,6 +49,83 @@ def test_annotate_variables_if_statement_1(monkeypatch):
     os.remove(output_file_path)
 
 
+def test_annotate_variables_catalog(monkeypatch):
+    """
+    Tests the `annotate_variables()` function through checking if
+    the variables of main are taken from the catalog on a second run
+    """
+    file_path = os.path.join(FILEFOLDER, "if-statement-1.cpp")
+    monkeypatch.setattr('builtins.input', lambda _: "1")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TargetCatalog(os.path.join(temp_dir, 'catalog.sqlite3'))
+        output_file_path = os.path.join(temp_dir, 'annotated.cpp')
+        klee_handler.annotate_variables(file_path, output_file_path, catalog)
+        with open(output_file_path, 'r', encoding='utf-8') as file:
+            expected = file.read()
+
+        monkeypatch.setattr(klee_handler, 'find_main_variables', MagicMock(side_effect=AssertionError))
+        klee_handler.annotate_variables(file_path, output_file_path, catalog)
+        with open(output_file_path, 'r', encoding='utf-8') as file:
+            assert file.read() == expected
+        catalog.close()
+
+def test_annotate_variables_include_klee(monkeypatch):
+    """
+    Tests the `annotate_variables()` function through checking if
+    the KLEE library is included in the same write as the annotations
+    """
+    file_path = os.path.join(FILEFOLDER, "if-statement-1.cpp")
+    monkeypatch.setattr('builtins.input', lambda _: "1")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file_path = os.path.join(temp_dir, 'annotated.cpp')
+        klee_handler.annotate_variables(file_path, output_file_path, include_klee=True)
+        with open(output_file_path, 'r', encoding='utf-8') as file:
+            file_contents = file.readlines()
+        assert file_contents[:2] == ['#include <stdio.h>\n', '#include <klee/klee.h>\n']
+        assert '\tklee_make_symbolic(&x, sizeof(x), "x");\n' in file_contents
+
+def test_annotate_variables_branch_relevant(monkeypatch):
+    """
+    Tests the `annotate_variables()` function through checking if
+    choice 3 only annotates the variables that flow into branches
+    """
+    file_path = os.path.join(FILEFOLDER, "if-statement-1.cpp")
+    monkeypatch.setattr('builtins.input', lambda _: "3")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file_path = os.path.join(temp_dir, 'annotated.cpp')
+        klee_handler.annotate_variables(file_path, output_file_path)
+        with open(output_file_path, 'r', encoding='utf-8') as file:
+            file_contents = file.read()
+        assert 'klee_make_symbolic(&x, sizeof(x), "x");' in file_contents
+        assert 'klee_make_symbolic(&result' not in file_contents
+
+def test_annotate_variables_guarded():
+    """
+    Tests the `annotate_variables()` and `selection_mask()` functions through checking if
+    every variable is annotated behind its runtime guard and selections map to their bits
+    """
+    file_path = os.path.join(FILEFOLDER, "if-statement-1.cpp")
+    handler = KLEEHandler(test=True)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output_file_path = os.path.join(temp_dir, 'annotated.cpp')
+        handler.annotate_variables(file_path, output_file_path, guarded=True)
+        with open(output_file_path, 'r', encoding='utf-8') as file:
+            file_contents = file.read()
+        assert 'static int consept_symbolic(int index)' in file_contents
+        assert file_contents.index('consept_symbolic(int') < file_contents.index('int main()')
+        assert 'if (consept_symbolic(0)) klee_make_symbolic(&x, sizeof(x), "x");' in file_contents
+        assert 'if (consept_symbolic(1)) klee_make_symbolic(&result' in file_contents
+
+    assert handler.selection_mask('all') == 0b11
+    assert handler.selection_mask('branch', file_path) == 0b01
+    assert handler.selection_mask('result, x') == 0b11
+    assert KLEEHandler.output_folders({'sel0': 1, 'sel1': 3}) == ['klee-out-sel0', 'klee-out-sel1']
+    assert KLEEHandler.output_folders() == ['klee-out-0']
+
 def test_annotate_variables_if_statement_1_2(monkeypatch):
     """
     Tests the `annotate_variables()` function through checking if
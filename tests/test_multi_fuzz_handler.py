@@ -0,0 +1,79 @@
+"""
+Creates test cases for the multi-target libfuzzer module
+"""
+import os
+import tempfile
+
+from src.utils.misc import find_file_path
+from src.multi_fuzz_handler import MultiTargetFuzzHandler, fuzzable_rows
+from src.tuut_file import TuutFile
+
+
+def test_fuzzable_rows():
+    """
+    Tests the `fuzzable_rows()` function through checking if
+    only functions with parameters are targeted, ordered by their row
+    """
+    test_func_details = {22: ['test_method_3', 2, [['short', '', -1], ['long', '', -1]]],
+                         6: ['test_method_1', 1, [['constantarray', 'char', 3]]],
+                         26: ['test_method_4', 0, []]}
+    assert fuzzable_rows(test_func_details) == [6, 22]
+
+
+def test_annotate_fuzz_multi_address_memory():
+    """
+    Tests the `annotate_fuzz_multi()` function through checking if
+    the fuzz target of address_memory.cpp dispatches to all three functions
+    """
+    fuzz_handler = MultiTargetFuzzHandler(test=True)
+    tuut = TuutFile(find_file_path("address_memory.cpp"))
+    tuut.gen_func_info()
+
+    assert fuzz_handler.annotate_fuzz_multi(tuut) == [7, 14, 25]
+
+    with open(tuut.path_fuzz_annotated, 'r', encoding='utf-8') as file:
+        file_contents = file.read()
+        assert 'switch(Data[0] % 3){' in file_contents
+        assert 'case 0: {' in file_contents
+        assert 'if(Size == 7){' in file_contents
+        assert 'memcpy(a, Data + 1, 6);' in file_contents
+        assert 'print_elements(a);' in file_contents
+        assert 'case 2: {' in file_contents
+        assert 'createAndFreeMemory(c[0]);' in file_contents
+
+
+def test_target_of_input_and_split_corpus(monkeypatch):
+    """
+    Tests the `split_corpus()` function through checking if
+    corpus entries are attributed to the function selected by their first byte
+    """
+    fuzz_handler = MultiTargetFuzzHandler(test=True)
+    fuzz_handler.targets = [7, 14, 25]
+    with tempfile.TemporaryDirectory() as temp_dir:
+        # the corpus of the mount folder is left alone
+        monkeypatch.setattr(MultiTargetFuzzHandler, 'path_mount_folder',
+                            property(lambda _: temp_dir))
+        path_corpus = os.path.join(temp_dir, 'corpus')
+        os.makedirs(path_corpus)
+
+        for name, content in {'in_a': b'\x00abcdef', 'in_b': b'\x04x', 'in_c': b'\x05y',
+                              'in_d': b'\x02z', 'in_e': b''}.items():
+            with open(os.path.join(path_corpus, name), 'wb') as file:
+                file.write(content)
+
+        assert fuzz_handler.target_of_input(os.path.join(path_corpus, 'in_b')) == 14
+        assert fuzz_handler.split_corpus() == {7: 1, 14: 1, 25: 2}
+        assert sorted(os.listdir(os.path.join(temp_dir, 'targets', '25'))) == ['in_c', 'in_d']
+
+
+def test_parse_target_coverage():
+    """
+    Tests the `parse_target_coverage()` function through checking if
+    the coverage of the replay following a target marker is attributed to that target
+    """
+    output = ('CONSEPT_TARGET 7\r\n'
+              '#2\tINITED cov: 11 ft: 12 corp: 3/20b exec/s: 0 rss: 30Mb\r\n'
+              'CONSEPT_TARGET 14\r\n'
+              'INFO: A corpus is not provided, starting from an empty corpus\r\n'
+              '#1\tINITED cov: 4 ft: 4 corp: 1/1b exec/s: 0 rss: 30Mb\r\n')
+    assert MultiTargetFuzzHandler.parse_target_coverage(output) == {7: 11, 14: 4}
@@ -0,0 +1,108 @@
+"""
+Creates test cases for the mutant coverage module
+"""
+import os
+import subprocess
+import tempfile
+
+from src.mutant_coverage import read_coverage, select_tests, summary, write_selection
+
+# the script that runs the tests of a mutant in the mutation container
+PATH_TEST_SCRIPT = os.path.join(os.path.dirname(__file__), '..', 'tmp', 'mutation', 'test.sh')
+
+
+def test_read_coverage():
+    """
+    Tests the `read_coverage()` function through checking the tests per covered line of the
+    files of the project, without the files outside it
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'test_coverage.txt')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write('test_move\t/project/src/game.cpp\t10\n'
+                       'test_draw\t/project/src/game.cpp\t10\n'
+                       'test_draw\t/project/build/../src/board.cpp\t3\n'
+                       'test_draw\t/usr/include/c++/11/vector\t100\n'
+                       'incomplete line\n')
+
+        assert read_coverage(path, '/project') == {
+            'src/game.cpp': {10: {'test_move', 'test_draw'}},
+            'src/board.cpp': {3: {'test_draw'}},
+        }
+        assert read_coverage(os.path.join(temp_dir, 'missing.txt'), '/project') == {}
+
+
+def test_select_tests_and_summary():
+    """
+    Tests the `select_tests()`, `write_selection()` and `summary()` functions through checking
+    the uncovered mutants and the covering tests of the other mutants, ordered by their kills
+    """
+    coverage = {'src/game.cpp': {10: {'test_move', 'test_draw'}, 12: {'test_undo'}}}
+    mutants = [(1, 'src/game.cpp', 10, 10), (2, 'src/game.cpp', 11, 12),
+               (3, 'src/game.cpp', 11, 11), (4, 'src/board.cpp', 10, 10)]
+    kills = [('test_draw', 5), ('test_move', 2), ('test_quit', 0)]
+
+    uncovered, selection = select_tests(mutants, coverage, kills)
+    assert uncovered == [3, 4]
+    assert selection == {1: ['test_draw', 'test_move'], 2: ['test_undo']}
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'mutant_tests.txt')
+        write_selection(path, selection, mutants, {1: 18446744073709551615})
+        with open(path, 'r', encoding='utf-8') as file:
+            assert file.read() == ('18446744073709551615\tsrc/game.cpp\t10\t10\ttest_draw\t'
+                                   'test_move\n-\tsrc/game.cpp\t11\t12\ttest_undo\n')
+
+    assert summary(uncovered, selection) == (
+        'Test coverage: 2 of 4 mutant(s) are not covered by any test and not tested, the '
+        'other 2 run 1.5 of 3 covering test(s) on average')
+
+
+def test_selection_lookup_of_test_script():
+    """
+    Tests the lookup of the tests of a mutant by test.sh through checking the tests it runs
+    for a mutant told by its checksum in DEXTOOL_MUTID, for a mutant written to its file and
+    for a mutant without selected tests
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        project = os.path.join(temp_dir, 'project')
+        os.makedirs(os.path.join(project, 'build'))
+        os.makedirs(os.path.join(project + '.pristine', 'src'))
+        os.makedirs(os.path.join(project, 'src'))
+        source = ''.join(f'int line{number};\n' for number in range(1, 15))
+        for root in [project, project + '.pristine']:
+            with open(os.path.join(root, 'src', 'game.cpp'), 'w', encoding='utf-8') as file:
+                file.write(source)
+        write_selection(os.path.join(temp_dir, 'mutant_tests.txt'),
+                        {1: ['test_draw', 'test_move'], 2: ['test_undo', 'test_draw']},
+                        [(1, 'src/game.cpp', 10, 10), (2, 'src/game.cpp', 11, 12)],
+                        {1: 18446744073709551615, 2: 18446744073709551614})
+
+        # a fake ctest records the tests it is asked to run
+        with open(os.path.join(temp_dir, 'ctest'), 'w', encoding='utf-8') as file:
+            file.write(f'#!/bin/bash\necho "$@" >> {temp_dir}/ctest.log\n')
+        os.chmod(os.path.join(temp_dir, 'ctest'), 0o755)
+
+        def run_tests(mutant_id=''):
+            environment = dict(os.environ, PATH=f'{temp_dir}:{os.environ["PATH"]}',
+                               EDITED_USER_PROJECT_PATH=project,
+                               MOUNTED_MUTATION_FOLDER=temp_dir, DEXTOOL_MUTID=mutant_id)
+            subprocess.run(['bash', PATH_TEST_SCRIPT], env=environment, check=True)
+            with open(os.path.join(temp_dir, 'ctest.log'), 'r', encoding='utf-8') as file:
+                runs = file.read().splitlines()
+            os.remove(os.path.join(temp_dir, 'ctest.log'))
+            return runs
+
+        assert run_tests('18446744073709551614') == [
+            '--output-on-failure -R ^test_undo$', '--output-on-failure -R ^test_draw$']
+
+        # the mutant on line 10 is written to the file, the sources are unchanged otherwise
+        with open(os.path.join(project, 'src', 'game.cpp'), 'w', encoding='utf-8') as file:
+            file.write(source.replace('int line10;', 'int line10 = 1;'))
+        assert run_tests() == [
+            '--output-on-failure -R ^test_draw$', '--output-on-failure -R ^test_move$']
+
+        # without selected tests the whole test suite runs
+        with open(os.path.join(project, 'src', 'game.cpp'), 'w', encoding='utf-8') as file:
+            file.write(source.replace('int line3;', 'int line3 = 1;'))
+        assert run_tests() == ['--output-on-failure']
@@ -0,0 +1,76 @@
+"""
+Creates test cases for the mutant equivalence module
+"""
+import json
+import os
+import tempfile
+
+from src.mutant_equivalence import TrivialCompilerEquivalence, object_commands
+
+COMPILE_DB = [{'directory': '/editedUserProject/game/build',
+               'command': '/usr/bin/c++ -I/editedUserProject/game/include -g -O0 '
+                          '-o CMakeFiles/game.dir/src/game.cpp.o -c ../src/game.cpp',
+               'file': '../src/game.cpp'}]
+
+
+def test_object_commands():
+    """
+    Tests the `object_commands()` function through checking if a file is compiled with
+    optimisations, without debug information, to the object that is hashed
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_compile_db = os.path.join(temp_dir, 'compile_commands.json')
+        with open(path_compile_db, 'w', encoding='utf-8') as file:
+            json.dump(COMPILE_DB, file)
+
+        assert object_commands(path_compile_db, '/editedUserProject/game') == {
+            'src/game.cpp': '(cd /editedUserProject/game/build && /usr/bin/c++ '
+                            '-I/editedUserProject/game/include ../src/game.cpp -O2 -c -o '
+                            '/tmp/consept_tce.o)'}
+
+
+def test_script():
+    """
+    Tests the `script()` function through checking if the original file and every mutant are
+    compiled and hashed, and if the original file is restored after every mutant
+    """
+    tce = TrivialCompilerEquivalence({'src/game.cpp': 'compile'}, '/tmp/hashes.txt')
+    lines = tce.script([(3, 'src/game.cpp', 1), (4, 'test/test.cpp', 1)])
+
+    assert lines[0] == ': > /tmp/hashes.txt'
+    assert lines[1] == 'cp src/game.cpp /tmp/consept_tce_source'
+    assert lines[2].startswith('compile && echo "0 src/game.cpp $(sha256sum')
+    assert 'if dextool mutate generate --id 3; then' in lines
+    assert lines[-1] == 'cp /tmp/consept_tce_source src/game.cpp'
+
+    # the mutants of files without compile command are not compiled
+    assert not any('--id 4' in line for line in lines)
+
+
+def test_classify_and_summary():
+    """
+    Tests the `classify()` and `summary()` functions through checking the equivalent, duplicate
+    and not compiling mutants of a hashes file
+    """
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', encoding='utf-8',
+                                     delete=False) as file:
+        file.write('0 src/game.cpp aaa\n'
+                   '1 src/game.cpp aaa\n'
+                   '2 src/game.cpp bbb\n'
+                   '5 src/game.cpp bbb\n'
+                   '3 src/game.cpp failed\n'
+                   '4 src/game.cpp ccc\n'
+                   '6 src/draw.cpp aaa\n')
+        path_hashes = file.name
+
+    statuses, duplicates = TrivialCompilerEquivalence.classify(path_hashes)
+    os.remove(path_hashes)
+
+    # without the object of the original draw.cpp its mutant is tested
+    assert statuses == {1: 'equivalent', 3: 'killedByCompiler', 5: 'skipped'}
+    assert duplicates == {5: 2}
+    assert TrivialCompilerEquivalence.classify(path_hashes) == ({}, {})
+
+    assert TrivialCompilerEquivalence.summary(6, statuses) == (
+        'Trivial compiler equivalence: 6 mutant(s) compiled, 1 equivalent to the original, '
+        '1 duplicate(s), 1 killed by the compiler; 3 (50.0%) are not tested')
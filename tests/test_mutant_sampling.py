@@ -0,0 +1,95 @@
+"""
+Creates test cases for the mutant sampling module
+"""
+import argparse
+
+import pytest
+
+from src.mutant_sampling import allocate, draw, estimate, sample_size, sample_spec, summary
+
+
+def population_of(files):
+    """
+    Returns a population of (id, path, kind) mutants with the given number of mutants per
+    file, every mutant of kind rorLT
+    """
+    mutants = []
+    for path, count in files.items():
+        mutants += [(len(mutants) + number, path, 1) for number in range(1, count + 1)]
+    return mutants
+
+
+def test_sample_spec():
+    """
+    Tests the `sample_spec()` function through checking that positive numbers and percentages
+    up to 100 are accepted and anything else is rejected
+    """
+    assert sample_spec('200') == '200'
+    assert sample_spec('2.5%') == '2.5%'
+    assert sample_spec('100%') == '100%'
+    for value in ['0', '-5', '10.5', 'ten', '%', '0%', '150%', 'x%']:
+        with pytest.raises(argparse.ArgumentTypeError):
+            sample_spec(value)
+
+
+def test_sample_size():
+    """
+    Tests the `sample_size()` function through checking sizes given as a number and as a
+    percentage of the population
+    """
+    assert sample_size('200', 1000) == 200
+    assert sample_size('200', 50) == 50
+    assert sample_size('10%', 1000) == 100
+    assert sample_size('10%', 15) == 2
+    assert sample_size('0%', 15) == 1
+    assert sample_size('10%', 0) == 0
+
+
+def test_allocate():
+    """
+    Tests the `allocate()` function through checking the proportional allocation of a sample
+    over strata, with at least one mutant per stratum
+    """
+    assert allocate({'a': 50, 'b': 30, 'c': 20}, 10) == {'a': 5, 'b': 3, 'c': 2}
+    assert allocate({'a': 97, 'b': 2, 'c': 1}, 10) == {'a': 8, 'b': 1, 'c': 1}
+    assert allocate({'a': 5, 'b': 5}, 1) == {'a': 1, 'b': 0}
+    assert sum(allocate({'a': 7, 'b': 7, 'c': 7}, 10).values()) == 10
+
+
+def test_draw():
+    """
+    Tests the `draw()` function through checking if a sample stratified by file takes its
+    share of every file and if a seed gives the same sample every time
+    """
+    population = population_of({'src/game.cpp': 60, 'src/board.cpp': 40})
+    sample = draw(population, 10, ['file'], seed=3)
+    assert sample == draw(population, 10, ['file'], seed=3)
+    assert sample == sorted(sample)
+    assert len([status_id for status_id in sample if status_id <= 60]) == 6
+    assert len([status_id for status_id in sample if status_id > 60]) == 4
+    assert draw(population, 100, ['operator']) == list(range(1, 101))
+
+
+def test_estimate_and_summary():
+    """
+    Tests the `estimate()` and `summary()` functions through checking the estimated score and
+    its confidence interval with the finite population correction, without and with strata
+    """
+    population = population_of({'src/game.cpp': 4, 'src/board.cpp': 6})
+    results = {1: 'killed', 2: 'killed', 5: 'timeout', 6: 'alive'}
+
+    # p = 0.75 of n = 4 of N = 10: margin = 1.96 * sqrt((1 - 4/10) * 0.75 * 0.25 / 3)
+    estimated = estimate(population, [1, 2, 5, 6], results)
+    assert estimated == {'score': 75.0, 'low': 37.04, 'high': 100.0, 'margin': 37.96,
+                         'population': 10, 'tested': 4}
+    assert summary(estimated) == ('Estimated mutation score 75.00% ± 37.96 (95% confidence '
+                                  'interval 37.04% - 100.00%) from 4 of 10 mutant(s)')
+
+    # game.cpp has p = 1 with weight 0.4, board.cpp p = 0.5 of n = 2 of N = 6 with weight 0.6
+    estimated = estimate(population, [1, 2, 5, 6], results, ['file'])
+    assert estimated['score'] == 70.0
+    assert estimated['margin'] == 48.01
+
+    assert estimate(population, [3], {3: 'skipped'})['score'] is None
+    assert summary(estimate(population, [], {})) == \
+        'No sampled mutant of the 10 mutant(s) has a result'
@@ -4,6 +4,7 @@ Creates test cases for the mutation module
 import tempfile
 import os
 import toml
+from application_manager import ApplicationManager
 from mutation_handler import DextoolHandler
 
 FILEFOLDER = "sample_inputs"
@@ -223,3 +224,66 @@ def test_annotate_config_file():
         config = toml.load(file)
         assert config["workarea"]["root"] == "."
         assert config["database"]["db"] == 'dextool_mutate.sqlite3'
+
+def test_container_environment():
+    '''
+    Method to test if the project paths are given to the mutation container at run time
+    '''
+    environment = ApplicationManager.container_environment('mutation', '/home/user/project')
+    assert environment['USER_PROJECT_PATH'] == '/home/user/project'
+    assert environment['EDITED_USER_PROJECT_PATH'] == '/editedUserProject/project'
+    assert environment['MOUNTED_MUTATION_FOLDER'] == '/home/consept/tmp/mutation'
+    assert environment['PARENT_FOLDER_OF_USER_PROJECT'] == '/editedUserProject'
+
+    # a trailing separator does not change the name of the edited project
+    environment = ApplicationManager.container_environment('mutation', '/home/user/other/')
+    assert environment['EDITED_USER_PROJECT_PATH'] == '/editedUserProject/other'
+
+    # the other tools need no environment
+    assert ApplicationManager.container_environment('fuzz') is None
+
+def test_database_name():
+    '''
+    Method to test if every project gets its own Dextool database that is kept across runs
+    '''
+    name = mutation_handler.database_name('/home/user/project')
+    assert name.startswith('project-') and name.endswith('.sqlite3')
+    assert name == mutation_handler.database_name('/home/user/project')
+    assert name != mutation_handler.database_name('/home/other/project')
+
+    # the database is kept on the host in the mounted folder
+    path = mutation_handler.database_path('/home/user/project')
+    assert path == os.path.join(mutation_handler.path_mount_folder, 'databases', name)
+
+def test_volumes():
+    '''
+    Method to test if the build tree of a project and the compiler cache are kept in volumes
+    '''
+    volumes = mutation_handler.volumes('/home/user/project')
+    key = mutation_handler.project_key('/home/user/project')
+    assert volumes['/editedUserProject/project/build'] == f'consept_mutation_build_{key}'
+    assert volumes['/ccache'] == 'consept_ccache'
+
+    # every shard has a build tree of its own, the compiler cache is shared
+    volumes = mutation_handler.volumes('/home/user/project', 2)
+    assert volumes['/editedUserProject/project/build'] == f'consept_mutation_build_{key}_shard_2'
+    assert volumes['/ccache'] == 'consept_ccache'
+
+    # the names of volumes only have letters, digits, '_', '.' and '-'
+    assert mutation_handler.project_key('/home/user/my project').startswith('my_project-')
+
+
+def test_build_summary():
+    '''
+    Method to test if the durations of the builds of a run are summarised
+    '''
+    with tempfile.NamedTemporaryFile(mode='w', suffix='.txt', encoding='utf-8', delete=False
+                                     ) as file:
+        file.write('12.5\n0.5\n1.0\n')
+        path_build_times = file.name
+
+    summary = mutation_handler.build_summary(path_build_times)
+    assert summary == '3 build(s) in 14.0 s, mean 4.7 s, first 12.5 s, slowest 12.5 s'
+
+    os.remove(path_build_times)
+    assert mutation_handler.build_summary(path_build_times) == 'No builds were run'
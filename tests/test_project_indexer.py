@@ -0,0 +1,89 @@
+"""
+Creates test cases for the project indexer module
+"""
+import json
+import os
+import tempfile
+
+import src.project_indexer
+from src.project_indexer import ProjectIndexer, index_file
+from src.target_catalog import TargetCatalog
+
+SOURCE = '''int classify(int a, int b) {
+    if (a > 0 && b > 0) {
+        return 1;
+    }
+    for (int i = 0; i < a; i++) {
+        b += i;
+    }
+    return a > b ? 2 : 3;
+}
+
+void fill(char *buffer) {
+    buffer[0] = 0;
+}
+
+int main() {
+    int x = 1;
+    char y[4];
+    return classify(x, 2);
+}
+'''
+
+
+def write_project(temp_dir):
+    """
+    Writes a source file and its compile database to temp_dir and returns the path of the
+    compile database
+    """
+    with open(os.path.join(temp_dir, 'main.cpp'), 'w', encoding='utf-8') as file:
+        file.write(SOURCE)
+    path_compile_db = os.path.join(temp_dir, 'compile_commands.json')
+    with open(path_compile_db, 'w', encoding='utf-8') as file:
+        json.dump([{'directory': temp_dir, 'file': 'main.cpp',
+                    'command': 'clang++ -DNDEBUG -c main.cpp -o main.o'}], file)
+    return path_compile_db
+
+
+def test_index_file():
+    """
+    Tests the `index_file()` function through checking if
+    the functions get their metrics and the variables of main are symbolic candidates
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        write_project(temp_dir)
+        file_path, targets = index_file({'file': os.path.join(temp_dir, 'main.cpp'),
+                                         'args': ['-DNDEBUG']})
+
+        assert file_path == os.path.join(temp_dir, 'main.cpp')
+        targets = {target['name']: target for target in targets}
+        assert set(targets) == {'classify', 'fill', 'x', 'y'}
+
+        # if, &&, for and ?: each add a path
+        assert targets['classify']['cyclomatic'] == 5
+        assert targets['classify']['fuzzable'] == 1
+        assert targets['classify']['input_bytes'] == 8
+        assert targets['fill']['fuzzable'] == 0
+        assert (targets['y']['kind'], targets['y']['input_bytes']) == ('variable', 4)
+
+
+def test_run_only_parses_changed_files(monkeypatch):
+    """
+    Tests the `run()` and `query()` functions through checking if
+    the targets can be queried and unchanged files are not parsed again
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TargetCatalog(os.path.join(temp_dir, 'catalog.sqlite3'))
+        indexer = ProjectIndexer(write_project(temp_dir), workers=1, catalog=catalog)
+
+        assert indexer.run() == [os.path.join(temp_dir, 'main.cpp')]
+        fuzzable = indexer.query(kind='function', fuzzable=True)
+        assert [target['name'] for target in fuzzable] == ['classify']
+        assert [param['type'] for param in fuzzable[0]['params']] == ['int', 'int']
+        assert [target['name'] for target in indexer.query(min_cyclomatic=2)] == ['classify']
+
+        def fail(*_args, **_kwargs):
+            raise AssertionError('file should not be parsed again')
+        monkeypatch.setattr(src.project_indexer, 'ProcessPoolExecutor', fail)
+        assert indexer.run() == []
+        catalog.close()
@@ -0,0 +1,73 @@
+"""
+Creates test cases for the sanitizer builds module
+"""
+import pytest
+
+from src.utils.misc import find_file_path
+from src.fuzz_handler import FuzzHandler
+from src.sanitizer_builds import SanitizerCampaign, replay_commands
+from src.tuut_file import TuutFile
+
+
+def test_replay_commands():
+    """
+    Tests the `replay_commands()` function through checking if
+    the crashes of every sanitizer configuration are replayed with their own build
+    """
+    commands = replay_commands('fuzz_output')
+    assert commands[0] == 'for crash in tmp/fuzz/crash-*; do'
+    assert '    build=tmp/fuzz/fuzz_output' in commands
+    assert '        tmp/fuzz/crash-asan-*) build=tmp/fuzz/fuzz_asan;;' in commands
+    assert '        tmp/fuzz/crash-asan_ubsan-*) build=tmp/fuzz/fuzz_asan_ubsan;;' in commands
+    assert commands[-1] == 'done'
+
+
+def test_add_build_commands():
+    """
+    Tests the `add_build_commands()` function through checking if
+    every configuration is compiled in the background, with UBSan set to trap
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    tuut = TuutFile(find_file_path("address_memory.cpp"))
+    fuzz_handler.open_new_script()
+
+    SanitizerCampaign(fuzz_handler, ['asan_ubsan', 'msan']).add_build_commands(tuut)
+
+    with open(fuzz_handler.path_cur_script, 'r', encoding='utf-8') as file:
+        lines = file.read().splitlines()
+        assert any(line.startswith('clang++ -g -fsanitize-trap=undefined '
+                                   '-fsanitize=address,undefined,fuzzer -o tmp/fuzz/fuzz_asan_ubsan')
+                   and line.endswith(' &') for line in lines)
+        assert any(line.startswith('clang++ -g -fsanitize=memory,fuzzer -o tmp/fuzz/fuzz_msan')
+                   and line.endswith(' &') for line in lines)
+        assert lines[-1] == 'wait'
+
+
+def test_add_fuzz_commands():
+    """
+    Tests the `add_fuzz_commands()` function through checking if
+    all builds fuzz in parallel and their artifacts are moved to crash-<config>-<artifact>
+    """
+    fuzz_handler = FuzzHandler(test=True)
+    fuzz_handler.open_new_script()
+
+    SanitizerCampaign(fuzz_handler, ['asan_ubsan', 'msan']).add_fuzz_commands(300)
+
+    with open(fuzz_handler.path_cur_script, 'r', encoding='utf-8') as file:
+        file_contents = file.read()
+        assert 'mkdir -p tmp/fuzz/corpus tmp/fuzz/artifacts/asan_ubsan tmp/fuzz/artifacts/msan' \
+            in file_contents
+        assert ('tmp/fuzz/fuzz_msan -artifact_prefix=/home/consept/tmp/fuzz/ '
+                '-artifact_prefix=/home/consept/tmp/fuzz/artifacts/msan/ -fork=1 '
+                '-ignore_crashes=1 -max_total_time=300 tmp/fuzz/corpus 2>&1 '
+                '| tee tmp/fuzz/fuzz_msan.log &') in file_contents
+        assert 'tmp/fuzz/crash-asan_ubsan-$(basename "$artifact"); done' in file_contents
+
+
+def test_unknown_sanitizer_config():
+    """
+    Tests the `SanitizerCampaign` constructor through checking if
+    unknown sanitizer configurations are rejected
+    """
+    with pytest.raises(AssertionError):
+        SanitizerCampaign(FuzzHandler(test=True), ['asan', 'tsan'])
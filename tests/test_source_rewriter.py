@@ -0,0 +1,77 @@
+"""
+Creates test cases for the source rewriter module
+"""
+import os
+import tempfile
+
+from src.fuzz_handler import FuzzHandler
+from src.tuut_file import TuutFile
+from src.utils.misc import find_file_path
+from src.utils.source_rewriter import SourceRewriter
+
+LINES = ['#include <stdio.h>\n',
+         'int main() {\n',
+         '  int x;\n',
+         '  return x;\n',
+         '}\n']
+
+
+def test_render_applies_edits_at_original_lines():
+    """
+    Tests the `render()` function through checking if
+    all edits refer to the lines as they were read, no matter in which order they are added
+    """
+    rewriter = SourceRewriter(lines=LINES)
+    rewriter.append('int f() { return 0; }\n')
+    rewriter.include('#include <stdint.h>')
+    rewriter.insert_after(3, '  x = 1;\n')
+    rewriter.comment_out(2, 5)
+    rewriter.include('#include <stdio.h>')
+
+    assert rewriter.render() == ('#include <stdio.h>\n#include <stdint.h>\n/*int main() {\n'
+                                 '  int x;\n  x = 1;\n  return x;\n}*/ \n'
+                                 'int f() { return 0; }\n')
+
+
+def test_include_without_includes():
+    """
+    Tests the `include()` function through checking if
+    the includes start a file without includes and are only added once
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'file.cpp')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.writelines(LINES[1:])
+
+        rewriter = SourceRewriter(path)
+        rewriter.include('#include <stdint.h>')
+        rewriter.include('#include <stdint.h>')
+        rewriter.write(path)
+        with open(path, 'r', encoding='utf-8') as file:
+            assert file.read() == '#include <stdint.h>\n' + ''.join(LINES[1:])
+
+
+def test_start_rewrite_writes_once():
+    """
+    Tests the `start_rewrite()` and `write_annotated()` functions through checking if
+    the collected edits give the same annotated file as editing it step by step, apart from
+    blank lines
+    """
+    tuut = TuutFile(find_file_path("if-statement-1.cpp"))
+    tuut.gen_func_info()
+
+    FuzzHandler(test=True).annotate_fuzz(tuut, 3)
+    tuut.comment_out_main()
+    tuut.include_fuzz()
+    with open(tuut.path_fuzz_annotated, 'r', encoding='utf-8') as file:
+        expected = [line for line in file if line.strip()]
+    os.remove(tuut.path_fuzz_annotated)
+
+    tuut.start_rewrite()
+    FuzzHandler(test=True).annotate_fuzz(tuut, 3)
+    tuut.comment_out_main()
+    tuut.include_fuzz()
+    assert not os.path.exists(tuut.path_fuzz_annotated)
+    tuut.write_annotated()
+    with open(tuut.path_fuzz_annotated, 'r', encoding='utf-8') as file:
+        assert [line for line in file if line.strip()] == expected
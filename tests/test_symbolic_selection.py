@@ -0,0 +1,110 @@
+"""
+Creates test cases for the symbolic selection module
+"""
+import os
+import tempfile
+
+from src.symbolic_selection import BranchVariableSelector, symbolic_bits
+from src.klee_handler import KLEEHandler
+from src.utils.misc import find_file_path
+
+SOURCE = '''int lookup(int table[8], int index) {
+    return table[index];
+}
+
+int main() {
+    int n;
+    int limit;
+    int offset;
+    int table[8];
+    int key;
+    int total = 0;
+    int i;
+    limit = n * 2;
+    for (i = 0; i < limit; i++) {
+        total += i;
+    }
+    while (offset > 0) {
+        offset--;
+    }
+    total += lookup(table, key);
+    return total;
+}
+'''
+
+
+def select_rows(source):
+    """
+    Writes the source to a temporary file and returns the variables of main, the selected
+    rows and the selector
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'file.cpp')
+        with open(path, 'w', encoding='utf-8') as file:
+            file.write(source)
+        variables = dict(KLEEHandler(test=True).find_main_variables(path))
+        selector = BranchVariableSelector(path)
+        return variables, selector.select(variables), selector
+
+
+def test_select_branch_relevant_variables():
+    """
+    Tests the `select()` function through checking if
+    loop bounds, conditions and indices passed to functions are selected, also through
+    assignments, while loop counters and outputs are not
+    """
+    variables, rows, _selector = select_rows(SOURCE)
+    assert [variables[row] for row in rows] == ['n', 'limit', 'offset', 'key']
+
+
+def test_select_loop_bounds_and_counters():
+    """
+    Tests the `select()` function through checking if
+    a bound that the for header modifies is selected, and if a loop counter is only left out
+    of the header of its own loop
+    """
+    source = '''int main() {
+    int n;
+    int i;
+    int j;
+    int total = 0;
+    for (; n > 0; n--) {
+        total++;
+    }
+    for (j = 0; j < 4; j++) {
+        total++;
+    }
+    if (j > 2) {
+        total--;
+    }
+    for (i = 0; i < 4; i++) {
+        total += i;
+    }
+    for (int k = 0, m = k; m < 2; m++) {
+        total += k;
+    }
+    return total;
+}
+'''
+    variables, rows, _selector = select_rows(source)
+    assert [variables[row] for row in rows] == ['n', 'j']
+
+
+def test_select_if_statement_1():
+    """
+    Tests the `select()` function through checking if
+    only the input of the branching function is selected in if-statement-1.cpp, not its result
+    """
+    with open(find_file_path('if-statement-1.cpp'), 'r', encoding='utf-8') as file:
+        _variables, rows, selector = select_rows(file.read())
+    assert rows == [13]
+    assert '32 instead of 64 symbolic bits' in selector.summary({13: 'x', 14: 'result'}, rows)
+
+
+def test_symbolic_bits():
+    """
+    Tests the `symbolic_bits()` function through checking if
+    the sizes of the selected variables are summed in bits
+    """
+    assert symbolic_bits({2: 4, 3: 8, 4: 1}, [2, 4]) == 40
+    assert symbolic_bits({2: 4}, []) == 0
@@ -0,0 +1,103 @@
+"""
+Creates test cases for the target catalog module
+"""
+import os
+import shutil
+import tempfile
+
+import src.tuut_file
+from src.utils.misc import find_file_path
+from src.target_catalog import TargetCatalog
+from src.tuut_file import TuutFile
+
+FUNC_DICT = {7: 'print_elements void (char *)', 14: 'uninit_value int (int)'}
+FUNC_DETAILS = {7: ['print_elements', 1, [['constantarray', 'char', 6]]],
+                14: ['uninit_value', 1, [['int', '', -1]]]}
+
+
+def test_store_and_load_functions():
+    """
+    Tests the `store_functions()` and `load_functions()` functions through checking if
+    the functions of a file are loaded as stored, for the same content and flags only
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TargetCatalog(os.path.join(temp_dir, 'catalog.sqlite3'))
+        file_path = os.path.join(temp_dir, 'file.cpp')
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write('void print_elements(char a[6]);\n')
+
+        assert catalog.load_functions(file_path) is None
+        catalog.store_functions(file_path, FUNC_DICT, FUNC_DETAILS)
+        assert catalog.load_functions(file_path) == (FUNC_DICT, FUNC_DETAILS)
+        assert catalog.load_functions(file_path, ['-DNDEBUG']) is None
+
+        # a changed file is not in the catalog
+        with open(file_path, 'a', encoding='utf-8') as file:
+            file.write('int uninit_value(int a);\n')
+        assert catalog.load_functions(file_path) is None
+        catalog.close()
+
+
+def test_store_and_load_variables():
+    """
+    Tests the `store_variables()` and `load_variables()` functions through checking if
+    the variables of main are loaded in the order of the source
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TargetCatalog(os.path.join(temp_dir, 'catalog.sqlite3'))
+        file_path = os.path.join(temp_dir, 'file.cpp')
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write('int main() { int b; int a; }\n')
+
+        catalog.store_functions(file_path, {}, {})
+        assert catalog.load_variables(file_path) is None
+        catalog.store_variables(file_path, [(1, 'b'), (1, 'a')])
+        assert catalog.load_variables(file_path) == [(1, 'b'), (1, 'a')]
+        catalog.close()
+
+
+def test_store_targets_per_path():
+    """
+    Tests the `store_targets()` and `query_targets()` functions through checking if two files
+    with the same content and flags keep their own rows and report their own path
+    """
+    target = {'kind': 'function', 'line': 1, 'name': 'f', 'type': 'void (int)',
+              'param_count': 1, 'input_bytes': 4, 'cyclomatic': 1, 'statements': 0,
+              'fuzzable': 1, 'params': [{'name': 'a', 'type': 'int', 'bytes': 4}]}
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TargetCatalog(os.path.join(temp_dir, 'catalog.sqlite3'))
+        file_paths = [os.path.join(temp_dir, name) for name in ['a.cpp', 'b.cpp']]
+        for file_path in file_paths:
+            with open(file_path, 'w', encoding='utf-8') as file:
+                file.write('void f(int a) {}\n')
+
+        catalog.store_targets(file_paths[0], [target])
+        assert not catalog.has_targets(file_paths[1])
+        catalog.store_targets(file_paths[1], [target])
+        targets = catalog.query_targets([catalog.file_key(path) for path in file_paths])
+        assert [target['path'] for target in targets] == file_paths
+        catalog.close()
+
+
+def test_gen_func_info_uses_catalog(monkeypatch):
+    """
+    Tests the `gen_func_info()` function through checking if
+    an unchanged file is taken from the catalog instead of being parsed again
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        catalog = TargetCatalog(os.path.join(temp_dir, 'catalog.sqlite3'))
+        file_path = os.path.join(temp_dir, 'address_memory.cpp')
+        shutil.copy(find_file_path('address_memory.cpp'), file_path)
+
+        tuut = TuutFile(file_path)
+        tuut.gen_func_info(catalog=catalog)
+        expected = (tuut.func_dict, tuut.func_details)
+
+        def fail(*_args, **_kwargs):
+            raise AssertionError('file should not be parsed again')
+        monkeypatch.setattr(src.tuut_file, 'parse_translation_unit', fail)
+
+        tuut = TuutFile(file_path)
+        tuut.gen_func_info(catalog=catalog)
+        assert (tuut.func_dict, tuut.func_details) == expected
+        catalog.close()
@@ -0,0 +1,127 @@
+"""
+Creates test cases for the translation unit cache
+"""
+import os
+import tempfile
+
+from src.utils.tu_cache import TranslationUnitCache
+
+
+def write_file(path, content):
+    """
+    Writes the content to the file at path
+    """
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write(content)
+
+
+def test_parse_is_cached():
+    """
+    Tests the `parse()` function through checking if
+    a file is parsed only once as long as it does not change
+    """
+    cache = TranslationUnitCache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'file.cpp')
+        write_file(path, 'int f(int a) { return a; }\n')
+
+        first = cache.parse(path)
+        assert cache.parse(path) is first
+        assert (cache.hits, cache.misses) == (1, 1)
+
+        # other arguments lead to another translation unit
+        assert cache.parse(path, ['-std=c++17']) is not first
+        assert cache.misses == 2
+
+
+def test_parse_invalidated_on_change():
+    """
+    Tests the `parse()` function through checking if
+    a changed file is parsed again and the stale translation unit is dropped
+    """
+    cache = TranslationUnitCache()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'file.cpp')
+        write_file(path, 'int f(int a) { return a; }\n')
+        cache.parse(path)
+
+        write_file(path, 'int g(int a, int b) { return a + b; }\n')
+        translation_unit = cache.parse(path)
+
+        assert cache.misses == 2
+        assert len(cache.units) == 1
+        assert [node.spelling for node in translation_unit.cursor.get_children()] == ['g']
+
+
+def test_parse_evicts_least_recently_used():
+    """
+    Tests the `parse()` function through checking if
+    the least recently used translation unit is evicted when the cache is full
+    """
+    cache = TranslationUnitCache(max_units=2)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        paths = []
+        for name in ['a', 'b', 'c']:
+            paths.append(os.path.join(temp_dir, name + '.cpp'))
+            write_file(paths[-1], f'int {name}() {{ return 0; }}\n')
+
+        cache.parse(paths[0])
+        cache.parse(paths[1])
+        cache.parse(paths[0])
+        cache.parse(paths[2])
+
+        assert [key[0] for key in cache.units] == [paths[0], paths[2]]
+
+
+def test_parse_reads_saved_units():
+    """
+    Tests the `parse()` function through checking if
+    a later cache reads the saved translation unit, unless an included header changed since
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_ast_cache = os.path.join(temp_dir, 'ast_cache')
+        path = os.path.join(temp_dir, 'file.cpp')
+        header = os.path.join(temp_dir, 'file.h')
+        write_file(header, 'int g(int a);\n')
+        write_file(path, '#include "file.h"\nint f(int a) { return g(a); }\n')
+        TranslationUnitCache(path_ast_cache=path_ast_cache).parse(path)
+
+        cache = TranslationUnitCache(path_ast_cache=path_ast_cache)
+        translation_unit = cache.parse(path)
+        assert cache.reads == 1
+        assert [node.spelling for node in translation_unit.cursor.get_children()
+                if str(node.location.file) == path] == ['f']
+
+        # a header modified after the unit was saved makes the saved unit stale
+        saved = os.path.getmtime(os.path.join(path_ast_cache, os.listdir(path_ast_cache)[0]))
+        os.utime(header, (saved + 10, saved + 10))
+        cache = TranslationUnitCache(path_ast_cache=path_ast_cache)
+        cache.parse(path)
+        assert cache.reads == 0
+
+
+def test_parse_changed_file_after_read():
+    """
+    Tests the `parse()` function through checking if
+    a file that changed after its unit was read from disk is parsed again, and if the unit
+    saved for the new content is complete
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path_ast_cache = os.path.join(temp_dir, 'ast_cache')
+        path = os.path.join(temp_dir, 'file.cpp')
+        write_file(path, 'int f(int a) { return a; }\n')
+        TranslationUnitCache(path_ast_cache=path_ast_cache).parse(path)
+
+        cache = TranslationUnitCache(path_ast_cache=path_ast_cache)
+        cache.parse(path)
+        assert cache.reads == 1
+
+        # the unit read from disk can not be reparsed
+        write_file(path, 'int f(int a) { return a; }\nint g(int b) { return b; }\n')
+        translation_unit = cache.parse(path)
+        assert [node.spelling for node in translation_unit.cursor.get_children()] == ['f', 'g']
+
+        cache = TranslationUnitCache(path_ast_cache=path_ast_cache)
+        translation_unit = cache.parse(path)
+        assert cache.reads == 1
+        assert [node.spelling for node in translation_unit.cursor.get_children()] == ['f', 'g']
@@ -2,9 +2,10 @@ import os
 import tempfile
 import pytest
 
+import src.tuut_file
 from src.utils.misc import find_file_path
 from src.fuzz_handler import FuzzHandler
-from src.tuut_file import TuutFile
+from src.tuut_file import TuutFile, literal_to_bytes, integer_to_entries, dict_entry
 
 
 def helper_generate_file(extension, new_dir):
@@ -136,6 +137,31 @@ def test_get_func_info():
     assert tuut.func_details == test_func_details
 
 
+def test_get_func_info_fast_matches_full_walk():
+    """
+    Tests the `get_func_info()` function through checking if
+    the declaration-only parse finds the same functions as the full walk of the AST,
+    including functions in namespaces and extern "C" blocks
+    """
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'nested.cpp')
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write('#include <vector>\n'
+                       'namespace ns { int f(int a, char b[4]) { return a + b[0]; } }\n'
+                       'extern "C" { int g(long x) { return x; } }\n'
+                       'int h(short s) { std::vector<int> v(s); return v.size(); }\n'
+                       'int main() { return 0; }\n')
+
+        tuut = TuutFile(file_path)
+        tuut.gen_func_info(fast=False)
+        full = (tuut.func_dict, tuut.func_details)
+        tuut.gen_func_info()
+
+        assert (tuut.func_dict, tuut.func_details) == full
+        assert tuut.func_details == {2: ['f', 2, [['int', '', -1], ['constantarray', 'char', 4]]],
+                                     3: ['g', 1, [['long', '', -1]]],
+                                     4: ['h', 1, [['short', '', -1]]]}
+
 def test_comment_out_main():
     """
     Tests the `comment_out_main()` function through checking if
@@ -159,3 +185,63 @@ def test_path_container_fuzz():
     """
     tuut = TuutFile(find_file_path("address_memory.cpp"))
     assert tuut.path_container_fuzz == '/home/consept/tmp/fuzz/address_memory.cpp'
+
+
+def test_literal_to_bytes():
+    """
+    Tests the `literal_to_bytes()` function through checking if
+    character and string literals, including escape sequences, are converted correctly
+    """
+    assert literal_to_bytes("'a'") == b'a'
+    assert literal_to_bytes("L'\\0'") == b'\x00'
+    assert literal_to_bytes('"ab\\n\\x41\\101\\\\"') == b'ab\nAA\\'
+
+
+def test_integer_to_entries_and_dict_entry():
+    """
+    Tests the `integer_to_entries()` and `dict_entry()` functions through checking if
+    integers are encoded in every width they fit in and formatted as dictionary values
+    """
+    assert integer_to_entries(65) == [b'A', b'A\x00', b'A\x00\x00\x00',
+                                      b'A\x00\x00\x00\x00\x00\x00\x00']
+    assert integer_to_entries(-1)[0] == b'\xff'
+    assert len(integer_to_entries(70000)) == 2
+    assert dict_entry(b'a"\x00') == '"a\\x22\\x00"'
+
+
+def test_gen_fuzz_dict(monkeypatch):
+    """
+    Tests the `gen_fuzz_dict()` function through checking if
+    the literals and compared enum constants of the fuzzed function end up in the dictionary,
+    while literals of other functions do not
+    """
+    source = ('#include <string.h>\n'
+              'enum Mode { IDLE = 7, RUN = 300 };\n'
+              'int check(int x, const char *s, char c, Mode m) {\n'
+              '    if (x == 0x41 && strcmp(s, "magic") == 0) { return 1; }\n'
+              '    switch (c) { case \'z\': return 2; default: break; }\n'
+              '    return m != RUN;\n'
+              '}\n'
+              'int other(int y) { return y == 12345; }\n')
+    with tempfile.TemporaryDirectory() as temp_dir:
+        file_path = os.path.join(temp_dir, 'dict_target.cpp')
+        with open(file_path, 'w', encoding='utf-8') as file:
+            file.write(source)
+
+        # the dictionary is written to the temporary directory instead of tmp/fuzz/dicts
+        monkeypatch.setattr(src.tuut_file, 'PATH_CONSEPT', temp_dir)
+        tuut = TuutFile(file_path)
+        path_dict = tuut.gen_fuzz_dict([3])
+        assert path_dict.startswith(temp_dir)
+        with open(path_dict, 'r', encoding='utf-8') as file:
+            entries = [line.split('=', 1)[1].strip() for line in file]
+
+        assert '"A"' in entries
+        assert '"magic"' in entries
+        assert '"z"' in entries
+        assert '",\\x01"' in entries
+        assert '"90\\x00\\x00"' not in entries
+        assert tuut.path_container_dict == f'/home/consept/tmp/fuzz/dicts/{os.path.basename(path_dict)}'
+
+        # the dictionary is cached as long as the file does not change
+        assert tuut.gen_fuzz_dict([3]) == path_dict
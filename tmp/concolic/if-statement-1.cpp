@@ -0,0 +1,18 @@
+#include <stdio.h>
+#include <klee/klee.h>
+
+int function_with_if(int x) {
+    printf("input: %d\n", x);
+    if (x > 0) {
+        return 10 / x;
+    } else {
+        return 10 / (x + 1);
+    }
+}
+
+int main() {
+  int x;
+  int result = function_with_if(x);
+  printf("result = %d\n", result);
+  return 1;
+}
\ No newline at end of file
@@ -0,0 +1,74 @@
+#include <iostream>
+#include <stdio.h>
+#include <stdlib.h>
+#include <string.h>
+
+// stack-buffer-overflow error
+void print_elements(char array_param[6]){
+  for (int i = 0; i <= 6; i++){
+    std::cout << array_param[i] << std::endl;
+  }
+}
+
+// use of uninitialized memory error
+int uninit_value(int argc) {
+  int* a = new int[10];
+  a[5] = 0;
+
+  if (a[argc])
+    printf("xx\n");
+
+  return 0;
+}
+
+// attempting free on memory that was not alloc error
+int createAndFreeMemory(int a) {
+    int *ptr = &a;
+    free(ptr);
+    std::cout << *ptr << " " << &ptr << std::endl;
+    return 0;
+}
+
+extern "C" int LLVMFuzzerTestOneInput(const uint8_t *Data, size_t Size) {
+
+    if(Size < 1){
+        return 0;
+    }
+
+    switch(Data[0] % 3){
+    case 0: {
+        char a[6];
+
+        if(Size == 7){
+
+            memcpy(a, Data + 1, 6);
+            print_elements(a);
+
+        }
+        break;
+    }
+    case 1: {
+        int b[1];
+
+        if(Size == 2){
+
+            memcpy(b, Data + 1, 1);
+            uninit_value(b[0]);
+
+        }
+        break;
+    }
+    case 2: {
+        int c[1];
+
+        if(Size == 2){
+
+            memcpy(c, Data + 1, 1);
+            createAndFreeMemory(c[0]);
+
+        }
+        break;
+    }
+    }
+    return 0;
+}
\ No newline at end of file
@@ -0,0 +1,28 @@
+#!/bin/sh
+clang++ -g -O2 -fsanitize=fuzzer -o tmp/fuzz/fuzz_fast                 /home/consept/tmp/fuzz/address_memory.cpp
+clang++ -g -fsanitize=address,fuzzer -o tmp/fuzz/fuzz_asan                 /home/consept/tmp/fuzz/address_memory.cpp
+clang++ -g -fsanitize=memory,fuzzer -o tmp/fuzz/fuzz_msan                 /home/consept/tmp/fuzz/address_memory.cpp
+mkdir -p tmp/fuzz/corpus tmp/fuzz/recheck
+tmp/fuzz/fuzz_fast -fork=1 -ignore_crashes=1 -max_total_time=120                 tmp/fuzz/corpus > tmp/fuzz/fuzz_fast.log 2>&1 &
+FAST_PID=$!
+RUNNING=1
+while [ $RUNNING -eq 1 ]; do
+    kill -0 $FAST_PID 2>/dev/null || RUNNING=0
+    for input in tmp/fuzz/corpus/*; do
+        [ -f "$input" ] || continue
+        name=$(basename "$input")
+        [ -f tmp/fuzz/recheck/seen-$name ] && continue
+        touch tmp/fuzz/recheck/seen-$name
+        for build in asan msan; do
+            report=tmp/fuzz/recheck/$build-$name.log
+            if tmp/fuzz/fuzz_$build "$input" > $report 2>&1; then
+                rm -f $report
+            else
+                cp "$input" tmp/fuzz/crash-$build-$name
+                echo Sanitizer $build confirmed crash on $name
+            fi
+        done
+    done
+    [ $RUNNING -eq 1 ] && sleep 5
+done
+tail -n 20 tmp/fuzz/fuzz_fast.log
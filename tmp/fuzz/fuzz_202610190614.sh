@@ -0,0 +1,11 @@
+#!/bin/sh
+for crash in tmp/fuzz/crash-*; do
+    [ -f "$crash" ] || continue
+    case "$crash" in *.log) continue;; esac
+    build=tmp/fuzz/fuzz_output
+    case "$crash" in
+        tmp/fuzz/crash-asan-*) build=tmp/fuzz/fuzz_asan;;
+        tmp/fuzz/crash-msan-*) build=tmp/fuzz/fuzz_msan;;
+    esac
+    $build "$crash" > "$crash.log" 2>&1
+done
@@ -0,0 +1,2 @@
+#!/bin/sh
+clang++ -g -fsanitize=memory,fuzzer -o tmp/fuzz/fuzz_output                 /home/consept/tmp/fuzz/address_memory.cpp
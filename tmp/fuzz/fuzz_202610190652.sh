@@ -0,0 +1,2 @@
+#!/bin/sh
+tmp/fuzz/fuzz_output -artifact_prefix=/home/consept/tmp/fuzz/ -runs=1000
@@ -0,0 +1,7 @@
+#!/bin/sh
+mkdir -p tmp/fuzz/corpus tmp/fuzz/artifacts/asan_ubsan tmp/fuzz/artifacts/msan
+tmp/fuzz/fuzz_asan_ubsan -artifact_prefix=/home/consept/tmp/fuzz/ -artifact_prefix=/home/consept/tmp/fuzz/artifacts/asan_ubsan/ -fork=1 -ignore_crashes=1 -max_total_time=300 tmp/fuzz/corpus 2>&1 | tee tmp/fuzz/fuzz_asan_ubsan.log &
+tmp/fuzz/fuzz_msan -artifact_prefix=/home/consept/tmp/fuzz/ -artifact_prefix=/home/consept/tmp/fuzz/artifacts/msan/ -fork=1 -ignore_crashes=1 -max_total_time=300 tmp/fuzz/corpus 2>&1 | tee tmp/fuzz/fuzz_msan.log &
+wait
+for artifact in tmp/fuzz/artifacts/asan_ubsan/*; do [ -f "$artifact" ] && mv "$artifact" tmp/fuzz/crash-asan_ubsan-$(basename "$artifact"); done
+for artifact in tmp/fuzz/artifacts/msan/*; do [ -f "$artifact" ] && mv "$artifact" tmp/fuzz/crash-msan-$(basename "$artifact"); done
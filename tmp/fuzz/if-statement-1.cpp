@@ -0,0 +1,29 @@
+#include <stdio.h>
+
+int function_with_if(int x) {
+    printf("input: %d\n", x);
+    if (x > 0) {
+        return 10 / x;
+    } else {
+        return 10 / (x + 1);
+    }
+}
+
+/*int main() {
+  int x;
+  int result = function_with_if(x);
+  printf("result = %d\n", result);
+  return 1;
+}*/ 
+extern "C" int LLVMFuzzerTestOneInput(const uint8_t *Data, size_t Size) {
+
+    int a[1];
+
+    if(Size == 1){
+
+        memcpy(a, Data + 0, 1);
+        function_with_if(a[0]);
+
+    }
+    return 0;
+}
\ No newline at end of file
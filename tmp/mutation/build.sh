@@ -1,4 +1,11 @@
 #!/bin/bash
 set -e
 cd $EDITED_USER_PROJECT_PATH/build
+
+# Time every build, the durations are summarised after the run
+start=$(date +%s.%N)
 cmake --build . --parallel $(nproc)
+end=$(date +%s.%N)
+duration=$(awk "BEGIN { print $end - $start }")
+echo "Build took $duration s"
+echo $duration >> $MOUNTED_MUTATION_FOLDER/build_times.txt
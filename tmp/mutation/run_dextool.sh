@@ -1,10 +1,29 @@
 #!/bin/bash
 set -e
 
+# The phases to run: all (default), analyze, tce, coverage, test or report, and optionally
+# the database to test the mutants of, e.g. the copy of the database of a shard
+PHASE=${1:-all}
+DATABASE_OPTION=${2:+--db $2}
+
+# With the diff of a revision range only the mutants on the changed lines are analysed and
+# tested, Dextool reads the diff from its standard input
+DIFF_FILE=$MOUNTED_MUTATION_FOLDER/changes.diff
+DIFF_OPTION=
+if [ -f $DIFF_FILE ]; then
+    DIFF_OPTION=--diff-from-stdin
+else
+    DIFF_FILE=/dev/null
+fi
+
 # Creating the new directory for the edited user project files
 echo Creating project directories
-mkdir -p $PARENT_FOLDER_OF_USER_PROJECT
-cp -R $USER_PROJECT_PATH $PARENT_FOLDER_OF_USER_PROJECT
+mkdir -p $EDITED_USER_PROJECT_PATH
+
+# The build folder is a volume that keeps the build tree of the last run, cp -a keeps the
+# modification times of the files so only the files that changed are compiled again
+find $USER_PROJECT_PATH -mindepth 1 -maxdepth 1 ! -name build \
+    -exec cp -a {} $EDITED_USER_PROJECT_PATH \;
 
 cp $MOUNTED_MUTATION_FOLDER/build.sh $EDITED_USER_PROJECT_PATH
 cp $MOUNTED_MUTATION_FOLDER/test.sh $EDITED_USER_PROJECT_PATH
@@ -15,18 +34,80 @@ cp $MOUNTED_MUTATION_FOLDER/.dextool_mutate.toml $EDITED_USER_PROJECT_PATH
 echo Rebuilding project
 cd $EDITED_USER_PROJECT_PATH
 [ -d build ] || mkdir build
-rm -rf build/*
 cd build
-cmake .. -DCMAKE_EXPORT_COMPILE_COMMANDS=ON
+cmake .. -DCMAKE_EXPORT_COMPILE_COMMANDS=ON \
+    -DCMAKE_C_COMPILER_LAUNCHER=ccache -DCMAKE_CXX_COMPILER_LAUNCHER=ccache
+cp compile_commands.json $MOUNTED_MUTATION_FOLDER
+ccache --zero-stats
 
 echo Building scripts
 cd $EDITED_USER_PROJECT_PATH
 chmod 755 build.sh test.sh
-echo Analyzing scripts
-dextool mutate analyze
-
-echo Running mutation tests
-dextool mutate test
-echo Creating reports
-dextool mutate report --style html --section tc_similarity --section tc_min_set --section tc_full_overlap_with_mutation_id --section tc_killed_no_mutants --section tc_full_overlap --section trend
-cp -r $EDITED_USER_PROJECT_PATH/html $MOUNTED_MUTATION_FOLDER
+# The database of the project is kept in $MOUNTED_MUTATION_FOLDER/databases across runs, so
+# only the files that changed since the last run are analysed again and only the mutants
+# without a result, i.e. those of changed files, are tested
+if [ "$PHASE" = all ] || [ "$PHASE" = analyze ]; then
+    echo Analyzing scripts
+    dextool mutate analyze $DIFF_OPTION < $DIFF_FILE
+fi
+
+# The script that hashes the objects of the mutants is generated by Consept
+if [ "$PHASE" = tce ]; then
+    echo Compiling the mutants to find equivalent and duplicate mutants
+    sh $MOUNTED_MUTATION_FOLDER/tce.sh
+fi
+
+# Every test is run alone in a build with coverage instrumentation, after which gcov tells
+# the lines it covered. They are written to the coverage file as "test<TAB>path<TAB>line",
+# from which Consept selects the tests of every mutant
+if [ "$PHASE" = coverage ]; then
+    echo Recording the line coverage of every test
+    COVERAGE_FILE=$MOUNTED_MUTATION_FOLDER/test_coverage.txt
+    : > $COVERAGE_FILE
+    mkdir -p $EDITED_USER_PROJECT_PATH/build_coverage
+    cd $EDITED_USER_PROJECT_PATH/build_coverage
+    cmake .. -DCMAKE_C_FLAGS=--coverage -DCMAKE_CXX_FLAGS=--coverage \
+        -DCMAKE_EXE_LINKER_FLAGS=--coverage -DCMAKE_SHARED_LINKER_FLAGS=--coverage \
+        -DCMAKE_C_COMPILER_LAUNCHER=ccache -DCMAKE_CXX_COMPILER_LAUNCHER=ccache
+    cmake --build .
+    ctest -N | sed -n 's/^ *Test *#\([0-9]*\): \(.*\)$/\1 \2/p' | while read -r NUMBER TEST; do
+        find . -name '*.gcda' -delete
+        ctest -I $NUMBER,$NUMBER > /dev/null || true
+        find $PWD -name '*.gcda' | while read -r GCDA; do
+            GCOV_DIR=$(mktemp -d)
+            (cd $GCOV_DIR && gcov -p -o $(dirname $GCDA) $GCDA > /dev/null 2>&1) || true
+            # a line is covered if its count has a digit, "#####" and "-" are not covered
+            awk -F ':' -v test="$TEST" '
+                $2 + 0 == 0 && $3 == "Source" { source = $4 }
+                $1 ~ /[0-9]/ && $2 + 0 > 0 { print test "\t" source "\t" $2 + 0 }' \
+                $GCOV_DIR/*.gcov >> $COVERAGE_FILE 2> /dev/null || true
+            rm -rf $GCOV_DIR
+        done
+    done
+fi
+
+if [ "$PHASE" = all ] || [ "$PHASE" = test ]; then
+    # test.sh tells the mutant Dextool wrote to a file by comparing the files of the mutants
+    # with the tests Consept selected with a copy of them from before testing
+    TESTS=$MOUNTED_MUTATION_FOLDER/mutant_tests.txt
+    PRISTINE=$EDITED_USER_PROJECT_PATH.pristine
+    rm -rf $PRISTINE
+    if [ -f $TESTS ]; then
+        cut -f 2 $TESTS | sort -u | while IFS= read -r FILE; do
+            mkdir -p "$(dirname "$PRISTINE/$FILE")"
+            cp -a "$EDITED_USER_PROJECT_PATH/$FILE" "$PRISTINE/$FILE"
+        done
+    fi
+
+    echo Running mutation tests
+    dextool mutate test $DATABASE_OPTION $DIFF_OPTION < $DIFF_FILE
+
+    echo Compiler cache statistics
+    ccache --show-stats
+fi
+
+if [ "$PHASE" = all ] || [ "$PHASE" = report ]; then
+    echo Creating reports
+    dextool mutate report --style html --section tc_similarity --section tc_min_set --section tc_full_overlap_with_mutation_id --section tc_killed_no_mutants --section tc_full_overlap --section trend
+    cp -r $EDITED_USER_PROJECT_PATH/html $MOUNTED_MUTATION_FOLDER
+fi
@@ -3,5 +3,43 @@
 
 set -e
 cd $EDITED_USER_PROJECT_PATH/build
-ctest --output-on-failure
 
+# With the tests Consept selected by coverage, a mutant is only tested by the tests that
+# cover it, the test most likely to kill it first, and the first failing test kills it and
+# stops the run. Every line of the selection holds the checksum of a mutant, its file, its
+# first and last line and its tests. A mutant in a schema is told by the checksum Dextool
+# exports in DEXTOOL_MUTID, compared as a string as awk loses the precision of 64 bit numbers.
+# Any other mutant is written to its file, which differs from the copy run_dextool.sh made
+# before testing on the lines of the mutant
+TESTS=$MOUNTED_MUTATION_FOLDER/mutant_tests.txt
+PRISTINE=$EDITED_USER_PROJECT_PATH.pristine
+SELECTED=
+if [ -f $TESTS ] && [ -n "$DEXTOOL_MUTID" ]; then
+    SELECTED=$(awk -F '\t' -v id="$DEXTOOL_MUTID" \
+        '$1 "" == id "" { for (i = 5; i <= NF; i++) print $i; exit }' $TESTS)
+fi
+if [ -f $TESTS ] && [ -z "$SELECTED" ] && [ -d $PRISTINE ]; then
+    while IFS= read -r FILE; do
+        cmp -s "$PRISTINE/$FILE" "$EDITED_USER_PROJECT_PATH/$FILE" && continue
+        # the lines of the original the mutant replaces, from the first hunk of the diff
+        read -r FIRST COUNT <<< $(diff -U0 "$PRISTINE/$FILE" "$EDITED_USER_PROJECT_PATH/$FILE" |
+            sed -n 's/^@@ -\([0-9]*\),\{0,1\}\([0-9]*\) .*/\1 \2/p' | head -n 1)
+        COUNT=${COUNT:-1}
+        LAST=$((FIRST + (COUNT > 0 ? COUNT - 1 : 1)))
+        # the tests of all mutants on these lines, in order and without repetition
+        SELECTED=$(awk -F '\t' -v file="$FILE" -v first=$FIRST -v last=$LAST \
+            '$2 == file && $3 <= last && $4 >= first {
+                for (i = 5; i <= NF; i++) if (!seen[$i]++) print $i }' $TESTS)
+        break
+    done < <(cut -f 2 $TESTS | sort -u)
+fi
+
+if [ -n "$SELECTED" ]; then
+    while read -r TEST; do
+        PATTERN=$(printf '%s' "$TEST" | sed 's/[][\.*^$+?(){}|]/\\&/g')
+        ctest --output-on-failure -R "^$PATTERN\$"
+    done <<< "$SELECTED"
+    exit 0
+fi
+
+ctest --output-on-failure